@@ -16,6 +16,27 @@ API_KEY = os.getenv('API_KEY', '')
 DEBUG = os.getenv('DEBUG', 'false').lower() == 'true'
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
+# Optional: Performance benchmarks (test_perf_*.py)
+RUN_BENCHMARKS = os.getenv('RUN_BENCHMARKS', 'false').lower() == 'true'
+PERF_REPORT_DIR = os.getenv('PERF_REPORT_DIR', 'perf-results')
+# Capacity-knee SLO: p99 budget (seconds) and the highest tolerated error rate per load step
+KNEE_P99_BUDGET_S = float(os.getenv('KNEE_P99_BUDGET_S', '1.0'))
+KNEE_MAX_ERROR_RATE = float(os.getenv('KNEE_MAX_ERROR_RATE', '0.01'))
+# Load guard for the shared API: client-side rate cap (0 = off) and AIMD concurrency limit
+LOAD_RATE_CAP_RPS = float(os.getenv('LOAD_RATE_CAP_RPS', '0'))
+LOAD_ADAPTIVE_CONCURRENCY = os.getenv('LOAD_ADAPTIVE_CONCURRENCY', 'false').lower() == 'true'
+LOAD_TARGET_LATENCY_S = float(os.getenv('LOAD_TARGET_LATENCY_S', '1.0'))
+LOAD_MAX_CONCURRENCY = int(os.getenv('LOAD_MAX_CONCURRENCY', '16'))
+# Soak mode (RUN_SOAK=true, hours against the API): total duration and the window latency and errors are sampled over (seconds)
+RUN_SOAK = os.getenv('RUN_SOAK', 'false').lower() == 'true'
+SOAK_DURATION_S = float(os.getenv('SOAK_DURATION_S', '7200'))
+SOAK_WINDOW_S = float(os.getenv('SOAK_WINDOW_S', '60'))
+# Synthetic monitor (python -m perf.monitor): seconds between check rounds
+MONITOR_INTERVAL_S = float(os.getenv('MONITOR_INTERVAL_S', '60'))
+# Cold starts: the first COLD_CALLS calls per endpoint are tagged cold; WARMUP_CALLS > 0 adds a warm-up phase
+COLD_CALLS = int(os.getenv('COLD_CALLS', '3'))
+WARMUP_CALLS = int(os.getenv('WARMUP_CALLS', '0'))
+
 # Print configuration for verification
 if __name__ == "__main__":
     print("Module-DeckleOptimiser Integration Tests Configuration:")
@@ -24,3 +45,17 @@ if __name__ == "__main__":
     print(f"TESTING: {TESTING}")
     print(f"DEBUG: {DEBUG}")
     print(f"LOG_LEVEL: {LOG_LEVEL}")
+    print(f"RUN_BENCHMARKS: {RUN_BENCHMARKS}")
+    print(f"PERF_REPORT_DIR: {PERF_REPORT_DIR}")
+    print(f"KNEE_P99_BUDGET_S: {KNEE_P99_BUDGET_S}")
+    print(f"KNEE_MAX_ERROR_RATE: {KNEE_MAX_ERROR_RATE}")
+    print(f"LOAD_RATE_CAP_RPS: {LOAD_RATE_CAP_RPS}")
+    print(f"LOAD_ADAPTIVE_CONCURRENCY: {LOAD_ADAPTIVE_CONCURRENCY}")
+    print(f"LOAD_TARGET_LATENCY_S: {LOAD_TARGET_LATENCY_S}")
+    print(f"LOAD_MAX_CONCURRENCY: {LOAD_MAX_CONCURRENCY}")
+    print(f"RUN_SOAK: {RUN_SOAK}")
+    print(f"SOAK_DURATION_S: {SOAK_DURATION_S}")
+    print(f"SOAK_WINDOW_S: {SOAK_WINDOW_S}")
+    print(f"MONITOR_INTERVAL_S: {MONITOR_INTERVAL_S}")
+    print(f"COLD_CALLS: {COLD_CALLS}")
+    print(f"WARMUP_CALLS: {WARMUP_CALLS}")
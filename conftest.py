@@ -11,6 +11,8 @@ from datetime import datetime
 # Test configuration
 BASE_URL = os.getenv('API_BASE_URL', 'https://trim-manager.appliedbellcurve.com')
 API_TIMEOUT = int(os.getenv('API_TIMEOUT', '30'))
+RUN_BENCHMARKS = os.getenv('RUN_BENCHMARKS', 'false').lower() == 'true'
+RUN_SOAK = os.getenv('RUN_SOAK', 'false').lower() == 'true'
 
 # Check if we're testing against local application
 LOCAL_APP = os.path.exists('application.py')
@@ -48,6 +50,51 @@ def verify_hosted_api_connection():
     
     yield
 
+@pytest.fixture(scope="session")
+def run_report(api_base_url):
+    """Benchmark records for this session, written to PERF_REPORT_DIR at the end"""
+    from perf.report import RunReport
+
+    report = RunReport(api_base_url)
+    yield report
+    path = report.write()
+    if path:
+        print(f"Performance run report written to {path}")
+
+@pytest.fixture(scope="session")
+def call_phases():
+    """Tags the first COLD_CALLS calls per endpoint in this session as cold"""
+    from perf.coldstart import CallPhases
+
+    return CallPhases()
+
+@pytest.fixture(scope="session")
+def standin_base_url():
+    """Base URL of the local stand-in API, served in a background thread"""
+    from perf.standin import serve
+
+    with serve() as base_url:
+        yield base_url
+
+@pytest.fixture
+def load_guard():
+    """Client-side rate cap and adaptive concurrency limit from the LOAD_* settings (None when both are off)"""
+    from perf.limiter import guard_from_config
+
+    return guard_from_config()
+
+@pytest.fixture
+def benchmark_enabled():
+    """Skip live benchmarks unless RUN_BENCHMARKS=true"""
+    if not RUN_BENCHMARKS:
+        pytest.skip("Live benchmark; set RUN_BENCHMARKS=true to run it against the API.")
+
+@pytest.fixture
+def soak_enabled():
+    """Skip the hours-long soak unless RUN_SOAK=true"""
+    if not RUN_SOAK:
+        pytest.skip("Soak run; set RUN_SOAK=true to run it against the API for SOAK_DURATION_S.")
+
 @pytest.fixture
 def test_headers():
     """Default headers for API requests"""
@@ -288,6 +335,9 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "api: mark test as API test"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: mark test as live performance benchmark"
+    )
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers"""
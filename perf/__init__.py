@@ -0,0 +1,4 @@
+"""
+Performance harness for Module-DeckleOptimiser Integration Tests
+Order-book generators, a local stand-in API and benchmark helpers used by test_perf_*.py
+"""
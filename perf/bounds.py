@@ -0,0 +1,99 @@
+"""
+Fast lower bounds on jumbo sets for an optimise request, cheap enough to attach to every result
+Material bound: total demanded width (rolls x width, rolls already carry the length) over the
+usable jumbo width. Martello-Toth L2 bound: items wider than half the usable width cannot share a
+jumbo, which tightens the material bound on long-roll order books. Both are sorted prefix sums.
+
+The request asked for the LP (continuous) relaxation as the tighter bound. That LP needs column
+generation with a knapsack pricing DP per iteration, far from the milliseconds budget, so the L2
+bound stands in for it here; perf.pareto scores plans of small order books against the LP bound
+from perf.reference_solver. Every result names the bound it used in bound_method.
+"""
+import numpy as np
+
+from perf.plan_validator import find_plan_rows, order_demand, plan_to_arrays, validate_plan
+from perf.reference_solver import scoring_demand
+
+
+def _l2_bound(widths, counts, capacity):
+    """Martello-Toth L2 bound for widths with multiplicities, over every threshold k <= capacity / 2"""
+    order = np.argsort(widths)
+    widths, counts = widths[order], counts[order]
+    count_sum = np.concatenate(([0], np.cumsum(counts)))
+    width_sum = np.concatenate(([0], np.cumsum(counts * widths)))
+
+    def below(limit):
+        # Rolls and total width of items no wider than limit
+        index = np.searchsorted(widths, limit, side="right")
+        return count_sum[index], width_sum[index]
+
+    k = np.concatenate(([0], widths[2 * widths <= capacity]))
+    half_count, half_width = below(capacity // 2)
+    under_k_count, under_k_width = below(k - 1)
+    fits_count, fits_width = below(capacity - k)
+
+    n1 = count_sum[-1] - fits_count                      # wider than capacity - k: a jumbo each
+    n2 = fits_count - half_count                         # (capacity / 2, capacity - k]: a jumbo each
+    s2 = fits_width - half_width
+    s3 = half_width - under_k_width                      # [k, capacity / 2]: fill the J2 leftovers first
+    spill = np.maximum(0, -(-(s3 - (n2 * capacity - s2)) // capacity))
+    return int((n1 + n2 + spill).max())
+
+
+def lower_bounds(payload, demand=None):
+    """
+    Material and L2 (or, for merged slots, slot-count) lower bounds on jumbo sets, and the trim % a
+    plan at the bound would have
+    """
+    if demand is None:
+        demand = order_demand(payload["data"])
+    keep = demand["rolls"] > 0
+    widths = np.rint(demand["widths"][keep]).astype(np.int64)
+    counts = np.ceil(demand["rolls"][keep]).astype(np.int64)
+    max_width = int(payload["max_width"])
+    capacity = int(payload["max_width"] - payload["minimum_trim"])
+    demanded_width = int(widths @ counts)
+
+    if "min_width_range" in payload:
+        # Secondary/Metallizer slots are merged rolls: each slot adds trim_value and holds at most
+        # max_width_range - trim_value of order width, so count the fewest slots and charge their trim
+        trim_value = int(payload.get("trim_value") or 0)
+        slot_net = int(payload["max_width_range"]) - trim_value
+        slots = -(-demanded_width // slot_net) if slot_net > 0 else 0
+        material = -(-(demanded_width + slots * trim_value) // capacity)
+        slots_per_jumbo = capacity // int(payload["min_width_range"])
+        tight = -(-slots // slots_per_jumbo) if slots_per_jumbo else 0
+        method = "material+slot_count"
+    else:
+        material = -(-demanded_width // capacity)
+        tight = _l2_bound(widths, counts, capacity) if len(widths) else 0
+        method = "material+martello_toth_l2"
+
+    bound = max(material, tight)
+    return {
+        "material_bound": int(material),
+        "tight_bound": int(tight),
+        "lower_bound": int(bound),
+        "bound_method": method,
+        "demanded_width": demanded_width,
+        "bound_trim_pct": (1 - demanded_width / (bound * max_width)) * 100 if bound else 0.0,
+    }
+
+
+def trim_vs_bound(response_data, payload):
+    """
+    Bounds for an optimise request and, when the response carries a plan, its trim % and jumbo sets
+    against them. The plan is held to MustMake rolls plus the Optional rolls it chose to make.
+    """
+    plan_rows = find_plan_rows(response_data)
+    if plan_rows is None:
+        return dict(lower_bounds(payload), plan_sets=None, plan_trim_pct=None, trim_pct_vs_bound=None)
+    arrays = plan_to_arrays(plan_rows)
+    result = lower_bounds(payload, demand=scoring_demand(arrays, payload))
+    plan = validate_plan(arrays, payload["max_width"], payload["minimum_trim"])
+    result.update({
+        "plan_sets": plan["jumbo_sets"],
+        "plan_trim_pct": plan["trim_loss_pct"],
+        "trim_pct_vs_bound": plan["trim_loss_pct"] - result["bound_trim_pct"],
+    })
+    return result
@@ -0,0 +1,227 @@
+"""
+Stress mode for /api/validate_campaign_changes and /api/apply_campaign_changes
+Large current_plan / changes sets are generated around today's date, and a local reference
+checks every change for the freeze window and for overlaps with other blocks on its line, so
+the server's verdicts can be cross-checked on every sample.
+
+Blocks are whole days with an inclusive end_time. A change is frozen when its block starts, or
+would start, before today + freeze_days.
+"""
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from perf.orders import material_groups
+
+CHANGE_TYPES = ("capacity_increase", "capacity_decrease", "reschedule", "extend")
+VERDICT_KEYS = ("valid", "is_valid", "isValid")
+STRESS_SIZES = (10, 100, 1_000, 5_000)
+CHANGE_SHARE = 0.2
+
+
+def campaign_plan(blocks, start, lines=12, groups=5, seed=0):
+    """`blocks` back-to-back campaign blocks of 2-6 days, spread over `lines` from the start date"""
+    rng = random.Random(seed)
+    group_names = material_groups(groups)
+    line_start = {f"Line{index + 1}": start for index in range(lines)}
+
+    plan = []
+    for index in range(blocks):
+        line = f"Line{index % lines + 1}"
+        block_start = line_start[line]
+        block_end = block_start + timedelta(days=rng.randint(2, 6) - 1)
+        line_start[line] = block_end + timedelta(days=1)
+        plan.append({
+            "material_group": group_names[index % len(group_names)],
+            "line": line,
+            "start_time": block_start.isoformat(),
+            "end_time": block_end.isoformat(),
+            "capacity": rng.randrange(100, 1000, 10),
+        })
+    return plan
+
+
+def campaign_changes_payload(blocks, changes, lines=12, freeze_days=3, groups=5, seed=0, today=None):
+    """
+    current_plan with `blocks` back-to-back blocks spread over `lines` (starting 10 days ago),
+    and `changes` edits of distinct blocks mixing capacity changes, reschedules and extensions
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    current_plan = campaign_plan(blocks, today - timedelta(days=10), lines=lines, groups=groups, seed=seed)
+
+    change_list = []
+    for block in rng.sample(current_plan, min(changes, blocks)):
+        change_type = rng.choice(CHANGE_TYPES)
+        start, end = date.fromisoformat(block["start_time"]), date.fromisoformat(block["end_time"])
+        if change_type == "capacity_increase":
+            modifications = {"capacity": block["capacity"] + rng.randrange(10, 200, 10)}
+        elif change_type == "capacity_decrease":
+            modifications = {"capacity": max(block["capacity"] - rng.randrange(10, 90, 10), 10)}
+        elif change_type == "reschedule":
+            shift = timedelta(days=rng.choice([-2, -1, 1, 2]))
+            modifications = {"start_time": (start + shift).isoformat(), "end_time": (end + shift).isoformat()}
+        else:
+            modifications = {"end_time": (end + timedelta(days=rng.randint(1, 3))).isoformat()}
+        change_list.append({
+            "material_group": block["material_group"],
+            "line": block["line"],
+            "change_type": change_type,
+            "original": {key: block[key] for key in ("start_time", "end_time", "capacity")},
+            "modifications": modifications,
+        })
+
+    return {"current_plan": current_plan, "changes": change_list, "freeze_days": freeze_days}
+
+
+def _days(values):
+    return pd.to_datetime(pd.Series(values, dtype=object)).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def reference_verdicts(payload, today=None):
+    """
+    Verdict per change: "frozen", "unknown_block", "overlap" or "ok". Overlaps are counted against the
+    plan with every change applied, using sorted start/end arrays per line: the blocks overlapping
+    [s, e) are those starting before e minus those ending at or before s.
+    """
+    today = np.datetime64(today or date.today(), "D").astype(np.int64)
+    plan = pd.DataFrame(payload["current_plan"])
+    changes = payload["changes"]
+    if not changes:
+        return []
+    freeze_end = today + int(payload.get("freeze_days") or 0)
+
+    plan_start, plan_end = _days(plan["start_time"]), _days(plan["end_time"]) + 1
+    key = pd.MultiIndex.from_arrays([plan["line"], plan["material_group"], plan_start, plan_end - 1])
+    original = pd.DataFrame([change["original"] for change in changes])
+    lookup = pd.MultiIndex.from_arrays([
+        [change["line"] for change in changes], [change["material_group"] for change in changes],
+        _days(original["start_time"]), _days(original["end_time"]),
+    ])
+    block = key.get_indexer(lookup)
+    known = block >= 0
+
+    modified = [change.get("modifications", {}) for change in changes]
+    new_start = np.where(known, plan_start[np.maximum(block, 0)], 0)
+    new_end = np.where(known, plan_end[np.maximum(block, 0)], 0)
+    moved_start = _days([m.get("start_time") for m in modified])
+    moved_end = _days([m.get("end_time") for m in modified])
+    new_start = np.where(moved_start > np.iinfo(np.int64).min, moved_start, new_start)
+    new_end = np.where(moved_end > np.iinfo(np.int64).min, moved_end + 1, new_end)
+
+    final_start, final_end = plan_start.copy(), plan_end.copy()
+    final_start[block[known]] = new_start[known]
+    final_end[block[known]] = new_end[known]
+
+    line_codes, _ = pd.factorize(plan["line"])
+    origin = min(final_start.min(), new_start[known].min(initial=final_start.min()))
+    span = int(max(final_end.max(), new_end.max(initial=0)) - origin + 1)
+    starts = np.sort(line_codes * span + (final_start - origin))
+    ends = np.sort(line_codes * span + (final_end - origin))
+    change_line = line_codes[np.maximum(block, 0)]
+    query_start = change_line * span + (new_start - origin)
+    query_end = change_line * span + (new_end - origin)
+    # Blocks of the change's line overlapping [start, end), including the changed block itself
+    overlapping = np.searchsorted(starts, query_end, side="left") - np.searchsorted(ends, query_start, side="right")
+
+    frozen = known & ((plan_start[np.maximum(block, 0)] < freeze_end) | (new_start < freeze_end))
+    return np.where(~known, "unknown_block",
+                    np.where(frozen, "frozen", np.where(overlapping > 1, "overlap", "ok"))).tolist()
+
+
+def _verdict_rows(data, count):
+    pending = [data]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            if len(node) == count and all(isinstance(item, dict) for item in node) and \
+                    any(key in node[0] for key in VERDICT_KEYS):
+                return node
+            pending.extend(node)
+        elif isinstance(node, dict):
+            pending.extend(node.values())
+    return None
+
+
+def server_verdicts(data, count):
+    """(overall verdict, per-change verdicts) from a validate response; either may be None if absent"""
+    overall = next((bool(data[key]) for key in VERDICT_KEYS if isinstance(data, dict) and key in data), None)
+    rows = _verdict_rows(data, count)
+    per_change = [bool(next(row[key] for key in VERDICT_KEYS if key in row)) for row in rows] if rows else None
+    return overall, per_change
+
+
+def cross_check(data, reference):
+    """Compare server verdicts with the reference; returns disagreements (overall and per change index)"""
+    expected = [verdict == "ok" for verdict in reference]
+    overall, per_change = server_verdicts(data, len(reference))
+    result = {"server_overall": overall, "reference_overall": all(expected), "overall_agrees": None,
+              "per_change_disagreements": None}
+    if overall is not None:
+        result["overall_agrees"] = overall == all(expected)
+    if per_change is not None:
+        result["per_change_disagreements"] = [
+            index for index, (server, local) in enumerate(zip(per_change, expected)) if server != local
+        ]
+    return result
+
+
+def applied_plan(payload, reference):
+    """current_plan with every accepted change applied, as sent to apply_campaign_changes"""
+    plan = [dict(block) for block in payload["current_plan"]]
+    index = {(b["line"], b["material_group"], b["start_time"], b["end_time"]): b for b in plan}
+    for change, verdict in zip(payload["changes"], reference):
+        if verdict == "ok":
+            original = change["original"]
+            index[(change["line"], change["material_group"], original["start_time"], original["end_time"])] \
+                .update(change["modifications"])
+    return plan
+
+
+def apply_payload(plan, suggestion_id="sequence_1"):
+    return {
+        "action": "apply_suggestion",
+        "selected_plan": {"id": suggestion_id, "title": "Stress plan", "description": f"{len(plan)} blocks"},
+        "new_plans": {suggestion_id: {"campaign_plan": plan}},
+        "suggestion_id": suggestion_id,
+    }
+
+
+def stress_campaign_changes(session, base_url, timeout, sizes=STRESS_SIZES, change_share=CHANGE_SHARE,
+                            freeze_days=3, headers=None, seed=0):
+    """Validate then apply generated changes per plan size; each sample is cross-checked against the reference"""
+    results = []
+    for blocks in sizes:
+        payload = campaign_changes_payload(blocks, max(1, int(blocks * change_share)), freeze_days=freeze_days,
+                                           seed=seed + blocks)
+        start = time.perf_counter()
+        reference = reference_verdicts(payload)
+        reference_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        validate = session.post(f"{base_url}/api/validate_campaign_changes", json=payload, headers=headers,
+                                timeout=timeout)
+        validate_s = time.perf_counter() - start
+        check = cross_check(validate.json(), reference) if validate.status_code == 200 else None
+
+        start = time.perf_counter()
+        apply = session.post(f"{base_url}/api/apply_campaign_changes",
+                             json=apply_payload(applied_plan(payload, reference)), headers=headers, timeout=timeout)
+        apply_s = time.perf_counter() - start
+
+        results.append({
+            "blocks": blocks,
+            "changes": len(payload["changes"]),
+            "freeze_days": freeze_days,
+            "rejected_by_reference": sum(verdict != "ok" for verdict in reference),
+            "reference_s": reference_s,
+            "validate_status": validate.status_code,
+            "validate_s": validate_s,
+            "apply_status": apply.status_code,
+            "apply_s": apply_s,
+            "cross_check": check,
+        })
+    return results
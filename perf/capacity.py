@@ -0,0 +1,163 @@
+"""
+Capacity-knee finder
+An open-loop generator sends requests at a fixed arrival rate for a step, measuring latency from
+each request's scheduled send time (so a saturated service cannot slow the generator down and
+hide its own queueing). The rate grows step by step until p99 passes the budget or the error
+rate passes the threshold, then the last passing and first failing rates are bisected. The
+sustainable maximum is reported with bootstrap confidence intervals and a Little's-law estimate
+of requests in flight on the server (throughput x mean latency).
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from config import KNEE_MAX_ERROR_RATE, KNEE_P99_BUDGET_S
+from perf.endpoints import endpoint_request
+from perf.limiter import guarded_status
+
+START_RPS = 1.0
+GROWTH = 2.0
+MAX_RPS = 256.0
+STEP_DURATION_S = 5.0
+BISECT_STEPS = 4
+MAX_IN_FLIGHT = 64
+BOOTSTRAP_SAMPLES = 500
+CONFIDENCE = 0.95
+
+
+def _picker(target, rng):
+    """Endpoint name per request: a registry name, or a {name: weight} workload mix"""
+    if isinstance(target, str):
+        return lambda: target
+    names, weights = list(target), list(target.values())
+    return lambda: rng.choices(names, weights)[0]
+
+
+def run_step(base_url, target, rate_rps, timeout, duration_s=STEP_DURATION_S, max_in_flight=MAX_IN_FLIGHT,
+             headers=None, seed=0, guard=None):
+    """
+    Send requests at rate_rps (evenly spaced) for duration_s; returns per-request latency and status arrays.
+    A LoadGuard holds requests back, and the wait counts in their latency.
+    """
+    rng = random.Random(seed)
+    pick = _picker(target, rng)
+    local, lock = threading.local(), threading.Lock()
+    latencies, statuses = [], []
+
+    def send(scheduled, name):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        method, path, params, body = endpoint_request(name)
+        status = guarded_status(local.session, method, f"{base_url}{path}", guard, params=params, json=body,
+                                headers=headers, timeout=timeout)
+        with lock:
+            latencies.append(time.perf_counter() - scheduled)
+            statuses.append(status)
+
+    count = max(1, int(round(rate_rps * duration_s)))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for index in range(count):
+            scheduled = start + index / rate_rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, scheduled, pick())
+    elapsed = time.perf_counter() - start
+    return np.array(latencies), np.array([status == 200 for status in statuses]), elapsed
+
+
+def bootstrap_ci(values, statistic, samples=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, seed=0):
+    """Percentile-bootstrap confidence interval of statistic(values)"""
+    if len(values) < 2:
+        return None, None
+    rng = np.random.default_rng(seed)
+    resampled = rng.choice(values, size=(samples, len(values)), replace=True)
+    estimates = np.apply_along_axis(statistic, 1, resampled)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(estimates, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def step_summary(rate_rps, latencies, ok, elapsed_s, p99_budget_s=KNEE_P99_BUDGET_S,
+                 max_error_rate=KNEE_MAX_ERROR_RATE):
+    """Latency, errors, throughput and Little's-law concurrency of one step, with the SLO verdict"""
+    throughput = ok.sum() / elapsed_s if elapsed_s else 0.0
+    error_rate = float(1 - ok.mean()) if len(ok) else 1.0
+    p50, p99 = (float(value) for value in np.percentile(latencies, [50, 99])) if len(latencies) else (None, None)
+    mean = float(latencies.mean()) if len(latencies) else None
+    p99_ci = bootstrap_ci(latencies, lambda sample: np.percentile(sample, 99))
+    mean_ci = bootstrap_ci(latencies, np.mean)
+    return {
+        "rate_rps": rate_rps,
+        "requests": len(latencies),
+        "throughput_rps": float(throughput),
+        "error_rate": error_rate,
+        "p50_s": p50,
+        "p99_s": p99,
+        "p99_ci_s": p99_ci,
+        "mean_s": mean,
+        # Little's law: requests in flight = arrival (completion) rate x time in system
+        "concurrency": float(throughput * mean) if mean is not None else None,
+        "concurrency_ci": tuple(float(throughput * bound) for bound in mean_ci) if mean_ci[0] is not None
+        else (None, None),
+        "passed": p99 is not None and p99 <= p99_budget_s and error_rate <= max_error_rate,
+    }
+
+
+def find_capacity_knee(base_url, target, timeout, start_rps=START_RPS, growth=GROWTH, max_rps=MAX_RPS,
+                       step_duration_s=STEP_DURATION_S, bisect_steps=BISECT_STEPS, p99_budget_s=KNEE_P99_BUDGET_S,
+                       max_error_rate=KNEE_MAX_ERROR_RATE, max_in_flight=MAX_IN_FLIGHT, headers=None, seed=0,
+                       guard=None):
+    """
+    Ramp the arrival rate by `growth` until a step breaks the SLO (or max_rps passes), then bisect
+    between the last passing and first failing rate. Returns (knee summary, every step in run order).
+    """
+    steps = []
+
+    def step(rate):
+        latencies, ok, elapsed = run_step(base_url, target, rate, timeout, duration_s=step_duration_s,
+                                          max_in_flight=max_in_flight, headers=headers, seed=seed + len(steps),
+                                          guard=guard)
+        steps.append(dict(step_summary(rate, latencies, ok, elapsed, p99_budget_s=p99_budget_s,
+                                       max_error_rate=max_error_rate), phase="ramp" if not bisecting else "bisect"))
+        return steps[-1]
+
+    bisecting, passing, failing, rate = False, None, None, start_rps
+    while rate <= max_rps:
+        result = step(rate)
+        if not result["passed"]:
+            failing = result
+            break
+        passing = result
+        rate *= growth
+
+    bisecting = True
+    if passing is not None and failing is not None:
+        for _ in range(bisect_steps):
+            result = step((passing["rate_rps"] + failing["rate_rps"]) / 2)
+            if result["passed"]:
+                passing = result
+            else:
+                failing = result
+
+    knee = {
+        "target": target if isinstance(target, str) else "mix:" + ",".join(target),
+        "p99_budget_s": p99_budget_s,
+        "max_error_rate": max_error_rate,
+        "sustainable_rps": passing["rate_rps"] if passing else None,
+        # The knee lies between the highest passing and lowest failing rate tried
+        "knee_bracket_rps": (passing["rate_rps"] if passing else 0.0, failing["rate_rps"] if failing else None),
+        "saturated": failing is not None,
+        "throughput_rps": passing["throughput_rps"] if passing else None,
+        "p99_s": passing["p99_s"] if passing else None,
+        "p99_ci_s": passing["p99_ci_s"] if passing else (None, None),
+        "concurrency": passing["concurrency"] if passing else None,
+        "concurrency_ci": passing["concurrency_ci"] if passing else (None, None),
+        "steps": len(steps),
+    }
+    return knee, steps
@@ -0,0 +1,96 @@
+"""
+Cold-start vs warm-path latency
+The first calls to an endpoint after a deploy pay for container warm-up, model loads and empty
+caches. CallPhases tags the first N calls per endpoint in a session as cold, so one slow first
+sample is reported as a cold start instead of deciding pass or fail; an optional warm-up phase
+takes the cold calls before the measured ones. Cold and warm samples are summarised separately,
+and the cold-start cost (cold median minus warm median) is what the run history tracks.
+"""
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import requests
+
+from config import COLD_CALLS, WARMUP_CALLS
+from perf.endpoints import ENDPOINTS, endpoint_request
+from perf.solver_lane import request_in_lane
+
+COLD_START_ENDPOINTS = ("fetch_plan_data", "optimise_setting")
+MEASURED_CALLS = 10
+
+
+class CallPhases:
+    """Tags each call to an endpoint "cold" for its first cold_calls calls in this session, then "warm" """
+
+    def __init__(self, cold_calls=COLD_CALLS):
+        self.cold_calls = cold_calls
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def phase(self, endpoint):
+        with self._lock:
+            self.calls[endpoint] += 1
+            return "cold" if self.calls[endpoint] <= self.cold_calls else "warm"
+
+
+def _call(session, base_url, name, timeout, headers):
+    """(latency_s, status) of one registry call; optimisations queue in the solver lane, and the wait is excluded"""
+    method, path, params, body = endpoint_request(name)
+    if ENDPOINTS[name][1].startswith("/api/optimise_"):
+        result = request_in_lane(session, method, f"{base_url}{path}", body, timeout, headers=headers, retries=0)
+        response = result["response"]
+        return result["latency_s"], response.status_code if response is not None else None
+    start = time.perf_counter()
+    try:
+        status = session.request(method, f"{base_url}{path}", params=params, json=body, headers=headers,
+                                 timeout=timeout).status_code
+    except requests.exceptions.RequestException:
+        status = None
+    return time.perf_counter() - start, status
+
+
+def measure_cold_start(base_url, timeout, endpoints=COLD_START_ENDPOINTS, calls=MEASURED_CALLS,
+                       warmup_calls=WARMUP_CALLS, phases=None, headers=None):
+    """
+    Call each endpoint warmup_calls times (the warm-up phase), then `calls` times, one at a time.
+    Returns one row per call with its cold/warm tag and whether it ran in the warm-up phase.
+    """
+    phases = phases or CallPhases()
+    session = requests.Session()
+    rows = []
+    for name in endpoints:
+        for index in range(warmup_calls + calls):
+            latency_s, status = _call(session, base_url, name, timeout, headers)
+            rows.append({"endpoint": name, "call": index + 1, "phase": phases.phase(name),
+                         "warmup": index < warmup_calls, "latency_s": latency_s, "status": status})
+    return rows
+
+
+def _distribution(latencies):
+    if not latencies:
+        return {"n": 0, "p50_s": None, "p99_s": None, "max_s": None}
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {"n": len(latencies), "p50_s": float(p50), "p99_s": float(p99), "max_s": float(np.max(latencies))}
+
+
+def cold_warm_summary(rows):
+    """Per endpoint: cold and warm latency distributions (successful calls), the cold-start cost and ratio"""
+    summaries = []
+    for name in dict.fromkeys(row["endpoint"] for row in rows):
+        calls = [row for row in rows if row["endpoint"] == name]
+        ok = [row for row in calls if row["status"] == 200]
+        cold = _distribution([row["latency_s"] for row in ok if row["phase"] == "cold"])
+        warm = _distribution([row["latency_s"] for row in ok if row["phase"] == "warm"])
+        both = cold["n"] and warm["n"]
+        summaries.append({
+            "endpoint": name,
+            **{f"cold_{key}": value for key, value in cold.items()},
+            **{f"warm_{key}": value for key, value in warm.items()},
+            "cold_cost_s": cold["p50_s"] - warm["p50_s"] if both else None,
+            "cold_ratio": cold["p50_s"] / warm["p50_s"] if both and warm["p50_s"] else None,
+            "cold_errors": sum(row["status"] != 200 for row in calls if row["phase"] == "cold"),
+            "warm_errors": sum(row["status"] != 200 for row in calls if row["phase"] == "warm"),
+        })
+    return summaries
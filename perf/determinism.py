@@ -0,0 +1,142 @@
+"""
+Determinism and run-to-run variance of the optimisers
+The same order book goes to each /api/optimise_* endpoint K times, once in sequence through the
+solver lane and once as K simultaneous requests. Every plan is canonicalised (patterns as sorted
+width lists with their sets, patterns sorted) and hashed, so two runs that cut the same patterns
+in a different row or slot order still match; the raw response is hashed too. Latency spread is
+reported as the coefficient of variation, the number behind solver time limits and fixed seeds.
+"""
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+import requests
+
+from perf.orders import optimiser_payload
+from perf.pareto import ALGORITHMS
+from perf.plan_validator import find_plan_rows, plan_to_arrays
+from perf.solver_lane import license_busy, post_in_lane
+
+REPEATS = 5
+DETERMINISM_ORDERS = 50
+MODES = ("sequential", "concurrent")
+# Concurrent runs contend for the single solver licence; each retries until it gets a turn
+BUSY_BACKOFF_S = 0.05
+
+
+def canonical_plan(data):
+    """[[sorted slot widths], sets] per pattern, sorted; None when the response holds no plan"""
+    rows = find_plan_rows(data)
+    if rows is None:
+        return None
+    arrays = plan_to_arrays(rows)
+    return sorted([sorted(float(width) for width in widths if width), float(sets)]
+                  for widths, sets in zip(arrays["widths"], arrays["sets"]))
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def plan_hashes(data):
+    """(canonical plan hash or None, raw response hash)"""
+    plan = canonical_plan(data)
+    return (_digest(plan) if plan is not None else None), _digest(data)
+
+
+def _result(algorithm, mode, run, response, latency_s, attempts):
+    result = {"algorithm": algorithm, "mode": mode, "run": run, "status": None, "latency_s": latency_s,
+              "attempts": attempts, "plan_hash": None, "raw_hash": None}
+    if response is not None:
+        result["status"] = response.status_code
+        if response.status_code == 200:
+            result["plan_hash"], result["raw_hash"] = plan_hashes(response.json())
+    return result
+
+
+def _post_until_licensed(session, url, payload, timeout, headers, deadline):
+    """POST outside the lane, retrying while the licence is busy; (response, latency of the last attempt, attempts)"""
+    attempts = 0
+    while True:
+        attempts += 1
+        start = time.perf_counter()
+        try:
+            response = session.post(url, json=payload, headers=headers, timeout=timeout)
+        except requests.exceptions.RequestException:
+            return None, time.perf_counter() - start, attempts
+        latency_s = time.perf_counter() - start
+        if not license_busy(response) or time.perf_counter() >= deadline:
+            return response, latency_s, attempts
+        time.sleep(BUSY_BACKOFF_S)
+
+
+def run_repeats(base_url, algorithm, payload, timeout, repeats=REPEATS, mode="sequential", headers=None):
+    """Send one payload `repeats` times in the given mode; one result per run with its hashes"""
+    url = f"{base_url}{ALGORITHMS[algorithm]}"
+    if mode == "sequential":
+        session = requests.Session()
+        results = []
+        for run in range(repeats):
+            lane = post_in_lane(session, url, payload, timeout, headers=headers)
+            results.append(_result(algorithm, mode, run, lane["response"], lane["latency_s"], lane["attempts"]))
+        return results
+
+    results, lock = [None] * repeats, threading.Lock()
+    barrier = threading.Barrier(repeats)
+    deadline = time.perf_counter() + timeout * repeats
+
+    def send(run):
+        session = requests.Session()
+        barrier.wait()
+        response, latency_s, attempts = _post_until_licensed(session, url, payload, timeout, headers, deadline)
+        with lock:
+            results[run] = _result(algorithm, mode, run, response, latency_s, attempts)
+
+    threads = [threading.Thread(target=send, args=(run,)) for run in range(repeats)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def determinism_summary(results):
+    """Per (algorithm, mode): distinct canonical plans and raw responses, and latency mean, std and CV"""
+    summaries = []
+    for key in dict.fromkeys((result["algorithm"], result["mode"]) for result in results):
+        runs = [result for result in results if (result["algorithm"], result["mode"]) == key]
+        ok = [result for result in runs if result["status"] == 200]
+        latencies = np.array([result["latency_s"] for result in ok], dtype=float)
+        plans = {result["plan_hash"] for result in ok if result["plan_hash"]}
+        mean = float(latencies.mean()) if len(latencies) else None
+        std = float(latencies.std(ddof=1)) if len(latencies) > 1 else None
+        summaries.append({
+            "algorithm": key[0],
+            "mode": key[1],
+            "runs": len(runs),
+            "ok": len(ok),
+            "distinct_plans": len(plans),
+            "distinct_raw": len({result["raw_hash"] for result in ok}),
+            "deterministic": len(plans) <= 1 if ok else None,
+            "latency_mean_s": mean,
+            "latency_std_s": std,
+            "latency_cv": std / mean if std is not None and mean else None,
+            "latency_min_s": float(latencies.min()) if len(latencies) else None,
+            "latency_max_s": float(latencies.max()) if len(latencies) else None,
+            "attempts": sum(result["attempts"] for result in runs),
+        })
+    return summaries
+
+
+def benchmark_determinism(base_url, timeout, algorithms=tuple(ALGORITHMS), repeats=REPEATS, modes=MODES,
+                          n_orders=DETERMINISM_ORDERS, headers=None):
+    """Every algorithm x mode on one generated order book; returns (results, summaries)"""
+    payload = optimiser_payload(n_orders)
+    results = []
+    for algorithm in algorithms:
+        for mode in modes:
+            results.extend(run_repeats(base_url, algorithm, payload, timeout, repeats=repeats, mode=mode,
+                                       headers=headers))
+    return results, determinism_summary(results)
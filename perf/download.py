@@ -0,0 +1,216 @@
+"""
+Streaming download and incremental validation for /api/download_deckle_orders
+The body is written to a temp file chunk by chunk and validated without ever being held whole.
+"""
+import csv
+import os
+import re
+import resource
+import tempfile
+import time
+
+from openpyxl import load_workbook
+
+CHUNK_SIZE = 256 * 1024
+
+_JSON_STRUCTURAL = re.compile(rb'["\\{}\[\]]')
+
+
+def current_rss_bytes():
+    """Resident set size of this process (Linux /proc, falling back to peak RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def detect_format(first_bytes, content_type=""):
+    """Detect json / csv / xlsx from the first bytes of the body and its Content-Type"""
+    if first_bytes.startswith(b"PK\x03\x04"):
+        return "xlsx"
+    stripped = first_bytes.lstrip()
+    if stripped[:1] in (b"{", b"["):
+        return "json"
+    if "json" in content_type:
+        return "json"
+    if "csv" in content_type or b"," in stripped.split(b"\n", 1)[0]:
+        return "csv"
+    return "unknown"
+
+
+class JsonStreamValidator:
+    """
+    Incremental structural JSON check: balanced brackets, closed strings, a single root.
+    Only structural bytes are visited, so it keeps up with the network.
+    Counts objects that are array elements as records.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.in_string = False
+        self.skip_to = 0
+        self.offset = 0
+        self.records = 0
+        self.root_closed = False
+        self.error = None
+
+    def feed(self, chunk):
+        if self.error:
+            return
+        for match in _JSON_STRUCTURAL.finditer(chunk):
+            position = self.offset + match.start()
+            if position < self.skip_to:
+                continue
+            char = match.group()
+            if self.in_string:
+                if char == b"\\":
+                    self.skip_to = position + 2
+                elif char == b'"':
+                    self.in_string = False
+                continue
+            if char == b'"':
+                self.in_string = True
+            elif char in (b"{", b"["):
+                if self.root_closed:
+                    self.error = f"Data after the root value at byte {position}"
+                    return
+                self.stack.append(char)
+            elif char == b"\\":
+                self.error = f"Backslash outside a string at byte {position}"
+                return
+            else:
+                expected = b"{" if char == b"}" else b"["
+                if not self.stack or self.stack.pop() != expected:
+                    self.error = f"Unbalanced {char.decode()} at byte {position}"
+                    return
+                if char == b"}" and self.stack and self.stack[-1] == b"[":
+                    self.records += 1
+                if not self.stack:
+                    self.root_closed = True
+        self.offset += len(chunk)
+
+    def finish(self):
+        if self.error is None and (self.stack or self.in_string or not self.root_closed):
+            self.error = "Truncated JSON body"
+        return {"valid": self.error is None, "records": self.records, "error": self.error}
+
+
+def validate_csv(path):
+    """Stream a CSV file row by row and check every row has the header's column count"""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return {"valid": False, "records": 0, "error": "Empty CSV body"}
+        records = 0
+        for records, row in enumerate(reader, start=1):
+            if len(row) != len(header):
+                return {"valid": False, "records": records,
+                        "error": f"Row {records} has {len(row)} columns, header has {len(header)}"}
+    return {"valid": True, "records": records, "error": None}
+
+
+def validate_xlsx(path):
+    """Stream the first worksheet in read-only mode and check row widths against the header"""
+    with open(path, "rb") as f:
+        workbook = load_workbook(f, read_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                return {"valid": False, "records": 0, "error": "Empty worksheet"}
+            width = len(header)
+            records = 0
+            for records, row in enumerate(rows, start=1):
+                if len(row) > width and any(value is not None for value in row[width:]):
+                    return {"valid": False, "records": records,
+                            "error": f"Row {records} has values beyond the {width} header columns"}
+            return {"valid": True, "records": records, "error": None}
+        finally:
+            workbook.close()
+
+
+def stream_download(session, url, timeout, params=None, headers=None, chunk_size=CHUNK_SIZE, keep_file=False):
+    """
+    Download url to a temp file in chunks, tracking time-to-first-byte, MB/s and peak RSS,
+    then validate it for its detected format
+    """
+    rss_before = peak_rss = current_rss_bytes()
+    start = time.perf_counter()
+    response = session.get(url, params=params, headers=headers, timeout=timeout, stream=True)
+    headers_s = time.perf_counter() - start
+    ttfb_s = None
+    head = b""
+    size = 0
+    body_format = None
+    json_validator = JsonStreamValidator()
+
+    fd, path = tempfile.mkstemp(prefix="download-", suffix=".bin")
+    try:
+        with os.fdopen(fd, "wb") as f, response:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                if ttfb_s is None:
+                    ttfb_s = time.perf_counter() - start
+                    head = chunk[:200]
+                    body_format = detect_format(chunk[:512], response.headers.get("Content-Type", ""))
+                if body_format == "json":
+                    json_validator.feed(chunk)
+                f.write(chunk)
+                size += len(chunk)
+                peak_rss = max(peak_rss, current_rss_bytes())
+        total_s = time.perf_counter() - start
+
+        if response.status_code != 200:
+            validation = {"valid": None, "records": 0, "error": None}
+        elif body_format == "json":
+            validation = json_validator.finish()
+        elif body_format == "csv":
+            validation = validate_csv(path)
+        elif body_format == "xlsx":
+            validation = validate_xlsx(path)
+        else:
+            validation = {"valid": None, "records": 0, "error": None}
+        peak_rss = max(peak_rss, current_rss_bytes())
+    finally:
+        if not keep_file:
+            os.remove(path)
+
+    transfer_s = total_s - (ttfb_s or total_s)
+    return {
+        "status": response.status_code,
+        "format": body_format or "empty",
+        "bytes": size,
+        "headers_s": headers_s,
+        "ttfb_s": ttfb_s,
+        "total_s": total_s,
+        "mb_per_s": size / 1e6 / total_s if total_s else 0.0,
+        "transfer_mb_per_s": size / 1e6 / transfer_s if transfer_s > 0 else None,
+        "peak_rss_mb": peak_rss / 1e6,
+        "rss_growth_mb": (peak_rss - rss_before) / 1e6,
+        "validation": validation,
+        "error": None if response.status_code == 200 else head.decode(errors="replace"),
+        "path": path if keep_file else None,
+    }
+
+
+def download_scaling_params(company, material_groups, material_codes):
+    """Parameter sets from the whole company down to single material codes, largest export first"""
+    param_sets = [{"company": company}]
+    for group in material_groups:
+        param_sets.append({"company": company, "material_group": group})
+        for code in material_codes:
+            param_sets.append({"company": company, "material_group": group, "material_code": code})
+    return param_sets
+
+
+def benchmark_download_scaling(session, base_url, timeout, company, material_groups, material_codes):
+    """Stream /api/download_deckle_orders for every parameter set; results sorted by export size"""
+    results = []
+    for params in download_scaling_params(company, material_groups, material_codes):
+        result = stream_download(session, f"{base_url}/api/download_deckle_orders", timeout, params=params)
+        result["params"] = params
+        results.append(result)
+    return sorted(results, key=lambda result: result["bytes"])
@@ -0,0 +1,49 @@
+"""
+Registry of endpoint probes shared by the load benchmarks
+Each entry is one representative request with valid parameters, marked heavy (solver, export or
+upstream work) or light (page-load reads). seed_endpoints creates the records the reads look up.
+"""
+from perf.orders import optimiser_payload
+from perf.workload import COMPANY, MACHINE_TYPE, USER_ID, seed_workload
+
+# name: (method, path, query params, JSON body factory, heavy)
+ENDPOINTS = {
+    "health": ("GET", "/", None, None, False),
+    "get_details": ("GET", "/get_details", {"userId": USER_ID}, None, False),
+    "get_machine_details": ("GET", "/get_machine_details", {"company": COMPANY, "machineType": MACHINE_TYPE}, None,
+                            False),
+    "fetch_material_groups": ("GET", "/api/fetch_material_groups", {"company": COMPANY}, None, False),
+    "fetch_parameters": ("GET", "/api/fetch_parameters", None, None, False),
+    "fetch_plan_data": ("GET", "/api/fetch_plan_data", {
+        "algorithm": "setting", "company": COMPANY, "product_name": "CB10NB", "product_config": "100_200_870",
+        "machine_type": "Primary", "plant": "AMD",
+    }, None, False),
+    "fetch_plans_by_material_code": ("GET", "/api/fetch_plans_by_material_code", {
+        "material_code": "MAT001", "company": COMPANY, "machine_type": "Primary", "plant": "AMD",
+    }, None, False),
+    "optimise_setting": ("POST", "/api/optimise_setting", None, lambda: optimiser_payload(50), True),
+    "optimise_hybrid": ("POST", "/api/optimise_hybrid", None, lambda: optimiser_payload(50), True),
+    "optimise_wastage": ("POST", "/api/optimise_wastage", None, lambda: optimiser_payload(50), True),
+    "download_deckle_orders": ("GET", "/api/download_deckle_orders", {"company": COMPANY}, None, True),
+    "sap_data": ("GET", "/api/sap_data", {"start_date": "2024-01-01", "end_date": "2024-01-31",
+                                          "material_code": "MAT001"}, None, True),
+}
+
+
+def heavy_endpoints():
+    return [name for name, spec in ENDPOINTS.items() if spec[-1]]
+
+
+def light_endpoints():
+    return [name for name, spec in ENDPOINTS.items() if not spec[-1]]
+
+
+def endpoint_request(name):
+    """(method, path, params, json) for a registry entry, with a fresh JSON body"""
+    method, path, params, body, _ = ENDPOINTS[name]
+    return method, path, params, body() if body else None
+
+
+def seed_endpoints(session, base_url, timeout, headers=None):
+    """Create the user and machine the registry's reads look up"""
+    return seed_workload(session, base_url, timeout, headers=headers)
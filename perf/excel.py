@@ -0,0 +1,148 @@
+"""
+Large Excel order books and streamed multipart uploads for /api/preprocess_excel_data
+"""
+import os
+import tempfile
+import time
+import uuid
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from perf.orders import PLANNER_COLUMNS, planner_rows
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+BENCHMARK_SIZES = (1_000, 10_000, 50_000, 200_000)
+
+
+def write_order_book(path, n_rows, month_year="2024-01", seed=0):
+    """Write an .xlsx order book row by row (write-only mode keeps memory flat)"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Orders")
+    sheet.append(PLANNER_COLUMNS)
+    for row in planner_rows(n_rows, month_year=month_year, seed=seed):
+        sheet.append([row[column] for column in PLANNER_COLUMNS])
+    workbook.save(path)
+    return path
+
+
+class MultipartFileStream:
+    """
+    File-like multipart/form-data body that reads the uploaded file from disk on demand.
+    requests sends it with a Content-Length and pulls it in small blocks, so the
+    file is never held in memory.
+    """
+
+    def __init__(self, path, field_name="file", filename=None, content_type=XLSX_CONTENT_TYPE,
+                 fields=None, chunk_size=64 * 1024):
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        head = b""
+        for name, value in (fields or {}).items():
+            head += (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f"{value}\r\n"
+            ).encode()
+        head += (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; '
+            f'filename="{filename or os.path.basename(path)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{self.boundary}--\r\n".encode()
+
+        self._length = len(head) + os.path.getsize(path) + len(tail)
+        self._parts = [BytesIO(head), open(path, "rb"), BytesIO(tail)]
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        chunks = []
+        while self._parts and size != 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0).close()
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
+
+    def close(self):
+        for part in self._parts:
+            part.close()
+        self._parts = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _parsed_rows(response):
+    """Rows the API reports parsing: a row count or a list of records; None if the body carries neither"""
+    try:
+        data = response.json()
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        data = data.get("rows", data.get("data"))
+    if isinstance(data, list):
+        return len(data)
+    return data if isinstance(data, int) else None
+
+
+def upload_order_book(session, base_url, path, n_rows, timeout, fields=None):
+    """Stream one order book to /api/preprocess_excel_data and time upload + preprocessing"""
+    with MultipartFileStream(path, fields=fields) as body:
+        start = time.perf_counter()
+        response = session.post(
+            f"{base_url}/api/preprocess_excel_data",
+            data=body,
+            headers={"Content-Type": body.content_type, "Accept": "application/json"},
+            timeout=timeout
+        )
+        elapsed = time.perf_counter() - start
+        size = len(body)
+    return {
+        "rows": n_rows,
+        "bytes": size,
+        "status": response.status_code,
+        "latency_s": elapsed,
+        "rows_per_s": n_rows / elapsed if elapsed else 0.0,
+        "mb_per_s": size / 1e6 / elapsed if elapsed else 0.0,
+        "parsed_rows": _parsed_rows(response) if response.status_code == 200 else None,
+        "error": None if response.status_code == 200 else response.text[:200],
+    }
+
+
+def benchmark_excel_upload(session, base_url, timeout, sizes=BENCHMARK_SIZES, fields=None, seed=0):
+    """Generate, upload and time one order book per size; files live only for their own upload"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="order-books-") as workdir:
+        for n_rows in sizes:
+            path = os.path.join(workdir, f"orders_{n_rows}.xlsx")
+            start = time.perf_counter()
+            write_order_book(path, n_rows, seed=seed)
+            generate_s = time.perf_counter() - start
+
+            result = upload_order_book(session, base_url, path, n_rows, timeout, fields=fields)
+            result["generate_s"] = generate_s
+            results.append(result)
+            os.remove(path)
+    return results
@@ -0,0 +1,203 @@
+"""
+Latency-guided fuzzer for pathological optimiser inputs
+Starting from a generated order book, each step applies one mutation known to stress cutting-stock
+solvers: widths just under the usable width (max_width - minimum_trim), clusters of near-duplicate
+widths, extreme "Rolls" counts, or a flipped MustMake/Optional mix. A mutant is kept when the
+optimiser takes clearly longer on it than on the current case. The slowest cases are then shrunk,
+dropping orders for as long as the solve stays slow, and saved as JSON reproducers. Every call goes
+through the solver lane, so the fuzzer runs against the stand-in or the live API alike.
+Each run saves its reproducers in the run's report directory and promotes those at least
+PROMOTE_SLOWDOWN x slower than the unmutated order book into fixtures/fuzz, the committed corpus
+the benchmark replays on every run.
+"""
+import copy
+import hashlib
+import json
+import os
+import random
+import shutil
+
+import requests
+
+from perf.orders import optimiser_payload
+from perf.pareto import ALGORITHMS
+from perf.solver_lane import post_in_lane
+
+FUZZ_ORDERS = 30
+FUZZ_ITERATIONS = 40
+# A mutant replaces the current case only when it is this much slower (guards against timing noise)
+KEEP_MARGIN = 1.2
+# A shrunk case must keep this share of the original slowdown
+SHRINK_FRACTION = 0.8
+WORST_CASES = 3
+# Reproducers this much slower than the unmutated order book join the committed fixtures
+PROMOTE_SLOWDOWN = 2.0
+FUZZ_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "fuzz")
+EXTREME_ROLLS = (1, 2000, 5000)
+
+
+def _set_rolls(order, rolls):
+    order["Rolls"] = rolls
+    quantity = rolls * 300
+    order["Pend. Prod"] = order["    SO.Qty"] = order["Pend. Disp"] = quantity
+
+
+def near_usable_width(payload, rng):
+    """One order's width moved to within 50 mm under max_width - minimum_trim"""
+    usable = payload["max_width"] - payload["minimum_trim"]
+    rng.choice(payload["data"])["Width"] = usable - 5 * rng.randint(0, 10)
+
+
+def near_duplicate_widths(payload, rng):
+    """Several orders moved to within a few mm of one order's width"""
+    anchor = rng.choice(payload["data"])["Width"]
+    for order in rng.sample(payload["data"], min(len(payload["data"]), rng.randint(2, 6))):
+        order["Width"] = anchor + 5 * rng.randint(-2, 2)
+
+
+def extreme_rolls(payload, rng):
+    """One order's Rolls (and quantities) set to an extreme count"""
+    _set_rolls(rng.choice(payload["data"]), rng.choice(EXTREME_ROLLS))
+
+
+def flip_options(payload, rng):
+    """A random share of orders flipped between MustMake and Optional"""
+    for order in rng.sample(payload["data"], max(1, len(payload["data"]) // rng.randint(2, 5))):
+        order["Option"] = "Optional" if order.get("Option") == "MustMake" else "MustMake"
+
+
+MUTATIONS = {
+    "near_usable_width": near_usable_width,
+    "near_duplicate_widths": near_duplicate_widths,
+    "extreme_rolls": extreme_rolls,
+    "flip_options": flip_options,
+}
+
+
+def lane_latency(base_url, algorithm, timeout, headers=None, session=None):
+    """measure(payload) for the fuzzer: (latency_s, status) of one solver-lane call; a timeout counts as `timeout`"""
+    session = session or requests.Session()
+    url = f"{base_url}{ALGORITHMS[algorithm]}"
+
+    def measure(payload):
+        lane = post_in_lane(session, url, payload, timeout, headers=headers)
+        if lane["error"] == "timeout":
+            return float(timeout), None
+        return lane["latency_s"], lane["response"].status_code if lane["response"] is not None else None
+
+    return measure
+
+
+def _usable(latency_s, status):
+    # Timeouts are the most pathological result of all; other failures are invalid inputs, not slow ones
+    return status == 200 or status is None
+
+
+def fuzz(measure, payload, iterations=FUZZ_ITERATIONS, keep_margin=KEEP_MARGIN, seed=0):
+    """
+    Hill-climb on latency from payload. Returns (corpus, steps): corpus is every kept case (payload,
+    latency_s, mutations applied so far) slowest first; steps has one row per mutant tried.
+    """
+    rng = random.Random(seed)
+    latency_s, status = measure(payload)
+    current = {"payload": payload, "latency_s": latency_s, "mutations": []}
+    corpus, steps = [current], []
+    for iteration in range(iterations):
+        name = rng.choice(list(MUTATIONS))
+        mutant = copy.deepcopy(current["payload"])
+        MUTATIONS[name](mutant, rng)
+        latency_s, status = measure(mutant)
+        kept = _usable(latency_s, status) and latency_s > current["latency_s"] * keep_margin
+        steps.append({"iteration": iteration, "mutation": name, "latency_s": latency_s, "status": status,
+                      "kept": kept, "best_latency_s": max(current["latency_s"], latency_s if kept else 0.0)})
+        if kept:
+            current = {"payload": mutant, "latency_s": latency_s, "mutations": current["mutations"] + [name]}
+            corpus.append(current)
+    return sorted(corpus, key=lambda case: -case["latency_s"]), steps
+
+
+def shrink(measure, case, fraction=SHRINK_FRACTION):
+    """
+    Delta-debug the case's orders: drop chunks (halves, then quarters, ... then single orders) for
+    as long as the solve still takes fraction x the case's latency. Returns the reduced case.
+    """
+    target = case["latency_s"] * fraction
+    orders = list(case["payload"]["data"])
+    latency_s, chunks = case["latency_s"], 2
+    while len(orders) > 1 and chunks <= len(orders) * 2:
+        size = max(1, len(orders) // chunks)
+        reduced = False
+        for start in range(0, len(orders), size):
+            candidate = orders[:start] + orders[start + size:]
+            if not candidate:
+                continue
+            candidate_latency, status = measure(dict(case["payload"], data=candidate))
+            if _usable(candidate_latency, status) and candidate_latency >= target:
+                orders, latency_s, reduced = candidate, candidate_latency, True
+                break
+        if reduced:
+            chunks = max(2, chunks - 1)
+        elif size == 1:
+            break
+        else:
+            chunks *= 2
+    return {"payload": dict(case["payload"], data=orders), "latency_s": latency_s, "mutations": case["mutations"],
+            "original_orders": len(case["payload"]["data"]), "original_latency_s": case["latency_s"]}
+
+
+def save_reproducer(case, algorithm, baseline_latency_s, directory=FUZZ_FIXTURE_DIR):
+    """Write a shrunk case as <algorithm>-<payload hash>.json; returns the path"""
+    digest = hashlib.sha256(json.dumps(case["payload"], sort_keys=True).encode()).hexdigest()[:12]
+    path = os.path.join(directory, f"{algorithm}-{digest}.json")
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(dict(case, algorithm=algorithm, baseline_latency_s=baseline_latency_s,
+                       slowdown=case["latency_s"] / baseline_latency_s if baseline_latency_s else None), f, indent=2)
+    return path
+
+
+def load_reproducers(directory=FUZZ_FIXTURE_DIR):
+    """Every saved reproducer, by file name"""
+    if not os.path.isdir(directory):
+        return {}
+    reproducers = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                reproducers[name] = json.load(f)
+    return reproducers
+
+
+def promote_reproducers(saved, min_slowdown=PROMOTE_SLOWDOWN, directory=FUZZ_FIXTURE_DIR):
+    """Copy saved reproducers at least min_slowdown x their baseline into the fixtures; returns the new paths"""
+    promoted = []
+    for case in saved:
+        if not case["baseline_latency_s"] or case["latency_s"] < min_slowdown * case["baseline_latency_s"]:
+            continue
+        path = os.path.join(directory, os.path.basename(case["path"]))
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            shutil.copyfile(case["path"], path)
+            promoted.append(path)
+    return promoted
+
+
+def fuzz_optimiser(base_url, algorithm, timeout, n_orders=FUZZ_ORDERS, iterations=FUZZ_ITERATIONS,
+                   keep_margin=KEEP_MARGIN, worst_cases=WORST_CASES, directory=FUZZ_FIXTURE_DIR, headers=None, seed=0):
+    """
+    Fuzz one optimiser from a generated order book, shrink its slowest kept cases and save them.
+    Returns (steps, saved reproducer summaries).
+    """
+    measure = lane_latency(base_url, algorithm, timeout, headers=headers)
+    corpus, steps = fuzz(measure, optimiser_payload(n_orders, seed=seed), iterations=iterations,
+                          keep_margin=keep_margin, seed=seed)
+    baseline = next(case for case in corpus if not case["mutations"])
+    saved = []
+    for case in [case for case in corpus if case["mutations"]][:worst_cases]:
+        reduced = shrink(measure, case)
+        path = save_reproducer(reduced, algorithm, baseline["latency_s"], directory=directory)
+        saved.append({"algorithm": algorithm, "path": path, "orders": len(reduced["payload"]["data"]),
+                      "original_orders": reduced["original_orders"], "latency_s": reduced["latency_s"],
+                      "original_latency_s": reduced["original_latency_s"], "baseline_latency_s": baseline["latency_s"],
+                      "mutations": reduced["mutations"]})
+    return steps, saved
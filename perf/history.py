@@ -0,0 +1,40 @@
+"""
+Run history: rows from every benchmark run appended to one JSON-lines file in PERF_REPORT_DIR
+Unlike the per-run report, the history is kept across runs so trends can be compared run to run.
+"""
+import json
+import os
+import threading
+
+import pandas as pd
+
+from config import PERF_REPORT_DIR
+
+RUN_HISTORY_FILE = "history.jsonl"
+
+_lock = threading.Lock()
+
+
+def history_path(directory=PERF_REPORT_DIR):
+    return os.path.join(directory, RUN_HISTORY_FILE)
+
+
+def append_history(run_id, kind, rows, directory=PERF_REPORT_DIR):
+    """Append rows tagged with run_id and kind; returns the file path"""
+    path = history_path(directory)
+    os.makedirs(directory, exist_ok=True)
+    with _lock, open(path, "a") as f:
+        for row in rows:
+            f.write(json.dumps({"run_id": run_id, "kind": kind, **row}, default=str) + "\n")
+    return path
+
+
+def load_history(kind=None, directory=PERF_REPORT_DIR):
+    """Every stored row (of one kind, if given) as a DataFrame, oldest first"""
+    path = history_path(directory)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    frame = pd.DataFrame(rows)
+    return frame[frame["kind"] == kind].reset_index(drop=True) if kind and not frame.empty else frame
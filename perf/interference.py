@@ -0,0 +1,161 @@
+"""
+Cross-endpoint interference matrix
+For every (background A, foreground B) pair of registry endpoints, A is driven at a fixed load
+by closed-loop workers while B is probed at a low rate; B's median latency is compared with its
+median on an idle service. The shifts form a matrix showing which heavy routes starve which
+light ones. Optimiser backgrounds queue in the solver lane, so they drive the single solver
+licence rather than collecting licence-busy 500s.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import requests
+
+from perf.endpoints import ENDPOINTS, endpoint_request, heavy_endpoints, light_endpoints, seed_endpoints
+from perf.solver_lane import request_in_lane
+
+BACKGROUND_WORKERS = 4
+PROBES = 10
+PROBE_INTERVAL_S = 0.2
+WARMUP_S = 1.0
+# Slow backgrounds may not finish a request inside the probe window; wait this long for one to complete
+BACKGROUND_COMPLETION_POLL_S = 0.01
+
+
+def probe(session, base_url, name, timeout, probes=PROBES, interval_s=PROBE_INTERVAL_S, headers=None):
+    """Send `probes` requests to one endpoint, one at a time and interval_s apart; returns latencies and errors"""
+    latencies, errors = [], 0
+    for index in range(probes):
+        method, path, params, body = endpoint_request(name)
+        start = time.perf_counter()
+        try:
+            status = session.request(method, f"{base_url}{path}", params=params, json=body, headers=headers,
+                                     timeout=timeout).status_code
+        except requests.exceptions.RequestException:
+            status = None
+        latencies.append(time.perf_counter() - start)
+        errors += status != 200
+        if index < probes - 1:
+            time.sleep(interval_s)
+    return latencies, errors
+
+
+@contextmanager
+def background_load(base_url, name, timeout, workers=BACKGROUND_WORKERS, headers=None):
+    """Drive one endpoint with `workers` closed-loop threads while the block runs; yields live request counts"""
+    stop, stats, lock = threading.Event(), {"requests": 0, "errors": 0}, threading.Lock()
+
+    solver = ENDPOINTS[name][1].startswith("/api/optimise_")
+
+    def worker():
+        session = requests.Session()
+        while not stop.is_set():
+            method, path, params, body = endpoint_request(name)
+            try:
+                if solver:
+                    response = request_in_lane(session, method, f"{base_url}{path}", body, timeout,
+                                               headers=headers)["response"]
+                    status = response.status_code if response is not None else None
+                else:
+                    status = session.request(method, f"{base_url}{path}", params=params, json=body,
+                                             headers=headers, timeout=timeout).status_code
+            except requests.exceptions.RequestException:
+                status = None
+            with lock:
+                stats["requests"] += 1
+                stats["errors"] += status != 200
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        yield stats
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def wait_for_completions(stats, since, timeout):
+    """Block until a background request completes after `since` requests, or timeout passes; returns the count"""
+    deadline = time.perf_counter() + timeout
+    while stats["requests"] <= since and time.perf_counter() < deadline:
+        time.sleep(BACKGROUND_COMPLETION_POLL_S)
+    return stats["requests"] - since
+
+
+def measure_interference(base_url, timeout, backgrounds=None, foregrounds=None, workers=BACKGROUND_WORKERS,
+                         probes=PROBES, probe_interval_s=PROBE_INTERVAL_S, warmup_s=WARMUP_S, headers=None):
+    """
+    Probe every foreground idle, then under each background's load. Returns one row per
+    (background, foreground) with idle and loaded p50, the shift as a ratio and in ms, and errors.
+    """
+    backgrounds = heavy_endpoints() if backgrounds is None else backgrounds
+    foregrounds = light_endpoints() if foregrounds is None else foregrounds
+    session = requests.Session()
+    seed_endpoints(session, base_url, timeout, headers=headers)
+    options = dict(probes=probes, interval_s=probe_interval_s, headers=headers)
+
+    idle = {name: probe(session, base_url, name, timeout, **options) for name in foregrounds}
+    rows = []
+    for background in backgrounds:
+        with background_load(base_url, background, timeout, workers=workers, headers=headers) as stats:
+            time.sleep(warmup_s)
+            started, requests_before, errors_before = time.perf_counter(), stats["requests"], stats["errors"]
+            loaded = {name: probe(session, base_url, name, timeout, **options) for name in foregrounds}
+            # Rate over completed requests: the window stays open until at least one has finished
+            completed = wait_for_completions(stats, requests_before, timeout)
+            background_rps = completed / (time.perf_counter() - started)
+            background_errors = stats["errors"] - errors_before
+        for name in foregrounds:
+            idle_p50, loaded_p50 = float(np.median(idle[name][0])), float(np.median(loaded[name][0]))
+            rows.append({
+                "background": background,
+                "foreground": name,
+                "workers": workers,
+                "background_rps": background_rps,
+                "background_errors": background_errors,
+                "idle_p50_s": idle_p50,
+                "loaded_p50_s": loaded_p50,
+                "shift_ratio": loaded_p50 / idle_p50 if idle_p50 else None,
+                "shift_ms": (loaded_p50 - idle_p50) * 1000,
+                "idle_errors": idle[name][1],
+                "loaded_errors": loaded[name][1],
+            })
+    return rows
+
+
+def interference_matrix(rows, value="shift_ratio"):
+    """Backgrounds x foregrounds DataFrame of one measured value, in registry order"""
+    frame = pd.DataFrame(rows)
+    return frame.pivot(index="background", columns="foreground", values=value) \
+        .reindex(index=list(dict.fromkeys(frame["background"])), columns=list(dict.fromkeys(frame["foreground"])))
+
+
+def plot_interference(rows, path, value="shift_ratio"):
+    """Annotated heatmap of the interference matrix"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    matrix = interference_matrix(rows, value=value)
+    figure, axis = plt.subplots(figsize=(1.4 * len(matrix.columns) + 3, 0.8 * len(matrix.index) + 2))
+    image = axis.imshow(matrix.to_numpy(dtype=float), aspect="auto", cmap="Reds")
+    axis.set_xticks(range(len(matrix.columns)), matrix.columns, rotation=45, ha="right")
+    axis.set_yticks(range(len(matrix.index)), matrix.index)
+    for (row, column), shift in np.ndenumerate(matrix.to_numpy(dtype=float)):
+        if not np.isnan(shift):
+            axis.text(column, row, f"{shift:.1f}", ha="center", va="center", fontsize=8)
+    axis.set_xlabel("foreground (probed)")
+    axis.set_ylabel("background (loaded)")
+    axis.set_title(f"Foreground p50 under background load ({value})")
+    figure.colorbar(image, ax=axis)
+    figure.tight_layout()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    figure.savefig(path)
+    plt.close(figure)
+    return path
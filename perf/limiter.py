@@ -0,0 +1,140 @@
+"""
+Client-side load guard for running the load engines against the shared API
+An AIMD limiter bounds requests in flight: the limit grows by about one per round of requests
+answered under the latency target and halves on a timeout, a 5xx/429 or a latency spike (at most
+once per round, so one burst of slow answers counts as one congestion signal). A token bucket
+caps the request rate regardless of how fast the service answers.
+"""
+import threading
+import time
+
+import requests
+
+from config import LOAD_ADAPTIVE_CONCURRENCY, LOAD_MAX_CONCURRENCY, LOAD_RATE_CAP_RPS, LOAD_TARGET_LATENCY_S
+
+INITIAL_LIMIT = 2
+MIN_LIMIT = 1
+DECREASE = 0.5
+
+
+class TokenBucket:
+    """At most `burst` request starts at once, refilled at rate_per_s; waits are reserved in arrival order"""
+
+    def __init__(self, rate_per_s, burst=1):
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.perf_counter()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_s)
+            self.updated = now
+            # A negative balance is a reservation: this caller starts once the bucket refills to zero
+            self.tokens -= 1
+            wait = -self.tokens / self.rate_per_s if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+class AIMDLimiter:
+    """Additive-increase, multiplicative-decrease bound on requests in flight"""
+
+    def __init__(self, target_latency_s=LOAD_TARGET_LATENCY_S, initial=INITIAL_LIMIT, min_limit=MIN_LIMIT,
+                 max_limit=LOAD_MAX_CONCURRENCY, decrease=DECREASE):
+        self.target_latency_s = target_latency_s
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.in_flight = 0
+        self.decreases = 0
+        self.history = [(time.perf_counter(), self.limit)]
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot"""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, started, status):
+        """Free the slot and adjust the limit from the outcome (status None for a timeout or connection error)"""
+        now = time.perf_counter()
+        overloaded = status is None or status >= 500 or status == 429 or now - started > self.target_latency_s
+        with self._condition:
+            self.in_flight -= 1
+            if not overloaded:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif started >= self._last_decrease:
+                # Requests sent before the last decrease reflect the old limit; don't punish it twice
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._last_decrease = now
+                self.decreases += 1
+            self.history.append((now, self.limit))
+            self._condition.notify_all()
+
+
+class LoadGuard:
+    """Applies an optional AIMD limiter and token-bucket cap around each request of a load engine"""
+
+    def __init__(self, limiter=None, bucket=None):
+        self.limiter = limiter
+        self.bucket = bucket
+
+    def wait(self):
+        """Block until the limiter and the cap let one request start; returns the ticket for done()"""
+        if self.limiter:
+            self.limiter.acquire()
+        if self.bucket:
+            self.bucket.acquire()
+        return time.perf_counter()
+
+    def done(self, ticket, status):
+        if self.limiter:
+            self.limiter.release(ticket, status)
+
+    def request(self, session, method, url, **kwargs):
+        """Send one request under the guard; returns its status code, or None on a request error"""
+        ticket, status = self.wait(), None
+        try:
+            status = session.request(method, url, **kwargs).status_code
+        except requests.exceptions.RequestException:
+            pass
+        finally:
+            self.done(ticket, status)
+        return status
+
+    def summary(self):
+        """Limiter and cap settings with the range of limits reached, for the run report"""
+        limits = [limit for _, limit in self.limiter.history] if self.limiter else []
+        return {
+            "rate_cap_rps": self.bucket.rate_per_s if self.bucket else None,
+            "adaptive": self.limiter is not None,
+            "target_latency_s": self.limiter.target_latency_s if self.limiter else None,
+            "final_limit": self.limiter.limit if self.limiter else None,
+            "min_limit_seen": min(limits) if limits else None,
+            "max_limit_seen": max(limits) if limits else None,
+            "decreases": self.limiter.decreases if self.limiter else 0,
+        }
+
+
+def guarded_status(session, method, url, guard=None, **kwargs):
+    """Status code of one request, sent through the guard when one is given; None on a request error"""
+    if guard:
+        return guard.request(session, method, url, **kwargs)
+    try:
+        return session.request(method, url, **kwargs).status_code
+    except requests.exceptions.RequestException:
+        return None
+
+
+def guard_from_config():
+    """LoadGuard from the LOAD_* settings, or None when neither the cap nor the adaptive limit is on"""
+    limiter = AIMDLimiter() if LOAD_ADAPTIVE_CONCURRENCY else None
+    bucket = TokenBucket(LOAD_RATE_CAP_RPS) if LOAD_RATE_CAP_RPS > 0 else None
+    return LoadGuard(limiter, bucket) if limiter or bucket else None
@@ -0,0 +1,224 @@
+"""
+Synthetic monitor: the health check, key fetch endpoints and one small optimisation, on a jittered
+schedule, for as long as the process runs
+Checks reuse the endpoint registry of the load benchmarks; the optimisation goes through the
+solver lane. One session is kept warm between rounds with cheap health pings, so latency is
+measured on a reused connection as a planner's browser would see it. After every round the
+monitor rewrites an OpenMetrics text file (cumulative histograms, failures, last status) and
+rolling per-check histograms over the last hour, both in PERF_REPORT_DIR.
+
+    python -m perf.monitor [--interval 60] [--rounds N]
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import API_BASE_URL, API_TIMEOUT, MONITOR_INTERVAL_S, PERF_REPORT_DIR
+from perf.endpoints import endpoint_request, seed_endpoints
+from perf.orders import optimiser_payload
+from perf.solver_lane import license_busy, request_in_lane
+
+SMALL_OPTIMISATION_ORDERS = 5
+MONITOR_CHECKS = ("health", "fetch_parameters", "fetch_material_groups", "fetch_plan_data",
+                  "fetch_plans_by_material_code", "optimise_small")
+# Each round starts interval x (1 +/- jitter) after the last, so checks never line up with other cron jobs
+MONITOR_JITTER = 0.2
+KEEPALIVE_S = 20.0
+ROLLING_WINDOW_S = 3600.0
+LATENCY_BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_FILE = "monitor.om"
+HISTOGRAMS_FILE = "monitor-histograms.json"
+METRIC_PREFIX = "deckle_check"
+
+
+def _write_atomic(path, text):
+    """Replace path in one step, so a scraper never reads a half-written file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        f.write(text)
+    os.replace(temporary, path)
+    return path
+
+
+class Monitor:
+    """Runs the checks in rounds and keeps cumulative and rolling latency histograms per check"""
+
+    def __init__(self, base_url, timeout, checks=MONITOR_CHECKS, interval_s=MONITOR_INTERVAL_S,
+                 jitter=MONITOR_JITTER, keepalive_s=KEEPALIVE_S, rolling_window_s=ROLLING_WINDOW_S,
+                 directory=PERF_REPORT_DIR, headers=None, seed=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.checks = checks
+        self.interval_s = interval_s
+        self.jitter = jitter
+        self.keepalive_s = keepalive_s
+        self.rolling_window_s = rolling_window_s
+        self.directory = directory
+        self.headers = headers
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+        self.session.mount(base_url, HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.buckets = {check: [0] * (len(LATENCY_BUCKETS_S) + 1) for check in checks}
+        self.sums = {check: 0.0 for check in checks}
+        self.failures = {check: 0 for check in checks}
+        self.license_busy = {check: 0 for check in checks}
+        self.last = {check: None for check in checks}
+        self.recent = {check: deque() for check in checks}
+        self.rounds = 0
+        self.seeded = False
+
+    def _send(self, check):
+        """(latency_s, status, licence busy) of one check"""
+        if check == "optimise_small":
+            start = time.perf_counter()
+            try:
+                result = request_in_lane(self.session, "POST", f"{self.base_url}/api/optimise_hybrid",
+                                         optimiser_payload(SMALL_OPTIMISATION_ORDERS), self.timeout,
+                                         headers=self.headers, retries=0)
+            except requests.exceptions.RequestException:
+                return time.perf_counter() - start, None, False
+            response = result["response"]
+            return result["latency_s"], response.status_code if response is not None else None, license_busy(response)
+        method, path, params, body = endpoint_request(check)
+        start = time.perf_counter()
+        try:
+            status = self.session.request(method, f"{self.base_url}{path}", params=params, json=body,
+                                          headers=self.headers, timeout=self.timeout).status_code
+        except requests.exceptions.RequestException:
+            status = None
+        return time.perf_counter() - start, status, False
+
+    def record(self, check, latency_s, status, now=None):
+        """Add one sample to the cumulative and rolling histograms"""
+        now = time.time() if now is None else now
+        self.buckets[check][int(np.searchsorted(LATENCY_BUCKETS_S, latency_s))] += 1
+        self.sums[check] += latency_s
+        self.failures[check] += status != 200
+        self.last[check] = {"status": status, "latency_s": latency_s, "at": now}
+        recent = self.recent[check]
+        recent.append((now, latency_s, status))
+        while recent and recent[0][0] < now - self.rolling_window_s:
+            recent.popleft()
+
+    def seed(self):
+        """Create the user and machine the checks read, once; an unreachable API is retried next round"""
+        if not self.seeded:
+            try:
+                seed_endpoints(self.session, self.base_url, self.timeout, headers=self.headers)
+                self.seeded = True
+            except requests.exceptions.RequestException:
+                pass
+        return self.seeded
+
+    def run_once(self):
+        """Run every check once, in order; a busy solver licence is counted but not sampled"""
+        self.seed()
+        for check in self.checks:
+            latency_s, status, busy = self._send(check)
+            if busy:
+                self.license_busy[check] += 1
+            else:
+                self.record(check, latency_s, status)
+        self.rounds += 1
+
+    def next_delay(self):
+        return self.interval_s * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _keepalive(self):
+        try:
+            self.session.get(f"{self.base_url}/", headers=self.headers, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            pass
+
+    def run(self, rounds=None, stop=None):
+        """Run rounds until `rounds` are done or `stop` is set, writing the metrics after each"""
+        stop = stop or threading.Event()
+        while not stop.is_set() and (rounds is None or self.rounds < rounds):
+            self.run_once()
+            self.write()
+            if rounds is not None and self.rounds >= rounds:
+                break
+            deadline = time.monotonic() + self.next_delay()
+            # Ping between rounds so idle-timeouts on the load balancer never close the pooled connection
+            while not stop.wait(max(0.0, min(self.keepalive_s, deadline - time.monotonic()))):
+                if time.monotonic() >= deadline:
+                    break
+                self._keepalive()
+
+    def openmetrics(self):
+        """OpenMetrics text exposition of the cumulative histograms, failures and last status per check"""
+        name = f"{METRIC_PREFIX}_latency_seconds"
+        lines = [f"# TYPE {name} histogram", f"# UNIT {name} seconds",
+                 f"# HELP {name} Latency of each synthetic check since the monitor started."]
+        for check in self.checks:
+            cumulative = np.cumsum(self.buckets[check])
+            for bound, count in zip(LATENCY_BUCKETS_S + ("+Inf",), cumulative):
+                lines.append(f'{name}_bucket{{check="{check}",le="{bound}"}} {count}')
+            lines.append(f'{name}_count{{check="{check}"}} {cumulative[-1]}')
+            lines.append(f'{name}_sum{{check="{check}"}} {self.sums[check]:.6f}')
+        for family, help_text, values in (
+                ("failures", "Checks answered with a non-200 status or not at all.", self.failures),
+                ("license_busy", "Optimisation checks skipped because the solver licence was taken.",
+                 self.license_busy)):
+            lines += [f"# TYPE {METRIC_PREFIX}_{family} counter", f"# HELP {METRIC_PREFIX}_{family} {help_text}"]
+            lines += [f'{METRIC_PREFIX}_{family}_total{{check="{check}"}} {values[check]}' for check in self.checks]
+        lines += [f"# TYPE {METRIC_PREFIX}_up gauge", f"# HELP {METRIC_PREFIX}_up 1 if the last check returned 200."]
+        lines += [f'{METRIC_PREFIX}_up{{check="{check}"}} {int(self.last[check]["status"] == 200)}'
+                  for check in self.checks if self.last[check]]
+        return "\n".join(lines + ["# EOF"]) + "\n"
+
+    def rolling_histograms(self):
+        """Per check: bucket counts, p50/p99 and errors over the rolling window"""
+        histograms = {}
+        for check in self.checks:
+            latencies = np.array([latency for _, latency, _ in self.recent[check]])
+            counts = np.bincount(np.searchsorted(LATENCY_BUCKETS_S, latencies), minlength=len(LATENCY_BUCKETS_S) + 1)
+            p50, p99 = (float(value) for value in np.percentile(latencies, [50, 99])) if len(latencies) \
+                else (None, None)
+            histograms[check] = {
+                "window_s": self.rolling_window_s,
+                "samples": len(latencies),
+                "buckets": dict(zip([str(bound) for bound in LATENCY_BUCKETS_S] + ["+Inf"], counts.tolist())),
+                "p50_s": p50,
+                "p99_s": p99,
+                "errors": sum(status != 200 for _, _, status in self.recent[check]),
+            }
+        return histograms
+
+    def write(self):
+        """Rewrite the OpenMetrics file and rolling histograms; returns both paths"""
+        metrics = _write_atomic(os.path.join(self.directory, METRICS_FILE), self.openmetrics())
+        histograms = _write_atomic(os.path.join(self.directory, HISTOGRAMS_FILE),
+                                   json.dumps({"updated_at": time.time(), "rounds": self.rounds,
+                                               "checks": self.rolling_histograms()}, indent=2))
+        return metrics, histograms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic monitor for the Module-DeckleOptimiser API")
+    parser.add_argument("--base-url", default=API_BASE_URL)
+    parser.add_argument("--interval", type=float, default=MONITOR_INTERVAL_S, help="seconds between rounds")
+    parser.add_argument("--rounds", type=int, default=None, help="stop after this many rounds (default: run forever)")
+    parser.add_argument("--directory", default=PERF_REPORT_DIR)
+    args = parser.parse_args(argv)
+
+    monitor = Monitor(args.base_url, API_TIMEOUT, interval_s=args.interval, directory=args.directory,
+                      headers={"Content-Type": "application/json", "Accept": "application/json"})
+    try:
+        monitor.run(rounds=args.rounds)
+    except KeyboardInterrupt:
+        pass
+    print(f"{monitor.rounds} rounds; metrics in {os.path.join(args.directory, METRICS_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
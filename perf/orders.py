@@ -0,0 +1,190 @@
+"""
+Synthetic SAP order books in the column layout the trim-manager API consumes
+"""
+import calendar
+import random
+from datetime import date
+
+# Column layout of the SAP rows sent to the planner endpoints (see valid_planner_data)
+PLANNER_COLUMNS = [
+    "Sales Orde",
+    "SO.Qty",
+    "SO.Type",
+    "Pend. Prod",
+    "Mat.Grp.",
+    "Material",
+    "Micron",
+    "Req.Del.Dt",
+    "Prod.Statu",
+    "Rolls",
+    "Width",
+    "Consignee Name",
+    "Stock",
+    "Buyer Name",
+    "ID",
+    "OD",
+    "Item No.",
+    "Lenght",
+    "New Mat.Grp.",
+]
+
+DEFAULT_MATERIAL_GROUPS = ["MET", "NTT-HS", "NTT-W", "BOPP", "BOPET"]
+EXTRA_MATERIAL_GROUPS = ["CPP", "PETG", "BOPA", "ALOX", "PVDC", "MATT", "HAZE"]
+
+BUYERS = [
+    "OSWAL EXTRUSION LIMITED",
+    "A.B. POLYPACKS PVT LTD",
+    "Shrinath Rotopack Pvt. Ltd Unit-III",
+    "SPINCO INDIA LIMITED",
+    "A.M.P.POLYMERS INDIA PVT LTD",
+    "SUNPACK INDUSTRIES",
+    "P.M. TRADING CO.",
+    "HIND POLY TRADERS PVT. LTD",
+]
+
+
+def material_groups(count):
+    """The first count material group names: the default groups, then other film grades, then GRPnn"""
+    names = DEFAULT_MATERIAL_GROUPS + EXTRA_MATERIAL_GROUPS
+    return names[:count] + [f"GRP{index:02d}" for index in range(len(names), count)]
+
+
+def planner_rows(n_rows, month_year="2024-01", seed=0, material_groups=None):
+    """Yield n_rows SAP order rows for month_year, one dict at a time"""
+    rng = random.Random(seed)
+    groups = material_groups or DEFAULT_MATERIAL_GROUPS
+    year, month = (int(part) for part in month_year.split("-"))
+    days_in_month = calendar.monthrange(year, month)[1]
+
+    for index in range(n_rows):
+        group = rng.choice(groups)
+        micron = rng.choice([10, 12, 18, 25])
+        rolls = rng.randint(1, 40)
+        so_qty = rolls * rng.choice([250, 300, 500])
+        pend_prod = round(so_qty * rng.choice([1.0, 1.0, 0.9, 0.5]), 2)
+        buyer = rng.choice(BUYERS)
+        yield {
+            "Sales Orde": 170000 + index,
+            "SO.Qty": so_qty,
+            "SO.Type": rng.choice(["ZDOM", "ZDOM", "ZEXP"]),
+            "Pend. Prod": pend_prod,
+            "Mat.Grp.": group,
+            "Material": f"CB{micron}{group.replace('-', '')}",
+            "Micron": micron,
+            "Req.Del.Dt": date(year, month, rng.randint(1, days_in_month)).isoformat(),
+            "Prod.Statu": "Open",
+            "Rolls": rolls,
+            "Width": rng.randrange(500, 2005, 5),
+            "Consignee Name": buyer,
+            "Stock": 0,
+            "Buyer Name": buyer,
+            "ID": 152,
+            "OD": 650,
+            "Item No.": 10 * rng.randint(1, 6),
+            "Lenght": 16672.44,
+            "New Mat.Grp.": group,
+        }
+
+
+# Column layout of the order rows sent to /api/optimise_* (see valid_primary_optimization_data)
+OPTIMISER_COLUMNS = [
+    "Item No.",
+    "Sales Orde",
+    "Prod.Ord",
+    "SO Crtd Dt",
+    "Buyer Name",
+    "Consignee Name",
+    "Material",
+    "Micron",
+    "Width",
+    "ID",
+    "OD",
+    "Lenght",
+    "CT Side",
+    "Pend. Prod",
+    "Rolls",
+    "    SO.Qty",
+    " Stock",
+    "Pend. Disp",
+    "Disp.Qty",
+    "Grade",
+    "Prod. Qty.",
+    "Order Remarks",
+    "Option",
+]
+
+# Machine-specific optimiser parameters, as in the optimisation fixtures.
+# Primary machines do not send min/max width range.
+MACHINE_SETTINGS = {
+    "Primary": {"machine_type": "PRIMARY01", "trim_value": 0, "length_multiple": 0,
+                "order_widths": (600, 1300)},
+    "Secondary": {"machine_type": "SEC01", "trim_value": 10, "length_multiple": 3,
+                  "min_width_range": 500, "max_width_range": 1650, "order_widths": (600, 1000)},
+    "Metallizer": {"machine_type": "MET01", "trim_value": 20, "length_multiple": 3,
+                   "min_width_range": 2700, "max_width_range": 2850, "order_widths": (600, 850)},
+}
+
+
+def optimiser_rows(n_orders, seed=0, min_width=600, max_width=1300, must_make_share=0.4, material="CB18HI-MD"):
+    """Return n_orders optimiser order rows with widths in [min_width, max_width]"""
+    rng = random.Random(seed)
+    rows = []
+    for index in range(n_orders):
+        rolls = rng.randint(2, 35)
+        quantity = rolls * rng.choice([250, 300, 500])
+        buyer = rng.choice(BUYERS)
+        rows.append({
+            "Item No.": 10 * rng.randint(1, 6),
+            "Sales Orde": 170000 + index,
+            "Prod.Ord": 510087000 + index,
+            "SO Crtd Dt": 45800 + rng.randint(0, 14),
+            "Buyer Name": buyer,
+            "Consignee Name": buyer,
+            "Material": material,
+            "Micron": 18,
+            "Width": rng.randrange(min_width, max_width + 1, 5),
+            "ID": 152,
+            "OD": 650,
+            "Lenght": 16672.44,
+            "CT Side": "IN",
+            "Pend. Prod": quantity,
+            "Rolls": rolls,
+            "    SO.Qty": quantity,
+            " Stock": 0,
+            "Pend. Disp": quantity,
+            "Disp.Qty": 0,
+            "Grade": "A",
+            "Prod. Qty.": 0,
+            "Order Remarks": ".",
+            "Option": "MustMake" if rng.random() < must_make_share else "Optional",
+        })
+    return rows
+
+
+def optimiser_payload(n_orders, machine_category="Primary", seed=0, company="CPFL", plant="AMD",
+                      max_width=8700, minimum_trim=250, rows=None):
+    """Build an /api/optimise_* request body for a generated (or given) order book"""
+    settings = MACHINE_SETTINGS[machine_category]
+    if rows is None:
+        min_order_width, max_order_width = settings["order_widths"]
+        rows = optimiser_rows(n_orders, seed=seed, min_width=min_order_width, max_width=max_order_width)
+    payload = {
+        "company": company,
+        "material_type": "BOPET",
+        "machine_category": machine_category,
+        "max_width": max_width,
+        "minimum_trim": minimum_trim,
+        "plant": plant,
+        "email": "abhi@gmail.com",
+        "is_file_upload": True,
+        "machine_type": settings["machine_type"],
+        "secondary_machine": "SEC01",
+        "metallizer_machine": "MET01",
+        "trim_value": settings["trim_value"],
+        "length_multiple": settings["length_multiple"],
+        "data": rows,
+    }
+    if "min_width_range" in settings:
+        payload["min_width_range"] = settings["min_width_range"]
+        payload["max_width_range"] = settings["max_width_range"]
+    return payload
@@ -0,0 +1,137 @@
+"""
+On-time-in-full (OTIF) for scheduler responses
+Scheduled entries are joined to the request's summarized orders on the order key when the
+scheduler echoes it, otherwise by start order within (line, material group). An order is on
+time when its last scheduled entry ends by the end of its Req.Del.Dt day, and in full when the
+scheduled quantity covers the ordered quantity.
+"""
+import numpy as np
+import pandas as pd
+
+from perf.schedule_verifier import END_KEYS, QUANTITY_KEYS, START_KEYS, find_scheduled_rows
+
+ORDER_KEYS = ("Sales Orde", "order_id")
+DUE_KEYS = ("Req.Del.Dt", "due_date")
+LATENESS_BINS_DAYS = (0, 1, 3, 7, 14, np.inf)
+FULL_TOLERANCE = 1e-6
+
+
+def _column(frame, keys):
+    return next((key for key in keys if key in frame.columns), None)
+
+
+def _values(frame, keys, default=None):
+    """The first of keys present in frame, or a column of default"""
+    key = _column(frame, keys)
+    return frame[key] if key is not None else pd.Series(default, index=frame.index, dtype=object)
+
+
+def _text(frame, key):
+    return _values(frame, (key,)).fillna("").astype(str)
+
+
+def _utc(values):
+    return pd.to_datetime(values, utc=True, format="ISO8601", errors="coerce")
+
+
+def _number(values):
+    return pd.to_numeric(values, errors="coerce").astype(float)
+
+
+def orders_frame(request_data):
+    """
+    Summarized orders with a due timestamp (end of the Req.Del.Dt day) and quantity, or None without due dates.
+    Unparseable timestamps read as NaT and quantities as NaN.
+    """
+    frame = pd.DataFrame([order for group in request_data.get("summarized_orders", {}).values() for order in group])
+    due_key = _column(frame, DUE_KEYS)
+    if frame.empty or due_key is None:
+        return None
+    due = _utc(frame[due_key])
+    date_only = frame[due_key].astype(str).str.len() <= 10
+    order_key = _column(frame, ORDER_KEYS)
+    return pd.DataFrame({
+        "order": frame[order_key] if order_key else np.arange(len(frame)),
+        "line": _text(frame, "line"),
+        "material_group": _text(frame, "material_group"),
+        "start": _utc(_values(frame, START_KEYS)),
+        "due": due.where(~date_only, due + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)),
+        "quantity": _number(_values(frame, QUANTITY_KEYS)),
+    })
+
+
+def scheduled_frame(rows):
+    """Scheduled entries as a frame; unparseable times read as NaT and quantities as NaN"""
+    frame = pd.DataFrame(rows)
+    order_key = _column(frame, ORDER_KEYS)
+    return pd.DataFrame({
+        "order": frame[order_key] if order_key else None,
+        "line": _text(frame, "line"),
+        "material_group": _text(frame, "material_group"),
+        "start": _utc(_values(frame, START_KEYS)),
+        "end": _utc(_values(frame, END_KEYS)),
+        "quantity": _number(_values(frame, QUANTITY_KEYS)),
+    })
+
+
+def _match_by_rank(scheduled, orders):
+    # The n-th scheduled entry of a (line, material group) serves the n-th order of it by start time
+    keys = ["line", "material_group"]
+    orders = orders.sort_values("start").assign(rank=lambda frame: frame.groupby(keys).cumcount())
+    scheduled = scheduled.sort_values("start").assign(rank=lambda frame: frame.groupby(keys).cumcount())
+    return scheduled.drop(columns="order").merge(orders[keys + ["rank", "order"]], on=keys + ["rank"], how="inner")
+
+
+def otif_metrics(scheduled, orders):
+    """OTIF %, on-time %, in-full %, fill rate and lateness distribution over all orders"""
+    if scheduled["order"].isna().all():
+        scheduled = _match_by_rank(scheduled, orders)
+    served = scheduled.groupby("order").agg(completed=("end", "max"), scheduled_quantity=("quantity", "sum"))
+    joined = orders.join(served, on="order")
+    scheduled_quantity = joined["scheduled_quantity"].fillna(0).to_numpy()
+    # Entries without quantities count as delivering their whole order
+    scheduled_quantity = np.where(np.isnan(joined["scheduled_quantity"].to_numpy()) & joined["completed"].notna(),
+                                  joined["quantity"].to_numpy(), scheduled_quantity)
+
+    lateness_days = ((joined["completed"] - joined["due"]).dt.total_seconds() / 86400).to_numpy()
+    on_time = joined["completed"].notna().to_numpy() & (lateness_days <= 0)
+    in_full = scheduled_quantity >= joined["quantity"].to_numpy() - FULL_TOLERANCE
+    late = lateness_days[lateness_days > 0]
+    histogram, _ = np.histogram(late, bins=LATENESS_BINS_DAYS)
+    ordered = joined["quantity"].sum()
+    return {
+        "orders": len(joined),
+        "unscheduled_orders": int(joined["completed"].isna().sum()),
+        "otif_pct": float((on_time & in_full).mean() * 100) if len(joined) else 0.0,
+        "on_time_pct": float(on_time.mean() * 100) if len(joined) else 0.0,
+        "in_full_pct": float(in_full.mean() * 100) if len(joined) else 0.0,
+        "fill_rate_pct": float(np.minimum(scheduled_quantity, joined["quantity"]).sum() / ordered * 100) if ordered else 0.0,
+        "late_orders": len(late),
+        "lateness_days_p50": float(np.percentile(late, 50)) if len(late) else 0.0,
+        "lateness_days_p90": float(np.percentile(late, 90)) if len(late) else 0.0,
+        "lateness_days_max": float(late.max()) if len(late) else 0.0,
+        "lateness_histogram": {
+            (f"{low:g}-{high:g}d" if np.isfinite(high) else f"{low:g}d+"): int(count)
+            for low, high, count in zip(LATENESS_BINS_DAYS[:-1], LATENESS_BINS_DAYS[1:], histogram)
+        },
+    }
+
+
+def otif_for_response(response_data, request_data):
+    """
+    OTIF metrics for a scheduler response; None if it carries no schedule or the orders have no due dates.
+    Entries without a parseable start and end, and orders without a due date or quantity, are skipped and counted.
+    """
+    rows = find_scheduled_rows(response_data)
+    orders = orders_frame(request_data)
+    if rows is None or orders is None:
+        return None
+    scheduled = scheduled_frame(rows)
+    usable_scheduled = scheduled.dropna(subset=["start", "end"])
+    usable_orders = orders.dropna(subset=["due", "quantity"])
+    result = otif_metrics(usable_scheduled, usable_orders)
+    result.update({
+        "dropped_scheduled_rows": len(scheduled) - len(usable_scheduled),
+        "dropped_orders": len(orders) - len(usable_orders),
+    })
+    return result
@@ -0,0 +1,149 @@
+"""
+Controlled comparison of the setting, wastage and hybrid optimisers on identical order books
+Each generated order book is sent to every algorithm through the solver lane; latency, number
+of settings (distinct patterns), jumbo sets and trim loss are collected and the runtime vs
+trim-loss Pareto frontier is marked per order-book size. Plans for order books of up to
+SCORE_MAX_ORDERS orders are also scored against the reference solver's LP bound.
+"""
+import os
+
+import numpy as np
+
+from perf.bounds import trim_vs_bound
+from perf.orders import optimiser_payload
+from perf.plan_validator import find_plan_rows, plan_to_arrays, validate_plan
+from perf.reference_solver import score_plan
+from perf.solver_lane import post_in_lane
+
+ALGORITHMS = {
+    "setting": "/api/optimise_setting",
+    "wastage": "/api/optimise_wastage",
+    "hybrid": "/api/optimise_hybrid",
+}
+COMPARISON_SIZES = (10, 50, 200)
+# Column generation takes about 0.4 s at 50 orders and several seconds at 200
+SCORE_MAX_ORDERS = 50
+
+
+def distinct_patterns(arrays):
+    """Settings in a plan: distinct slot-width combinations (slot order ignored) cut at least once"""
+    widths = np.sort(arrays["widths"][arrays["sets"] > 0], axis=1)
+    return len(np.unique(widths, axis=0)) if widths.size else 0
+
+
+def run_algorithm(session, base_url, algorithm, payload, timeout, headers=None):
+    """Run one optimiser on one payload; returns latency and plan quality (None when there is no plan)"""
+    lane = post_in_lane(session, f"{base_url}{ALGORITHMS[algorithm]}", payload, timeout, headers=headers)
+    response = lane["response"]
+    result = {
+        "algorithm": algorithm,
+        "orders": len(payload["data"]),
+        "status": response.status_code if response is not None else None,
+        "latency_s": lane["latency_s"],
+        "queue_s": lane["queue_s"],
+        "attempts": lane["attempts"],
+        "error": lane["error"],
+        "settings": None,
+        "jumbo_sets": None,
+        "trim_loss_pct": None,
+        "trim_pct_vs_bound": None,
+        "feasible": None,
+        "lower_bound": None,
+        "optimality_gap": None,
+        "quality_per_second": None,
+    }
+    if response is None or response.status_code != 200:
+        if response is not None and not result["error"]:
+            result["error"] = response.text[:200]
+        return result
+
+    data = response.json()
+    plan_rows = find_plan_rows(data)
+    if plan_rows is None:
+        return result
+    arrays = plan_to_arrays(plan_rows)
+    validation = validate_plan(arrays, payload["max_width"], payload["minimum_trim"])
+    result.update({
+        "settings": distinct_patterns(arrays),
+        "jumbo_sets": validation["jumbo_sets"],
+        "trim_loss_pct": validation["trim_loss_pct"],
+        "trim_pct_vs_bound": trim_vs_bound(data, payload)["trim_pct_vs_bound"],
+        "feasible": validation["valid"],
+    })
+    if result["orders"] <= SCORE_MAX_ORDERS:
+        try:
+            score = score_plan(data, payload, lane["latency_s"])
+        except ValueError:
+            # The reference solver cannot cut some width; the plan validation already reports it
+            return result
+        result.update({key: score[key] for key in ("lower_bound", "optimality_gap", "quality_per_second")})
+    return result
+
+
+def pareto_frontier(results, cost="latency_s", loss="trim_loss_pct"):
+    """Results not beaten on both cost and loss by another result, ordered by cost"""
+    scored = sorted((r for r in results if r[cost] is not None and r[loss] is not None),
+                    key=lambda r: (r[cost], r[loss]))
+    frontier, best_loss = [], float("inf")
+    for result in scored:
+        if result[loss] < best_loss:
+            frontier.append(result)
+            best_loss = result[loss]
+    return frontier
+
+
+def compare_algorithms(session, base_url, timeout, sizes=COMPARISON_SIZES, machine_category="Primary",
+                       seed=0, headers=None, algorithms=tuple(ALGORITHMS)):
+    """Send the same generated order book to every algorithm, per size; marks results on the frontier"""
+    results = []
+    for n_orders in sizes:
+        payload = optimiser_payload(n_orders, machine_category=machine_category, seed=seed + n_orders)
+        size_results = [run_algorithm(session, base_url, algorithm, payload, timeout, headers=headers)
+                        for algorithm in algorithms]
+        frontier = pareto_frontier(size_results)
+        for result in size_results:
+            result["pareto"] = any(result is member for member in frontier)
+        results.extend(size_results)
+    return results
+
+
+def default_algorithm(results, budget_s):
+    """Per order-book size, the lowest-trim algorithm whose latency fits the time budget"""
+    choice = {}
+    for result in results:
+        if result["latency_s"] is None or result["trim_loss_pct"] is None or result["latency_s"] > budget_s:
+            continue
+        best = choice.get(result["orders"])
+        if best is None or result["trim_loss_pct"] < best["trim_loss_pct"]:
+            choice[result["orders"]] = result
+    return {orders: result["algorithm"] for orders, result in sorted(choice.items())}
+
+
+def plot_pareto(results, path):
+    """Plot runtime vs trim loss with the Pareto frontier, one panel per order-book size"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    sizes = sorted({result["orders"] for result in results})
+    figure, axes = plt.subplots(1, max(len(sizes), 1), figsize=(5 * max(len(sizes), 1), 4), squeeze=False)
+    for axis, n_orders in zip(axes[0], sizes):
+        size_results = [r for r in results if r["orders"] == n_orders]
+        for result in size_results:
+            if result["latency_s"] is None or result["trim_loss_pct"] is None:
+                continue
+            axis.scatter(result["latency_s"], result["trim_loss_pct"], s=60 if result.get("pareto") else 30)
+            axis.annotate(f"{result['algorithm']} ({result['settings']})",
+                          (result["latency_s"], result["trim_loss_pct"]), fontsize=8)
+        frontier = pareto_frontier(size_results)
+        if frontier:
+            axis.step([r["latency_s"] for r in frontier], [r["trim_loss_pct"] for r in frontier],
+                      where="post", linestyle="--", color="grey")
+        axis.set_title(f"{n_orders} orders")
+        axis.set_xlabel("latency (s)")
+        axis.set_ylabel("trim loss (%)")
+    figure.tight_layout()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    figure.savefig(path)
+    plt.close(figure)
+    return path
@@ -0,0 +1,131 @@
+"""
+Batched material-code lookup for /api/fetch_plans_by_material_code
+The endpoint answers one material code per call. PlanLookup takes a whole order book's codes for
+one company/machine_type/plant, fetches the distinct uncached codes with bounded parallelism and
+returns one code -> available plans mapping; answers are cached for the rest of the run.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+LOOKUP_WORKERS = 16
+LOOKUP_SIZES = (10, 100, 1_000)
+# Share of an order book's codes that are distinct (orders repeat material codes)
+UNIQUE_SHARE = 0.7
+
+
+def fetch_plans(session, base_url, material_code, company, machine_type, plant, timeout, headers=None):
+    """
+    One fetch_plans_by_material_code call; returns status, available plans (None unless 200) and latency.
+    A timeout or refused connection comes back with status None instead of raising.
+    """
+    start = time.perf_counter()
+    try:
+        response = session.get(f"{base_url}/api/fetch_plans_by_material_code", params={
+            "material_code": material_code, "company": company, "machine_type": machine_type, "plant": plant,
+        }, headers=headers, timeout=timeout)
+    except requests.exceptions.RequestException:
+        response = None
+    latency_s = time.perf_counter() - start
+    status = response.status_code if response is not None else None
+    plans = None
+    if status == 200:
+        data = response.json()
+        plans = data.get("available_plans", data) if isinstance(data, dict) else data
+    return {"status": status, "available_plans": plans, "latency_s": latency_s}
+
+
+class PlanLookup:
+    """Batched, cached plan lookups for one company / machine_type / plant"""
+
+    def __init__(self, base_url, timeout, company="CPFL", machine_type="Primary", plant="AMD",
+                 workers=LOOKUP_WORKERS, headers=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.company = company
+        self.machine_type = machine_type
+        self.plant = plant
+        self.workers = workers
+        self.headers = headers
+        self.cache = {}
+        self.calls = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _fetch(self, material_code):
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return material_code, fetch_plans(self._local.session, self.base_url, material_code, self.company,
+                                          self.machine_type, self.plant, self.timeout, headers=self.headers)
+
+    def lookup(self, material_codes):
+        """Mapping of every given code to its lookup result; only distinct uncached codes are fetched"""
+        codes = list(dict.fromkeys(material_codes))
+        with self._lock:
+            missing = [code for code in codes if code not in self.cache]
+            self.hits += len(material_codes) - len(missing)
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as executor:
+                fetched = dict(executor.map(self._fetch, missing))
+            with self._lock:
+                self.calls += len(fetched)
+                # Failed lookups are returned but not cached, so a later batch retries them
+                self.cache.update((code, result) for code, result in fetched.items() if result["status"] == 200)
+        else:
+            fetched = {}
+        return {code: self.cache.get(code) or fetched[code] for code in codes}
+
+
+def order_book_codes(n_codes, unique_share=UNIQUE_SHARE, seed=0):
+    """n_codes material codes as an order book lists them, drawn from n_codes * unique_share distinct codes"""
+    rng = random.Random(seed)
+    pool = [f"MAT{index:05d}" for index in range(1, max(1, int(n_codes * unique_share)) + 1)]
+    return pool + [rng.choice(pool) for _ in range(n_codes - len(pool))]
+
+
+def sequential_lookup(session, base_url, timeout, material_codes, company="CPFL", machine_type="Primary",
+                      plant="AMD", headers=None):
+    """Today's path: one call per order-book code, one after another"""
+    return [(code, fetch_plans(session, base_url, code, company, machine_type, plant, timeout, headers=headers))
+            for code in material_codes]
+
+
+def benchmark_lookup(base_url, timeout, sizes=LOOKUP_SIZES, workers=LOOKUP_WORKERS, headers=None, seed=0, **scope):
+    """Per size: sequential per-code calls, then a cold and a warm batched lookup of the same order book"""
+    results = []
+    for n_codes in sizes:
+        codes = order_book_codes(n_codes, seed=seed)
+        start = time.perf_counter()
+        calls = sequential_lookup(requests.Session(), base_url, timeout, codes, headers=headers, **scope)
+        sequential_s = time.perf_counter() - start
+
+        lookup = PlanLookup(base_url, timeout, workers=workers, headers=headers, **scope)
+        start = time.perf_counter()
+        batched = lookup.lookup(codes)
+        batched_s = time.perf_counter() - start
+        start = time.perf_counter()
+        lookup.lookup(codes)
+        warm_s = time.perf_counter() - start
+
+        sequential_plans = {code: result["available_plans"] for code, result in calls}
+        latencies = [result["latency_s"] for _, result in calls]
+        results.append({
+            "codes": n_codes,
+            "distinct_codes": len(batched),
+            "sequential_s": sequential_s,
+            "per_code_p50_s": float(np.percentile(latencies, 50)),
+            "per_code_p95_s": float(np.percentile(latencies, 95)),
+            "batched_s": batched_s,
+            "warm_s": warm_s,
+            "speedup": sequential_s / batched_s if batched_s else None,
+            "calls_saved": n_codes - lookup.calls,
+            "failed_codes": sum(result["status"] != 200 for result in batched.values()),
+            "mismatched_codes": sum(batched[code]["available_plans"] != plans
+                                    for code, plans in sequential_plans.items()),
+        })
+    return results
@@ -0,0 +1,188 @@
+"""
+Vectorised feasibility check for optimiser cutting plans
+A plan is the list of rows /api/update_results consumes: "Total width", "Sets", "Trim"
+and numbered slot columns ("1", "2", ...) holding the width cut in each slot.
+"""
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+MAX_REPORTED_INDICES = 10
+
+
+def find_plan_rows(payload):
+    """Return the first list of plan rows (dicts with "Sets") found anywhere in a response, or None"""
+    pending = [payload]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node) and "Sets" in node[0]:
+                return node
+            pending.extend(node)
+        elif isinstance(node, dict):
+            pending.extend(node.values())
+    return None
+
+
+def _number(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _column(plan_rows, key, missing=0.0):
+    """One field of every plan row as floats; missing, empty and non-numeric values read as `missing`"""
+    try:
+        return np.fromiter(map(itemgetter(key), plan_rows), dtype=float, count=len(plan_rows))
+    except (KeyError, TypeError, ValueError):
+        values = pd.Series([row.get(key) for row in plan_rows], dtype=object)
+        return pd.to_numeric(values, errors="coerce").fillna(missing).to_numpy(dtype=float)
+
+
+def plan_to_arrays(plan_rows):
+    """
+    Convert plan rows into a (patterns x slots) width matrix plus per-pattern column arrays.
+    Unreported "Trim" and "Total width" cells are NaN, so only values the optimiser sent are checked.
+    """
+    slot_keys = sorted((key for key in set().union(*plan_rows) if str(key).isdigit()), key=int)
+    widths = np.zeros((len(plan_rows), len(slot_keys)))
+    for slot, key in enumerate(slot_keys):
+        widths[:, slot] = _column(plan_rows, key)
+    return {
+        "widths": np.nan_to_num(widths),
+        "sets": _column(plan_rows, "Sets"),
+        "trim": _column(plan_rows, "Trim", missing=np.nan),
+        "total_width": _column(plan_rows, "Total width", missing=np.nan),
+    }
+
+
+def order_demand(orders):
+    """Aggregate order rows by width: demanded rolls, MustMake rolls and "Pend. Prod" quantity"""
+    widths = np.array([_number(order.get("Width")) for order in orders], dtype=float).round(3)
+    rolls = np.array([_number(order.get("Rolls")) for order in orders], dtype=float)
+    pend_prod = np.array([_number(order.get("Pend. Prod")) for order in orders], dtype=float)
+    must_make = np.array([order.get("Option", "MustMake") == "MustMake" for order in orders], dtype=bool)
+
+    unique_widths, index = np.unique(widths, return_inverse=True)
+    size = len(unique_widths)
+    return {
+        "widths": unique_widths,
+        "rolls": np.bincount(index, weights=rolls, minlength=size),
+        "must_rolls": np.bincount(index, weights=rolls * must_make, minlength=size),
+        "pend_prod": np.bincount(index, weights=pend_prod, minlength=size),
+    }
+
+
+def produced_rolls(arrays, demand_widths):
+    """Rolls produced per demanded width (Sets x slot count); also returns the unknown slot widths"""
+    widths = arrays["widths"]
+    cut = widths > 0
+    flat = widths[cut].round(3)
+    weights = np.broadcast_to(arrays["sets"][:, None], widths.shape)[cut]
+
+    # Widths are whole millimetres in practice, so map them through a dense lookup table;
+    # only fractional widths fall back to a binary search
+    keys = np.rint(flat).astype(np.int64)
+    whole = keys == flat
+    demand_keys = np.rint(demand_widths).astype(np.int64)
+    demand_whole = demand_keys == demand_widths
+    lookup = np.full(int(max(keys.max(initial=0), demand_keys.max(initial=0))) + 1, -1, dtype=np.int64)
+    lookup[demand_keys[demand_whole]] = np.flatnonzero(demand_whole)
+    index = np.where(whole, lookup[np.where(whole, keys, 0)], -1)
+
+    fractional = np.flatnonzero(~whole)
+    if len(fractional) and len(demand_widths):
+        position = np.minimum(np.searchsorted(demand_widths, flat[fractional]), len(demand_widths) - 1)
+        matched = demand_widths[position] == flat[fractional]
+        index[fractional[matched]] = position[matched]
+
+    known = index >= 0
+    produced = np.bincount(index[known], weights=weights[known], minlength=len(demand_widths))
+    return produced, np.unique(flat[~known])
+
+
+def _first(indices):
+    return indices[:MAX_REPORTED_INDICES].tolist()
+
+
+def validate_plan(arrays, max_width, minimum_trim, orders=None, tolerance=1e-6):
+    """
+    Check every pattern fits max_width with at least minimum_trim left, that the reported Trim and
+    Total width agree with those limits and the slots, and (with orders) that MustMake demand is
+    produced, in one vectorised pass
+    """
+    used = arrays["widths"].sum(axis=1)
+    trim = max_width - used
+    sets = arrays["sets"]
+
+    too_wide = np.flatnonzero(used > max_width + tolerance)
+    short_trim = np.flatnonzero(trim < minimum_trim - tolerance)
+    # NaN (unreported) cells compare False, so rows without the column pass
+    reported_short_trim = np.flatnonzero(arrays["trim"] < minimum_trim - tolerance)
+    reported_total = arrays["total_width"]
+    bad_total = np.flatnonzero((reported_total > max_width + tolerance) | (np.abs(reported_total - used) > tolerance))
+    result = {
+        "patterns": len(used),
+        "jumbo_sets": float(sets.sum()),
+        "trim_loss_pct": float((sets * trim).sum() / (sets.sum() * max_width) * 100) if sets.sum() else 0.0,
+        "width_violations": len(too_wide),
+        "trim_violations": len(short_trim),
+        "reported_trim_violations": len(reported_short_trim),
+        "total_width_violations": len(bad_total),
+        "errors": [],
+    }
+    if len(too_wide):
+        result["errors"].append(f"{len(too_wide)} patterns exceed max_width {max_width} (e.g. rows {_first(too_wide)})")
+    if len(short_trim):
+        result["errors"].append(f"{len(short_trim)} patterns leave less than minimum_trim {minimum_trim} (e.g. rows {_first(short_trim)})")
+    if len(reported_short_trim):
+        result["errors"].append(
+            f"{len(reported_short_trim)} patterns report a Trim under minimum_trim {minimum_trim} "
+            f"(e.g. rows {_first(reported_short_trim)})"
+        )
+    if len(bad_total):
+        result["errors"].append(
+            f"{len(bad_total)} patterns report a Total width over max_width {max_width} or unlike their slots "
+            f"(e.g. rows {_first(bad_total)})"
+        )
+
+    if orders:
+        demand = order_demand(orders)
+        produced, unknown_widths = produced_rolls(arrays, demand["widths"])
+        shortfall = np.flatnonzero(produced < demand["must_rolls"] - tolerance)
+        per_roll = np.divide(demand["pend_prod"], demand["rolls"], out=np.zeros_like(produced), where=demand["rolls"] > 0)
+        produced_qty = np.minimum(produced * per_roll, demand["pend_prod"])
+        result.update({
+            "produced_rolls": float(produced.sum()),
+            "demanded_rolls": float(demand["rolls"].sum()),
+            "shortfall_widths": demand["widths"][shortfall].tolist(),
+            "overproduced_widths": demand["widths"][produced > demand["rolls"] + tolerance].tolist(),
+            "unknown_widths": unknown_widths.tolist(),
+            "pend_prod_fill_pct": float(produced_qty.sum() / demand["pend_prod"].sum() * 100) if demand["pend_prod"].sum() else 0.0,
+        })
+        if len(shortfall):
+            result["errors"].append(
+                f"MustMake rolls short for {len(shortfall)} widths (e.g. {_first(demand['widths'][shortfall])})"
+            )
+
+    result["valid"] = not result["errors"]
+    return result
+
+
+def validate_optimise_response(response_data, request_payload):
+    """
+    Validate the plan in an /api/optimise_* response against its request; None if no plan is present.
+    Secondary/Metallizer slots carry merged widths, so demand is only matched for Primary plans.
+    """
+    plan_rows = find_plan_rows(response_data)
+    if plan_rows is None:
+        return None
+    merged_slots = "min_width_range" in request_payload
+    return validate_plan(
+        plan_to_arrays(plan_rows),
+        request_payload["max_width"],
+        request_payload["minimum_trim"],
+        orders=None if merged_slots else request_payload.get("data")
+    )
@@ -0,0 +1,89 @@
+"""
+Monthly planner inputs and a size benchmark of the three planners
+planner_payload builds valid_planner_data-shaped requests with thousands of SAP rows; the
+matching save_sales_forecast payload aggregates those rows per "New Mat.Grp." into export and
+domestic quantities. The benchmark saves the forecast, then times /api/changover_planner (POST)
+and /api/otif_planner, /api/hybrid_planner (GET with a JSON body, as the backend reads it).
+"""
+from perf.orders import material_groups, planner_rows
+from perf.solver_lane import request_in_lane
+
+PLANNERS = {
+    "changover": ("POST", "/api/changover_planner"),
+    "otif": ("GET", "/api/otif_planner"),
+    "hybrid": ("GET", "/api/hybrid_planner"),
+}
+PLANNER_SIZES = (100, 1_000, 5_000)
+PLANNER_GROUPS = 12
+
+
+def planner_payload(n_rows, month_year="2024-01", plant="AMD", groups=PLANNER_GROUPS, seed=0):
+    """changover_planner request with n_rows SAP rows spread over the given number of material groups"""
+    return {
+        "monthYear": month_year,
+        "plant": plant,
+        "data": list(planner_rows(n_rows, month_year=month_year, seed=seed, material_groups=material_groups(groups))),
+    }
+
+
+def sales_forecast_payload(rows, month, plant="AMD", client_name="CPFL"):
+    """save_sales_forecast request matching planner rows: pending production per group, export (ZEXP) vs domestic"""
+    totals = {}
+    for row in rows:
+        group = totals.setdefault(row["New Mat.Grp."], {"group": row["New Mat.Grp."], "exportQty": 0, "domesticQty": 0})
+        group["exportQty" if row["SO.Type"] == "ZEXP" else "domesticQty"] += row["Pend. Prod"]
+    forecast = [dict(group, exportQty=round(group["exportQty"], 2), domesticQty=round(group["domesticQty"], 2))
+                for group in totals.values()]
+    return {"client_name": client_name, "month": month, "plant": plant, "forecast": forecast}
+
+
+def planner_request(planner, payload):
+    return payload if planner == "changover" else {"data": payload["data"]}
+
+
+def campaign_plan_size(data):
+    """Number of campaign-plan entries in a planner response (lists are counted, dicts summed over their lists)"""
+    plan = data.get("campaign_plan") if isinstance(data, dict) else None
+    if isinstance(plan, list):
+        return len(plan)
+    if isinstance(plan, dict):
+        return sum(len(value) if isinstance(value, list) else 1 for value in plan.values())
+    return None
+
+
+def run_planner(session, base_url, planner, payload, timeout, headers=None):
+    """Run one planner through the solver lane; returns latency, status and campaign-plan size"""
+    method, path = PLANNERS[planner]
+    lane = request_in_lane(session, method, f"{base_url}{path}", planner_request(planner, payload), timeout,
+                           headers=headers)
+    response = lane["response"]
+    result = {
+        "planner": planner,
+        "rows": len(payload["data"]),
+        "status": response.status_code if response is not None else None,
+        "latency_s": lane["latency_s"],
+        "response_bytes": len(response.content) if response is not None else 0,
+        "campaign_plan_size": None,
+        "error": lane["error"],
+    }
+    if response is not None and response.status_code == 200:
+        result["campaign_plan_size"] = campaign_plan_size(response.json())
+    elif response is not None and not result["error"]:
+        result["error"] = response.text[:200]
+    return result
+
+
+def benchmark_planners(session, base_url, timeout, sizes=PLANNER_SIZES, groups=PLANNER_GROUPS,
+                       planners=tuple(PLANNERS), month_year="2024-01", plant="AMD", headers=None, seed=0):
+    """Per size: save the matching sales forecast, then run every planner on the same SAP rows"""
+    results = []
+    for n_rows in sizes:
+        payload = planner_payload(n_rows, month_year=month_year, plant=plant, groups=groups, seed=seed)
+        forecast = session.post(f"{base_url}/api/save_sales_forecast",
+                                json=sales_forecast_payload(payload["data"], month_year, plant=plant),
+                                headers=headers, timeout=timeout)
+        for planner in planners:
+            result = run_planner(session, base_url, planner, payload, timeout, headers=headers)
+            result.update(groups=groups, forecast_status=forecast.status_code)
+            results.append(result)
+    return results
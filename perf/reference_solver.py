@@ -0,0 +1,261 @@
+"""
+Reference 1-D cutting-stock solver used to score optimiser plans
+Column generation (Gilmore-Gomory): a revised-simplex master LP priced by a bounded knapsack DP.
+The LP relaxation gives a lower bound on jumbo sets; rounding plus a greedy residual fill gives
+a feasible plan in the same row format the optimiser returns.
+
+Usable jumbo width is max_width - minimum_trim. For Secondary/Metallizer requests each slot is a
+merged roll of order widths whose width (plus trim_value) must lie in
+[min_width_range, max_width_range]. Widths are whole millimetres; length_multiple is not modelled.
+"""
+import math
+import time
+
+import numpy as np
+
+from perf.plan_validator import find_plan_rows, order_demand, plan_to_arrays, produced_rolls
+
+EPSILON = 1e-9
+MAX_ITERATIONS = 500
+
+
+def _split_counts(bound):
+    """Binary splitting of a bounded count into 1, 2, 4, ..., remainder"""
+    pieces, size = [], 1
+    while bound > 0:
+        take = min(size, bound)
+        pieces.append(take)
+        bound -= take
+        size *= 2
+    return pieces
+
+
+def _knapsack(widths, values, bounds, capacity):
+    """
+    Bounded knapsack over exact total widths 0..capacity.
+    Returns best value per total width (-inf if unreachable) and a backtracking function.
+    """
+    piece_item, piece_count = [], []
+    for item, bound in enumerate(bounds):
+        for count in _split_counts(int(bound)):
+            piece_item.append(item)
+            piece_count.append(count)
+
+    best = np.full(capacity + 1, -np.inf)
+    best[0] = 0.0
+    taken = np.zeros((len(piece_item), capacity + 1), dtype=bool)
+    for piece, (item, count) in enumerate(zip(piece_item, piece_count)):
+        width = widths[item] * count
+        if width > capacity:
+            continue
+        candidate = best[:capacity + 1 - width] + values[item] * count
+        improved = candidate > best[width:] + EPSILON
+        best[width:] = np.where(improved, candidate, best[width:])
+        taken[piece, width:] = improved
+
+    def backtrack(total):
+        counts = np.zeros(len(widths), dtype=np.int64)
+        for piece in range(len(piece_item) - 1, -1, -1):
+            if taken[piece, total]:
+                item = piece_item[piece]
+                counts[item] += piece_count[piece]
+                total -= widths[item] * piece_count[piece]
+        return counts
+
+    return best, backtrack
+
+
+class CuttingStockProblem:
+    """Aggregated demand and machine limits of one optimise request"""
+
+    def __init__(self, payload, demand=None):
+        if demand is None:
+            demand = order_demand(payload["data"])
+        keep = demand["rolls"] > 0
+        self.widths = np.rint(demand["widths"][keep]).astype(np.int64)
+        self.demand = np.ceil(demand["rolls"][keep]).astype(np.int64)
+        self.max_width = int(payload["max_width"])
+        self.capacity = int(payload["max_width"] - payload["minimum_trim"])
+        self.ranged = "min_width_range" in payload
+        if self.ranged:
+            trim_value = int(payload.get("trim_value") or 0)
+            self.trim_value = trim_value
+            self.slot_low = max(int(payload["min_width_range"]) - trim_value, 0)
+            self.slot_high = int(payload["max_width_range"]) - trim_value
+
+    def price(self, values, bounds=None):
+        """Most valuable pattern for item values; returns (counts, value, slot widths)"""
+        if self.ranged:
+            return self._price_slots(values)
+        if bounds is None:
+            bounds = self.demand
+        bounds = np.minimum(bounds, self.capacity // self.widths)
+        bounds = np.where(values > EPSILON, bounds, 0)
+        best, backtrack = _knapsack(self.widths, values, bounds, self.capacity)
+        total = int(np.argmax(best))
+        counts = backtrack(total)
+        layout = tuple(int(width) for width in np.repeat(self.widths, counts)[::-1])
+        return counts, float(best[total]), layout
+
+    def _price_slots(self, values):
+        # Inner: best merged roll for every slot width; items are unbounded because slots do
+        # not share demand, which keeps the pricing a relaxation (and the bound valid)
+        bounds = np.maximum(self.slot_high // self.widths, 0)
+        inner, inner_backtrack = _knapsack(self.widths, values, bounds, self.slot_high)
+        options = []
+        for net_width in range(self.slot_low, self.slot_high + 1):
+            value = inner[net_width]
+            if value > EPSILON and (not options or value > options[-1][1] + EPSILON):
+                options.append((net_width, value))
+        if not options:
+            return np.zeros(len(self.widths), dtype=np.int64), 0.0, ()
+
+        # Outer: unbounded knapsack of slot widths across the usable jumbo width
+        slot_widths = np.array([net_width + self.trim_value for net_width, _ in options], dtype=np.int64)
+        slot_values = np.array([value for _, value in options])
+        outer, outer_backtrack = _knapsack(slot_widths, slot_values, self.capacity // slot_widths, self.capacity)
+        total = int(np.argmax(outer))
+        slot_counts = outer_backtrack(total)
+
+        counts = np.zeros(len(self.widths), dtype=np.int64)
+        layout = []
+        for option, copies in enumerate(slot_counts):
+            if copies:
+                counts += copies * inner_backtrack(options[option][0])
+                layout.extend([int(slot_widths[option])] * int(copies))
+        return counts, float(outer[total]), tuple(sorted(layout, reverse=True))
+
+
+def _solve_master(problem, max_iterations):
+    """Gilmore-Gomory column generation from a Big-M start; returns (column, layout, LP usage) triples, bound and iterations"""
+    n = len(problem.widths)
+    if n == 0:
+        return [], 0.0, 0
+    demand = problem.demand.astype(float)
+    big_m = float(demand.sum() + 1)
+
+    basis = np.eye(n)
+    basic_costs = np.full(n, big_m)
+    basic_x = demand.copy()
+    basic_layouts = [None] * n
+
+    converged = False
+    for iteration in range(max_iterations):
+        duals = np.linalg.solve(basis.T, basic_costs)
+        if (duals < -EPSILON).any():
+            entering = np.argmin(duals)
+            column, cost, layout = -np.eye(n)[entering], 0.0, "surplus"
+        else:
+            counts, pricing_value, layout = problem.price(duals)
+            if pricing_value <= 1 + EPSILON:
+                converged = True
+                break
+            column, cost = counts.astype(float), 1.0
+
+        direction = np.linalg.solve(basis, column)
+        positive = direction > EPSILON
+        if not positive.any():
+            break
+        ratios = np.full(n, np.inf)
+        ratios[positive] = basic_x[positive] / direction[positive]
+        leaving = int(np.argmin(ratios))
+        step = ratios[leaving]
+        basic_x = np.maximum(basic_x - step * direction, 0.0)
+        basic_x[leaving] = step
+        basis[:, leaving] = column
+        basic_costs[leaving] = cost
+        basic_layouts[leaving] = layout
+    else:
+        iteration = max_iterations
+
+    # Artificial columns still carrying demand at the optimum mean no pattern can cut that width;
+    # before convergence the residual fill in solve_reference covers them
+    stuck = [int(problem.widths[i]) for i in range(n) if basic_layouts[i] is None and basic_x[i] > EPSILON]
+    if stuck and converged:
+        raise ValueError(f"Widths {sorted(stuck)} cannot be cut within the machine limits")
+
+    # Farley bound: valid for any non-negative duals, equal to the LP optimum once converged
+    duals = np.maximum(np.linalg.solve(basis.T, basic_costs), 0.0)
+    _, pricing_value, _ = problem.price(duals)
+    bound = float(demand @ duals) / max(1.0, pricing_value)
+    columns = [(basis[:, i].copy(), basic_layouts[i], basic_x[i])
+               for i in range(n) if basic_layouts[i] not in (None, "surplus")]
+    return columns, bound, iteration
+
+
+def solve_reference(payload, demand=None, max_iterations=MAX_ITERATIONS):
+    """Solve an optimise request; returns the LP bound, an integer plan and its trim loss"""
+    start = time.perf_counter()
+    problem = CuttingStockProblem(payload, demand=demand)
+    columns, lp_bound, iterations = _solve_master(problem, max_iterations)
+
+    usage = {}
+    produced = np.zeros(len(problem.widths), dtype=np.int64)
+    for column, layout, x in columns:
+        sets = int(math.floor(x + 1e-6))
+        if sets:
+            usage[layout] = usage.get(layout, 0) + sets
+            produced += sets * column.astype(np.int64)
+
+    residual = np.maximum(problem.demand - produced, 0)
+    while residual.sum() > 0:
+        values = np.where(residual > 0, problem.widths, 0).astype(float)
+        counts, value, layout = problem.price(values, bounds=residual)
+        if value <= 0:
+            raise ValueError(f"Residual widths {problem.widths[residual > 0].tolist()} cannot be cut")
+        wanted = (counts > 0) & (residual > 0)
+        sets = max(1, int(np.min(residual[wanted] // counts[wanted])))
+        usage[layout] = usage.get(layout, 0) + sets
+        residual = np.maximum(residual - sets * counts, 0)
+
+    plan = []
+    for layout, sets in sorted(usage.items(), key=lambda entry: -entry[1]):
+        used = int(sum(layout))
+        row = {"Total width": used, "Sets": sets, "Trim": problem.max_width - used}
+        row.update({str(slot): width for slot, width in enumerate(layout, start=1)})
+        plan.append(row)
+
+    jumbo_sets = sum(usage.values())
+    demanded_width = float(problem.widths @ problem.demand)
+    return {
+        "lp_bound": lp_bound,
+        "lower_bound": int(math.ceil(lp_bound - 1e-6)),
+        "jumbo_sets": jumbo_sets,
+        "plan": plan,
+        "trim_loss_pct": (1 - demanded_width / (jumbo_sets * problem.max_width)) * 100 if jumbo_sets else 0.0,
+        "iterations": iterations,
+        "runtime_s": time.perf_counter() - start,
+    }
+
+
+def scoring_demand(plan_arrays, payload):
+    """
+    Demand the backend plan is held to: MustMake rolls plus the Optional rolls it chose to make.
+    Merged-slot plans cannot be matched to orders, so they are held to the full order book.
+    """
+    demand = order_demand(payload["data"])
+    if "min_width_range" in payload:
+        return demand
+    produced, _ = produced_rolls(plan_arrays, demand["widths"])
+    optional = demand["rolls"] - demand["must_rolls"]
+    return dict(demand, rolls=demand["must_rolls"] + np.minimum(optional, np.maximum(produced - demand["must_rolls"], 0)))
+
+
+def score_plan(response_data, payload, latency_s, max_iterations=MAX_ITERATIONS):
+    """Optimality gap of a backend plan against the reference bound, and quality per second"""
+    plan_rows = find_plan_rows(response_data)
+    if plan_rows is None:
+        return None
+    arrays = plan_to_arrays(plan_rows)
+    reference = solve_reference(payload, demand=scoring_demand(arrays, payload), max_iterations=max_iterations)
+    backend_sets = float(arrays["sets"].sum())
+    gap = (backend_sets - reference["lower_bound"]) / reference["lower_bound"] if reference["lower_bound"] else 0.0
+    return {
+        "backend_sets": backend_sets,
+        "reference_sets": reference["jumbo_sets"],
+        "lower_bound": reference["lower_bound"],
+        "optimality_gap": gap,
+        "latency_s": latency_s,
+        "quality_per_second": 1 / (1 + max(gap, 0.0)) / latency_s if latency_s else None,
+        "reference_runtime_s": reference["runtime_s"],
+    }
@@ -0,0 +1,47 @@
+"""
+Run report: benchmark records collected during one pytest session, written as JSON
+"""
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from config import PERF_REPORT_DIR
+
+
+class RunReport:
+    """Collects benchmark records for one run and writes them to PERF_REPORT_DIR"""
+
+    def __init__(self, base_url):
+        started = datetime.now(timezone.utc)
+        self.run_id = f"{started.strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
+        self.base_url = base_url
+        self.started_at = started.isoformat()
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, kind, **fields):
+        """Append one record (e.g. kind="excel_upload") and return it"""
+        record = {"kind": kind, **fields}
+        with self._lock:
+            self.records.append(record)
+        return record
+
+    def by_kind(self, kind):
+        return [record for record in self.records if record["kind"] == kind]
+
+    def write(self, directory=PERF_REPORT_DIR):
+        """Write the report; returns the file path, or None if nothing was recorded"""
+        if not self.records:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"run-{self.run_id}.json")
+        with open(path, "w") as f:
+            json.dump({
+                "run_id": self.run_id,
+                "base_url": self.base_url,
+                "started_at": self.started_at,
+                "records": self.records,
+            }, f, indent=2, default=str)
+        return path
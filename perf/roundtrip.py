@@ -0,0 +1,157 @@
+"""
+Save/fetch round trips for campaign plans and sales forecasts
+Each round trip saves a payload of a given size, reads it straight back and keeps polling until
+the read reflects the write (read-after-write staleness). Every size is written concurrently to
+one key per month and plant, so the sweep shows where the storage layer stops scaling.
+"""
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import requests
+
+from perf.campaign_changes import campaign_plan
+from perf.orders import material_groups
+
+ROUNDTRIP_SIZES = (10, 100, 1_000, 10_000, 50_000)
+ROUNDTRIP_MONTHS = ("2024-01", "2024-02", "2024-03", "2024-04")
+ROUNDTRIP_PLANTS = ("AMD", "SLV")
+STALE_POLLS = 10
+STALE_POLL_INTERVAL_S = 0.2
+
+
+def forecast_rows(groups, seed=0):
+    """`groups` sales forecast groups with random export and domestic quantities"""
+    rng = random.Random(seed)
+    return [{"group": name, "exportQty": round(rng.uniform(0, 500), 2), "domesticQty": round(rng.uniform(0, 500), 2)}
+            for name in material_groups(groups)]
+
+
+def campaign_plan_request(rows, month, plant, client_name="CPFL", machine="Machine1", seed=0):
+    year, month_number = (int(part) for part in month.split("-"))
+    return {
+        "client_name": client_name,
+        "campaign_plan": campaign_plan(rows, date(year, month_number, 1), seed=seed),
+        "primary_machine_name": machine,
+        "month_year": month,
+        "plant": plant,
+    }
+
+
+def sales_forecast_request(groups, month, plant, client_name="CPFL", seed=0):
+    return {"client_name": client_name, "month": month, "plant": plant, "forecast": forecast_rows(groups, seed=seed)}
+
+
+# kind: (save path, fetch path, request builder, key of the saved rows, fetch params from the request)
+ROUNDTRIPS = {
+    "campaign_plan": ("/api/save_campaign_plan", "/api/fetch_campaign_plan", campaign_plan_request, "campaign_plan",
+                      lambda body: {key: body[key] for key in ("client_name", "month_year", "primary_machine_name",
+                                                               "plant")}),
+    "sales_forecast": ("/api/save_sales_forecast", "/api/fetch_sales_forecast", sales_forecast_request, "forecast",
+                       lambda body: {key: body[key] for key in ("client_name", "month", "plant")}),
+}
+
+
+def _saved_rows(data, count):
+    """The first list of `count` dicts in a fetch response (breadth first), or None"""
+    pending = [data]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            if len(node) == count and all(isinstance(item, dict) for item in node[:1]):
+                return node
+            pending.extend(item for item in node if isinstance(item, (dict, list)))
+        elif isinstance(node, dict):
+            pending.extend(value for value in node.values() if isinstance(value, (dict, list)))
+    return None
+
+
+def is_fresh(data, written):
+    """Whether a fetch response holds the written rows (same count, same first and last row)"""
+    rows = _saved_rows(data, len(written))
+    if rows is None:
+        return False
+    return all(all(row.get(key) == value for key, value in expected.items())
+               for row, expected in ((rows[0], written[0]), (rows[-1], written[-1])))
+
+
+def round_trip(session, base_url, kind, size, month, plant, timeout, headers=None, seed=0,
+               polls=STALE_POLLS, poll_interval_s=STALE_POLL_INTERVAL_S):
+    """Save one payload, read it back, then poll until the read reflects the write"""
+    save_path, fetch_path, build, rows_key, fetch_params = ROUNDTRIPS[kind]
+    body = build(size, month, plant, seed=seed)
+    fetch_url, params = f"{base_url}{fetch_path}", fetch_params(body)
+
+    start = time.perf_counter()
+    write = session.post(f"{base_url}{save_path}", json=body, headers=headers, timeout=timeout)
+    written_at = time.perf_counter()
+    result = {
+        "payload_kind": kind, "rows": size, "month": month, "plant": plant,
+        "write_status": write.status_code, "write_s": written_at - start, "write_bytes": len(write.request.body),
+        "read_status": None, "read_s": None, "read_bytes": 0, "fresh": False, "stale_reads": 0, "staleness_s": None,
+    }
+    if write.status_code != 200:
+        return result
+
+    for attempt in range(polls + 1):
+        start = time.perf_counter()
+        read = session.get(fetch_url, params=params, headers=headers, timeout=timeout)
+        if attempt == 0:
+            result.update(read_status=read.status_code, read_s=time.perf_counter() - start,
+                          read_bytes=len(read.content))
+        if read.status_code == 200 and is_fresh(read.json(), body[rows_key]):
+            result.update(fresh=attempt == 0, staleness_s=time.perf_counter() - written_at)
+            break
+        result["stale_reads"] += 1
+        if attempt < polls:
+            time.sleep(poll_interval_s)
+    return result
+
+
+def _summary(kind, size, results, wall_s):
+    writes = [r["write_s"] for r in results]
+    reads = [r["read_s"] for r in results if r["read_s"] is not None]
+    return {
+        "payload_kind": kind,
+        "rows": size,
+        "targets": len(results),
+        "wall_s": wall_s,
+        "round_trips_per_s": len(results) / wall_s if wall_s else None,
+        "write_mb_per_s": sum(r["write_bytes"] for r in results) / 1e6 / wall_s if wall_s else None,
+        "read_mb_per_s": sum(r["read_bytes"] for r in results) / 1e6 / wall_s if wall_s else None,
+        "write_p50_s": statistics.median(writes),
+        "write_max_s": max(writes),
+        "read_p50_s": statistics.median(reads) if reads else None,
+        "read_max_s": max(reads) if reads else None,
+        "write_errors": sum(r["write_status"] != 200 for r in results),
+        "stale": sum(not r["fresh"] for r in results),
+        "never_fresh": sum(r["staleness_s"] is None for r in results),
+        "max_staleness_s": max((r["staleness_s"] for r in results if r["staleness_s"] is not None), default=None),
+    }
+
+
+def sweep_round_trips(base_url, timeout, sizes=ROUNDTRIP_SIZES, kinds=tuple(ROUNDTRIPS), months=ROUNDTRIP_MONTHS,
+                      plants=ROUNDTRIP_PLANTS, headers=None, polls=STALE_POLLS,
+                      poll_interval_s=STALE_POLL_INTERVAL_S):
+    """
+    Per kind and size, run one round trip per (month, plant) concurrently, each on its own session.
+    Returns (per-round-trip results, per kind/size throughput summaries).
+    """
+    targets = [(month, plant) for month in months for plant in plants]
+    sessions = {target: requests.Session() for target in targets}
+    results, summaries = [], []
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        for kind in kinds:
+            for size in sizes:
+                start = time.perf_counter()
+                futures = [
+                    executor.submit(round_trip, sessions[target], base_url, kind, size, *target, timeout,
+                                    headers=headers, seed=size + index, polls=polls, poll_interval_s=poll_interval_s)
+                    for index, target in enumerate(targets)
+                ]
+                batch = [future.result() for future in futures]
+                summaries.append(_summary(kind, size, batch, time.perf_counter() - start))
+                results.extend(batch)
+    return results, summaries
@@ -0,0 +1,164 @@
+"""
+Client-side fan-out for /api/sap_data
+The endpoint takes one material_code and one start_date/end_date range. A long range over many
+material codes is split into (material code, date window) requests that run concurrently under
+a shared rate limit; 502s from the upstream SAP call, timeouts and dropped connections are retried
+with full jitter, and the window results are merged into one DataFrame with duplicates (orders
+returned by two windows) dropped.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+import requests
+
+SAP_WINDOW_DAYS = 14
+SAP_WORKERS = 8
+SAP_RATE_PER_S = 50.0
+SAP_RETRIES = 3
+SAP_BACKOFF_S = 0.5
+RETRY_STATUSES = (502,)
+# A quarter over a hundred material codes, as planners pull it
+SAP_BENCHMARK_CODES = tuple(f"MAT{index:03d}" for index in range(1, 101))
+SAP_BENCHMARK_RANGE = ("2024-01-01", "2024-03-31")
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate_per_s apart across threads"""
+
+    def __init__(self, rate_per_s):
+        self.interval = 1.0 / rate_per_s if rate_per_s else 0.0
+        self.next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.perf_counter()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def date_windows(start, end, window_days=SAP_WINDOW_DAYS):
+    """Split the inclusive range start..end (dates or ISO strings) into inclusive windows of window_days"""
+    start, end = (day if isinstance(day, date) else date.fromisoformat(day) for day in (start, end))
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=window_days - 1), end)
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def sap_records(data):
+    """The first list of dicts in a sap_data response (breadth first), or an empty list"""
+    pending = [data]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node[:1]):
+                return node
+            pending.extend(item for item in node if isinstance(item, (dict, list)))
+        elif isinstance(node, dict):
+            pending.extend(value for value in node.values() if isinstance(value, (dict, list)))
+    return []
+
+
+def fetch_window(session, base_url, params, timeout, headers=None, limiter=None, retries=SAP_RETRIES,
+                 backoff_s=SAP_BACKOFF_S, rng=random):
+    """
+    Fetch one material/window, retrying 502s and failed requests (status None) with full-jitter
+    backoff; returns records and call stats
+    """
+    result = {**params, "status": None, "attempts": 0, "latency_s": 0.0, "records": []}
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.wait()
+        start = time.perf_counter()
+        try:
+            response = session.get(f"{base_url}/api/sap_data", params=params, headers=headers, timeout=timeout)
+        except requests.exceptions.RequestException:
+            response = None
+        status = response.status_code if response is not None else None
+        result.update(status=status, attempts=attempt + 1, latency_s=result["latency_s"] + time.perf_counter() - start)
+        if status == 200:
+            result["records"] = sap_records(response.json())
+            return result
+        if (status is not None and status not in RETRY_STATUSES) or attempt == retries:
+            return result
+        time.sleep(rng.uniform(0, backoff_s * 2 ** attempt))
+    return result
+
+
+def merge_records(results, keys=None):
+    """One DataFrame of every window's records, duplicates dropped on `keys` (all columns by default)"""
+    frame = pd.DataFrame([record for result in results for record in result["records"]])
+    if frame.empty:
+        return frame
+    duplicated = frame.duplicated(subset=keys) if keys else frame.astype(str).duplicated()
+    return frame[~duplicated].reset_index(drop=True)
+
+
+def fan_out(base_url, timeout, material_codes, start, end, window_days=SAP_WINDOW_DAYS, workers=SAP_WORKERS,
+            rate_per_s=SAP_RATE_PER_S, headers=None, keys=None, retries=SAP_RETRIES, backoff_s=SAP_BACKOFF_S,
+            seed=0):
+    """
+    Fetch every (material code, window) concurrently; returns the merged DataFrame and per-window stats
+    (records replaced by their count). Each worker thread keeps its own session.
+    """
+    limiter, local, rng = RateLimiter(rate_per_s), threading.local(), random.Random(seed)
+
+    def fetch(params):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return fetch_window(local.session, base_url, params, timeout, headers=headers, limiter=limiter,
+                            retries=retries, backoff_s=backoff_s, rng=rng)
+
+    requests_params = [{"start_date": window_start, "end_date": window_end, "material_code": code}
+                       for code in material_codes for window_start, window_end in date_windows(start, end, window_days)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(fetch, requests_params))
+    frame = merge_records(results, keys=keys)
+    stats = [dict(result, records=len(result["records"])) for result in results]
+    return frame, stats
+
+
+def sequential(session, base_url, timeout, material_codes, start, end, headers=None, keys=None):
+    """Baseline: one sap_data call per material code over the whole range, one after another"""
+    results = [fetch_window(session, base_url, {"start_date": str(start), "end_date": str(end), "material_code": code},
+                            timeout, headers=headers, retries=0)
+               for code in material_codes]
+    return merge_records(results, keys=keys), [dict(result, records=len(result["records"])) for result in results]
+
+
+def benchmark_fan_out(base_url, timeout, material_codes, start, end, headers=None, keys=None, **fan_out_options):
+    """Time the sequential baseline against the fan-out over the same codes and range"""
+    started = time.perf_counter()
+    baseline, baseline_stats = sequential(requests.Session(), base_url, timeout, material_codes, start, end,
+                                          headers=headers, keys=keys)
+    sequential_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    merged, stats = fan_out(base_url, timeout, material_codes, start, end, headers=headers, keys=keys,
+                            **fan_out_options)
+    fan_out_s = time.perf_counter() - started
+
+    return {
+        "material_codes": len(material_codes),
+        "start_date": str(start),
+        "end_date": str(end),
+        "windows": len(stats),
+        "sequential_s": sequential_s,
+        "sequential_rows": len(baseline),
+        "sequential_failures": sum(s["status"] != 200 for s in baseline_stats),
+        "fan_out_s": fan_out_s,
+        "fan_out_rows": len(merged),
+        "fan_out_failures": sum(s["status"] != 200 for s in stats),
+        "retries": sum(s["attempts"] - 1 for s in stats),
+        "duplicates_dropped": sum(s["records"] for s in stats) - len(merged),
+        "speedup": sequential_s / fan_out_s if fan_out_s else None,
+    }
@@ -0,0 +1,171 @@
+"""
+Verifier for scheduler output (/api/changover_scheduler, /api/hybrid_scheduler, /api/otif_scheduler)
+Scheduled entries are loaded into interval arrays sorted by (line, start) and checked in one
+O(n log n) sweep for overlaps, gaps, entries outside their line's campaign_blocks windows and
+blocks scheduled beyond their capacity. Entries and blocks whose start or end is missing, not an
+ISO 8601 time, or before the start are reported as invalid and left out of the sweep.
+"""
+import numpy as np
+import pandas as pd
+
+START_KEYS = ("start_time", "start", "startTime")
+END_KEYS = ("end_time", "end", "endTime")
+QUANTITY_KEYS = ("quantity", "scheduled_quantity", "Pend. Prod", "capacity")
+GAP_TOLERANCE_S = 60
+MAX_REPORTED_INDICES = 10
+
+
+def _first_key(row, keys):
+    return next((key for key in keys if key in row), None)
+
+
+def find_scheduled_rows(payload):
+    """Return the first list of scheduled entries (dicts with a line and a start time) in a response, or None"""
+    pending = [payload]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node) and \
+                    "line" in node[0] and _first_key(node[0], START_KEYS):
+                return node
+            pending.extend(node)
+        elif isinstance(node, dict):
+            pending.extend(node.values())
+    return None
+
+
+def _seconds(values):
+    """(epoch seconds, parsed mask); missing and non-ISO times are unparsed and read as 0"""
+    times = pd.to_datetime(pd.Series(values, dtype=object), utc=True, format="ISO8601", errors="coerce")
+    parsed = times.notna().to_numpy()
+    seconds = times.dt.tz_convert(None).to_numpy().astype("datetime64[s]").astype(np.int64)
+    return np.where(parsed, seconds, 0), parsed
+
+
+def schedule_to_arrays(rows):
+    """
+    Scheduled entries as columns: line, material_group, start/end (epoch seconds), quantity and
+    valid_times (start and end both parsed, end not before start)
+    """
+    first = rows[0] if rows else {}
+    start_key, end_key = _first_key(first, START_KEYS), _first_key(first, END_KEYS)
+    quantity_key = _first_key(first, QUANTITY_KEYS)
+    start, start_parsed = _seconds([row.get(start_key) for row in rows])
+    end, end_parsed = _seconds([row.get(end_key) for row in rows])
+    return {
+        "line": np.array([str(row.get("line")) for row in rows], dtype=object),
+        "material_group": np.array([str(row.get("material_group") or "") for row in rows], dtype=object),
+        "start": start,
+        "end": end,
+        "quantity": np.array([float(row.get(quantity_key) or 0) for row in rows]) if quantity_key else None,
+        "valid_times": start_parsed & end_parsed & (end >= start),
+    }
+
+
+def blocks_to_arrays(campaign_blocks):
+    """campaign_blocks ({line: [block, ...]}) as flat columns like schedule_to_arrays"""
+    rows = [dict(block, line=line) for line, blocks in (campaign_blocks or {}).items() for block in blocks]
+    arrays = schedule_to_arrays(rows)
+    arrays["capacity"] = np.array([float(row.get("capacity") or np.inf) for row in rows])
+    return arrays
+
+
+def _first(indices):
+    return indices[:MAX_REPORTED_INDICES].tolist()
+
+
+def _valid_rows(arrays):
+    """(arrays restricted to rows with valid times, original indices of those rows, invalid indices)"""
+    valid = arrays.get("valid_times")
+    if valid is None:
+        return arrays, np.arange(len(arrays["line"])), np.zeros(0, dtype=np.int64)
+    kept = np.flatnonzero(valid)
+    restricted = {key: (value[kept] if isinstance(value, np.ndarray) else value) for key, value in arrays.items()}
+    return restricted, kept, np.flatnonzero(~valid)
+
+
+def verify_schedule(schedule, blocks, gap_tolerance_s=GAP_TOLERANCE_S):
+    """
+    Sweep each line's intervals in start order. Overlaps, entries outside a campaign block
+    (or in a block of another material group), capacity overruns and entries or blocks with
+    unusable times are errors; gaps are reported.
+    """
+    schedule, entry_rows, invalid_entries = _valid_rows(schedule)
+    blocks, _, invalid_blocks = _valid_rows(blocks)
+    n_entries = len(schedule["line"])
+    line_codes, lines = pd.factorize(np.concatenate([schedule["line"], blocks["line"]]))
+    group_codes, groups = pd.factorize(np.concatenate([schedule["material_group"], blocks["material_group"]]))
+    unset = np.flatnonzero(groups == "")
+    unset_group = unset[0] if len(unset) else -1
+    entry_line, block_line = line_codes[:n_entries], line_codes[n_entries:]
+    entry_group, block_group = group_codes[:n_entries], group_codes[n_entries:]
+    origin = min(schedule["start"].min(initial=0), blocks["start"].min(initial=0))
+    span = max(schedule["end"].max(initial=0), blocks["end"].max(initial=0)) - origin + 1
+
+    order = np.lexsort((schedule["start"], entry_line))
+    line, start, end = entry_line[order], schedule["start"][order], schedule["end"][order]
+
+    # Running max of end times within each line: offset every line into its own range, accumulate once
+    line_end = np.maximum.accumulate(line * span + (end - origin))
+    previous_end = np.concatenate(([0], line_end[:-1] - line[1:] * span + origin))
+    same_line = np.concatenate(([False], line[1:] == line[:-1]))
+    overlaps = np.flatnonzero(same_line & (start < previous_end))
+    gap_s = np.where(same_line, start - previous_end, 0)
+    gaps = np.flatnonzero(gap_s > gap_tolerance_s)
+
+    # Containing block: the last block on the same line starting at or before the entry
+    block_order = np.lexsort((blocks["start"], block_line))
+    block_keys = block_line[block_order] * span + (blocks["start"][block_order] - origin)
+    position = np.searchsorted(block_keys, line * span + (start - origin), side="right") - 1
+    block = block_order[np.maximum(position, 0)] if len(block_order) else np.zeros(len(line), dtype=np.int64)
+    contained = (position >= 0) & (block_line[block] == line) & (end <= blocks["end"][block]) \
+        if len(block_order) else np.zeros(len(line), dtype=bool)
+    if len(block_order):
+        entry_group, block_group = entry_group[order], block_group[block]
+        contained &= (entry_group == unset_group) | (block_group == unset_group) | (entry_group == block_group)
+    outside = np.flatnonzero(~contained)
+
+    overruns = np.zeros(0, dtype=np.int64)
+    if schedule["quantity"] is not None and len(block_order):
+        load = np.bincount(block[contained], weights=schedule["quantity"][order][contained],
+                           minlength=len(blocks["line"]))
+        overruns = np.flatnonzero(load > blocks["capacity"] + 1e-6)
+
+    result = {
+        "entries": len(line) + len(invalid_entries),
+        "lines": int(len(np.unique(entry_line))),
+        "overlaps": len(overlaps),
+        "gaps": len(gaps),
+        "gap_hours": float(gap_s[gaps].sum() / 3600),
+        "outside_blocks": len(outside),
+        "capacity_overruns": len(overruns),
+        "invalid_times": len(invalid_entries),
+        "invalid_blocks": len(invalid_blocks),
+        "errors": [],
+    }
+    if len(invalid_entries):
+        result["errors"].append(f"{len(invalid_entries)} entries have a missing, non-ISO or reversed start/end "
+                                f"(e.g. rows {_first(invalid_entries)})")
+    if len(invalid_blocks):
+        result["errors"].append(f"{len(invalid_blocks)} campaign blocks have a missing, non-ISO or reversed "
+                                f"start/end and were ignored")
+    if len(overlaps):
+        result["errors"].append(f"{len(overlaps)} entries overlap the previous entry on their line "
+                                f"(e.g. rows {_first(entry_rows[order[overlaps]])})")
+    if len(outside):
+        result["errors"].append(f"{len(outside)} entries fall outside their line's campaign blocks "
+                                f"(e.g. rows {_first(entry_rows[order[outside]])})")
+    if len(overruns):
+        result["errors"].append(f"{len(overruns)} campaign blocks are scheduled beyond capacity "
+                                f"(e.g. {[(lines[block_line[i]], blocks['material_group'][i]) for i in _first(overruns)]})")
+    result["valid"] = not result["errors"]
+    return result
+
+
+def verify_scheduler_response(response_data, request_data, gap_tolerance_s=GAP_TOLERANCE_S):
+    """Verify the schedule in a scheduler response against the request's campaign_blocks; None if no schedule"""
+    rows = find_scheduled_rows(response_data)
+    if rows is None:
+        return None
+    return verify_schedule(schedule_to_arrays(rows), blocks_to_arrays(request_data.get("campaign_blocks")),
+                           gap_tolerance_s=gap_tolerance_s)
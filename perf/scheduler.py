@@ -0,0 +1,205 @@
+"""
+Generated scheduler payloads and a sweep benchmark of the three schedulers
+Payloads follow valid_scheduler_data: summarized_orders per material group and campaign_blocks
+per line. The sweep walks lines x blocks per line x material groups x orders per group and
+records the latency surface of /api/changover_scheduler, /api/hybrid_scheduler and /api/otif_scheduler.
+"""
+import calendar
+import itertools
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from perf.orders import material_groups as material_group_names
+from perf.otif import otif_for_response
+from perf.schedule_verifier import verify_scheduler_response
+from perf.solver_lane import post_in_lane
+
+# Changeover takes the full request; hybrid and OTIF read only request.json["data"]
+SCHEDULERS = {
+    "changover": "/api/changover_scheduler",
+    "hybrid": "/api/hybrid_scheduler",
+    "otif": "/api/otif_scheduler",
+}
+SWEEP_GRID = {
+    "lines": (2, 6, 12),
+    "blocks_per_line": (1, 4),
+    "material_groups": (2, 5),
+    "orders_per_group": (10, 100, 500),
+}
+
+
+def _timestamp(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def scheduler_payload(lines=2, blocks_per_line=1, material_groups=2, orders_per_group=1,
+                      month_year="2024-01", seed=0, algorithm_name="changeover_scheduler"):
+    """
+    Build a changover_scheduler request: the month is split into blocks_per_line campaign blocks on
+    every line, material groups rotate across blocks, and each group's summarized orders sit inside
+    blocks of that group. Block capacity covers the orders placed in it.
+    """
+    rng = random.Random(seed)
+    groups = material_group_names(material_groups)
+    year, month = (int(part) for part in month_year.split("-"))
+    month_start = datetime(year, month, 1, tzinfo=timezone.utc)
+    block_length = timedelta(days=calendar.monthrange(year, month)[1]) / blocks_per_line
+
+    blocks = []
+    for line_index in range(lines):
+        for block_index in range(blocks_per_line):
+            start = month_start + block_length * block_index
+            blocks.append({
+                "line": f"Line{line_index + 1}",
+                "material_group": groups[(line_index * blocks_per_line + block_index) % len(groups)],
+                "start": start,
+                "end": start + block_length - timedelta(seconds=1),
+                "capacity": 0,
+            })
+
+    summarized_orders = {group: [] for group in groups}
+    order_number = 170000
+    for group in groups:
+        group_blocks = [block for block in blocks if block["material_group"] == group]
+        for _ in range(orders_per_group if group_blocks else 0):
+            block = rng.choice(group_blocks)
+            window = (block["end"] - block["start"]).total_seconds()
+            start = block["start"] + timedelta(seconds=int(rng.uniform(0, window * 0.8)))
+            end = min(start + timedelta(hours=rng.randint(2, 48)), block["end"])
+            capacity = rng.randint(50, 1000)
+            block["capacity"] += capacity
+            # Due a few days either side of the order window, so schedulers can make or miss it
+            due = end + timedelta(days=rng.randint(-2, 5))
+            order_number += 1
+            summarized_orders[group].append({
+                "Sales Orde": order_number,
+                "Req.Del.Dt": due.date().isoformat(),
+                "material_group": group,
+                "original_material_group": group,
+                "line": block["line"],
+                "start_time": _timestamp(start),
+                "end_time": _timestamp(end),
+                "capacity": capacity,
+            })
+
+    campaign_blocks = {}
+    for block in blocks:
+        campaign_blocks.setdefault(block["line"], []).append({
+            "material_group": block["material_group"],
+            "start_time": _timestamp(block["start"]),
+            "end_time": _timestamp(block["end"]),
+            "capacity": max(block["capacity"], 1000),
+        })
+
+    return {
+        "client_name": "CPFL",
+        "algorithm_name": algorithm_name,
+        "month_year": month_year,
+        "primary_machine_name": "PRIMARY01",
+        "data": {
+            "summarized_orders": summarized_orders,
+            "campaign_blocks": campaign_blocks,
+        },
+    }
+
+
+def scheduler_request(scheduler, payload):
+    return payload if scheduler == "changover" else {"data": payload["data"]}
+
+
+def run_scheduler(session, base_url, scheduler, payload, timeout, headers=None):
+    """Run one scheduler through the solver lane; returns latency, status, schedule verification and OTIF"""
+    lane = post_in_lane(session, f"{base_url}{SCHEDULERS[scheduler]}", scheduler_request(scheduler, payload),
+                        timeout, headers=headers)
+    response = lane["response"]
+    result = {
+        "scheduler": scheduler,
+        "status": response.status_code if response is not None else None,
+        "latency_s": lane["latency_s"],
+        "timed_out": lane["error"] == "timeout",
+        "response_bytes": len(response.content) if response is not None else 0,
+        "error": lane["error"],
+        "verification": None,
+        "service": None,
+    }
+    if response is not None and response.status_code == 200:
+        data = response.json()
+        result["verification"] = verify_scheduler_response(data, payload["data"])
+        result["service"] = otif_for_response(data, payload["data"])
+    elif response is not None and not result["error"]:
+        result["error"] = response.text[:200]
+    return result
+
+
+def sweep_schedulers(session, base_url, timeout, grid=None, schedulers=tuple(SCHEDULERS), headers=None, seed=0):
+    """
+    Run every scheduler over the grid, smallest payloads first. Once a scheduler times out,
+    configurations with at least as many orders are recorded as skipped for it.
+    """
+    grid = dict(SWEEP_GRID, **(grid or {}))
+    configs = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    configs.sort(key=lambda config: (config["material_groups"] * config["orders_per_group"], config["lines"]))
+
+    results, timeout_orders = [], {}
+    for config in configs:
+        payload = scheduler_payload(seed=seed, **config)
+        total_orders = sum(len(orders) for orders in payload["data"]["summarized_orders"].values())
+        for scheduler in schedulers:
+            if total_orders >= timeout_orders.get(scheduler, float("inf")):
+                results.append(dict(config, scheduler=scheduler, total_orders=total_orders, status=None,
+                                    latency_s=None, timed_out=None, skipped=True))
+                continue
+            result = run_scheduler(session, base_url, scheduler, payload, timeout, headers=headers)
+            result.update(config, total_orders=total_orders, skipped=False)
+            if result["timed_out"]:
+                timeout_orders[scheduler] = total_orders
+            results.append(result)
+    return results
+
+
+def timeout_points(results):
+    """Per scheduler, the smallest configuration (by total orders) that exceeded the timeout, or None"""
+    points = {}
+    for result in sorted((r for r in results if r["timed_out"]), key=lambda r: r["total_orders"]):
+        points.setdefault(result["scheduler"], dict({key: result[key] for key in SWEEP_GRID},
+                                                    total_orders=result["total_orders"]))
+    return {scheduler: points.get(scheduler) for scheduler in sorted({r["scheduler"] for r in results})}
+
+
+def latency_surface(results, scheduler, x="lines", y="orders_per_group"):
+    """Median latency per (x, y) for one scheduler, over the remaining grid dimensions"""
+    cells = {}
+    for result in results:
+        if result["scheduler"] == scheduler and result["latency_s"] is not None and not result["timed_out"]:
+            cells.setdefault((result[x], result[y]), []).append(result["latency_s"])
+    return {cell: float(np.median(latencies)) for cell, latencies in sorted(cells.items())}
+
+
+def plot_latency_surfaces(results, path, x="lines", y="orders_per_group"):
+    """Heatmap of median latency over (x, y) for each scheduler"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    schedulers = sorted({result["scheduler"] for result in results})
+    xs = sorted({result[x] for result in results})
+    ys = sorted({result[y] for result in results})
+    figure, axes = plt.subplots(1, max(len(schedulers), 1), figsize=(5 * max(len(schedulers), 1), 4), squeeze=False)
+    for axis, scheduler in zip(axes[0], schedulers):
+        surface = latency_surface(results, scheduler, x=x, y=y)
+        grid = np.array([[surface.get((x_value, y_value), np.nan) for x_value in xs] for y_value in ys])
+        image = axis.imshow(grid, origin="lower", aspect="auto", cmap="viridis")
+        axis.set_xticks(range(len(xs)), [str(value) for value in xs])
+        axis.set_yticks(range(len(ys)), [str(value) for value in ys])
+        axis.set_xlabel(x)
+        axis.set_ylabel(y)
+        axis.set_title(f"{scheduler} median latency (s)")
+        figure.colorbar(image, ax=axis)
+    figure.tight_layout()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    figure.savefig(path)
+    plt.close(figure)
+    return path
@@ -0,0 +1,143 @@
+"""
+Soak mode: a long mixed workload sampled in fixed windows, with leak and drift detection
+Closed-loop workers send the page-load read mix while a canary thread probes the root `/`
+health check at a steady interval. Every window gets its own p50/p99, error rate and canary
+latency. A line fitted per metric over the windows, together with the rank correlation between
+window and value, flags a metric that keeps rising through the run: a server-side leak or an
+ever-growing cache, rather than noise.
+"""
+import random
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from config import SOAK_DURATION_S, SOAK_WINDOW_S
+from perf.endpoints import endpoint_request, seed_endpoints
+from perf.limiter import guarded_status
+from perf.workload import READ_MIX
+
+SOAK_MIX = dict(READ_MIX, fetch_plan_data=1, fetch_plans_by_material_code=1)
+SOAK_WORKERS = 4
+CANARY_INTERVAL_S = 1.0
+# A metric drifts when it rises with nearly every window (Spearman rho) and by a meaningful amount
+DRIFT_RHO = 0.8
+DRIFT_MIN_GROWTH = 1.25
+DRIFT_MIN_ERROR_RISE = 0.01
+MIN_DRIFT_WINDOWS = 6
+DRIFT_METRICS = ("p50_s", "p99_s", "error_rate", "canary_p50_s", "canary_p99_s")
+
+
+def _send(session, base_url, name, timeout, headers, guard):
+    method, path, params, body = endpoint_request(name)
+    start = time.perf_counter()
+    status = guarded_status(session, method, f"{base_url}{path}", guard, params=params, json=body, headers=headers,
+                            timeout=timeout)
+    return start, time.perf_counter(), status
+
+
+def run_soak(base_url, timeout, duration_s=SOAK_DURATION_S, mix=SOAK_MIX, workers=SOAK_WORKERS,
+             canary_interval_s=CANARY_INTERVAL_S, headers=None, guard=None, seed=0):
+    """
+    Run the mix and the `/` canary for duration_s; one row per request with its offset from the
+    start of the soak, endpoint, canary flag, latency and status.
+    """
+    seed_endpoints(requests.Session(), base_url, timeout, headers=headers)
+    records, lock = [], threading.Lock()
+    began = time.perf_counter()
+    deadline = began + duration_s
+    names, weights = list(mix), list(mix.values())
+
+    def worker(rng):
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start, end, status = _send(session, base_url, name, timeout, headers, guard)
+            with lock:
+                records.append((start - began, name, False, end - start, status))
+
+    def canary():
+        # The canary bypasses the guard: it measures the service, not the client's throttling
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            start, end, status = _send(session, base_url, "health", timeout, headers, None)
+            with lock:
+                records.append((start - began, "health", True, end - start, status))
+            time.sleep(max(0.0, canary_interval_s - (end - start)))
+
+    threads = [threading.Thread(target=worker, args=(random.Random(seed + index),)) for index in range(workers)]
+    threads.append(threading.Thread(target=canary))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return pd.DataFrame(records, columns=["offset_s", "endpoint", "canary", "latency_s", "status"])
+
+
+def _percentiles(latencies):
+    if not len(latencies):
+        return None, None
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return float(p50), float(p99)
+
+
+def soak_windows(frame, window_s=SOAK_WINDOW_S):
+    """One row per window_s window (by request start): throughput, p50/p99, error rate and canary latency"""
+    rows = []
+    window = (frame["offset_s"] // window_s).astype(int)
+    for index in range(int(window.max()) + 1 if len(frame) else 0):
+        rows_in = frame[window == index]
+        load, canary = rows_in[~rows_in["canary"]], rows_in[rows_in["canary"]]
+        p50, p99 = _percentiles(load["latency_s"])
+        canary_p50, canary_p99 = _percentiles(canary["latency_s"])
+        rows.append({
+            "window": index,
+            "start_s": index * window_s,
+            "requests": len(load),
+            "throughput_rps": len(load) / window_s,
+            "p50_s": p50,
+            "p99_s": p99,
+            "error_rate": float((load["status"] != 200).mean()) if len(load) else None,
+            "canary_probes": len(canary),
+            "canary_p50_s": canary_p50,
+            "canary_p99_s": canary_p99,
+            "canary_errors": int((canary["status"] != 200).sum()),
+        })
+    return rows
+
+
+def drift(windows, metric, rho_threshold=DRIFT_RHO, min_growth=DRIFT_MIN_GROWTH,
+          min_error_rise=DRIFT_MIN_ERROR_RISE, min_windows=MIN_DRIFT_WINDOWS):
+    """
+    Trend of one metric across windows: least-squares slope per hour, fitted first and last values,
+    Spearman rho, and whether it drifts (rho >= threshold and growth >= min_growth, or for the
+    error rate a rise of at least min_error_rise).
+    """
+    frame = pd.DataFrame(windows)
+    points = frame[["start_s", metric]].dropna() if metric in frame else pd.DataFrame()
+    result = {"metric": metric, "windows": len(points), "slope_per_hour": None, "fitted_start": None,
+              "fitted_end": None, "growth": None, "rho": None, "drifting": False}
+    if len(points) < max(min_windows, 2):
+        return result
+
+    x, y = points["start_s"].to_numpy(dtype=float), points[metric].to_numpy(dtype=float)
+    slope, intercept = np.polyfit(x, y, 1)
+    fitted_start, fitted_end = intercept + slope * x[0], intercept + slope * x[-1]
+    # Spearman rho as the Pearson correlation of ranks (no scipy needed)
+    ranks = points.rank()
+    rho = ranks["start_s"].corr(ranks[metric]) if np.ptp(y) else 0.0
+    growth = fitted_end / fitted_start if fitted_start > 0 else None
+    if metric == "error_rate":
+        rising = fitted_end - fitted_start >= min_error_rise
+    else:
+        rising = growth is not None and growth >= min_growth
+    result.update(slope_per_hour=float(slope * 3600), fitted_start=float(fitted_start), fitted_end=float(fitted_end),
+                  growth=growth, rho=float(rho), drifting=bool(rho >= rho_threshold and rising))
+    return result
+
+
+def drift_report(windows, metrics=DRIFT_METRICS, **options):
+    """drift() of every metric; options are passed through"""
+    return [drift(windows, metric, **options) for metric in metrics]
@@ -0,0 +1,71 @@
+"""
+Solver lane: optimiser calls hold a single-use Gurobi licence on the backend, so the harness
+sends them one at a time. The lane is a thread lock plus a file lock, so pytest-xdist workers
+queue behind each other too; a request that still finds the licence busy is retried.
+"""
+import fcntl
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from requests.exceptions import Timeout
+
+# 500 responses meaning the solver licence is taken, as skipped on in the optimise tests
+LICENSE_BUSY_MARKERS = ("Single-use license", "Too many sessions")
+LANE_LOCK_PATH = os.path.join(tempfile.gettempdir(), "deckle-solver-lane.lock")
+LICENSE_RETRIES = 3
+LICENSE_BACKOFF_S = 5.0
+
+_thread_lock = threading.Lock()
+
+
+def license_busy(response):
+    return response is not None and response.status_code == 500 and \
+        any(marker in response.text for marker in LICENSE_BUSY_MARKERS)
+
+
+@contextmanager
+def solver_lane(lock_path=LANE_LOCK_PATH):
+    """Hold the solver lane; yields the seconds spent waiting for it"""
+    start = time.perf_counter()
+    with _thread_lock, open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield time.perf_counter() - start
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def post_in_lane(session, url, payload, timeout, headers=None, retries=LICENSE_RETRIES,
+                 backoff_s=LICENSE_BACKOFF_S):
+    """POST a solver request inside the solver lane; see request_in_lane"""
+    return request_in_lane(session, "POST", url, payload, timeout, headers=headers, retries=retries,
+                           backoff_s=backoff_s)
+
+
+def request_in_lane(session, method, url, payload, timeout, headers=None, retries=LICENSE_RETRIES,
+                    backoff_s=LICENSE_BACKOFF_S):
+    """
+    Send a solver request (JSON body) inside the solver lane, retrying while the licence is busy.
+    Returns the last response (None on timeout) with latency_s, queue_s, attempts and error.
+    """
+    result = {"response": None, "latency_s": None, "queue_s": 0.0, "attempts": 0, "error": None}
+    for attempt in range(retries + 1):
+        with solver_lane() as queue_s:
+            result["queue_s"] += queue_s
+            result["attempts"] = attempt + 1
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, json=payload, headers=headers, timeout=timeout)
+            except Timeout:
+                result.update(response=None, latency_s=time.perf_counter() - start, error="timeout")
+                return result
+            result.update(response=response, latency_s=time.perf_counter() - start, error=None)
+        if not license_busy(response):
+            return result
+        result["error"] = "license busy"
+        if attempt < retries:
+            time.sleep(backoff_s * (attempt + 1))
+    return result
@@ -0,0 +1,535 @@
+"""
+Stand-in for the trim-manager API
+Implements the routes the performance harness drives, with the same request and
+response shapes, so benchmarks and their helpers can be exercised without the hosted API.
+"""
+import csv
+import io
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pandas as pd
+
+from flask import Flask, Response, jsonify, request
+from openpyxl import Workbook, load_workbook
+from werkzeug.serving import make_server
+
+from perf.excel import XLSX_CONTENT_TYPE
+from perf.orders import PLANNER_COLUMNS, material_groups, planner_rows
+from perf.reference_solver import solve_reference
+
+# Rows exported by download_deckle_orders for each filter level
+DECKLE_EXPORT_ROWS = {"company": 20000, "material_group": 4000, "material_code": 400}
+
+# Column-generation iterations per optimiser: fewer iterations trade trim loss for runtime,
+# which gives the algorithms distinct runtime/quality profiles
+OPTIMISER_ITERATIONS = {"setting": 5, "hybrid": 40, "wastage": 500, "metallizer": 500}
+OPTIMISER_REQUIRED = ("data", "max_width", "minimum_trim", "machine_category")
+
+# Simulated upstream SAP latency: a fixed cost per call plus a cost per day in the range
+SAP_CALL_S = 0.02
+SAP_DAY_S = 0.004
+SAP_HISTORY_START = date(2023, 1, 1)
+PLAN_LOOKUP_S = 0.01
+
+
+def create_app(read_lag_s=0.0, write_hold_s=0.0, sap_error_rate=0.0, leak_s_per_request=0.0, cold_start_s=0.0,
+               shuffle_plans=False):
+    """
+    Build the stand-in Flask application. With read_lag_s, saved campaign plans and sales forecasts
+    only become visible to the fetch routes after that delay, like a lagging read replica. With
+    write_hold_s, user and machine writes hold the store lock that reads of it wait on. sap_data
+    fails with a 502 on a sap_error_rate share of calls. With leak_s_per_request, every request is
+    that much slower than the one before, like a server whose heap or cache keeps growing. With
+    cold_start_s, the first call to each route pays that much extra, like a freshly deployed container.
+    With shuffle_plans, optimisers return the same patterns in a random row and slot order.
+    """
+    app = Flask(__name__)
+    # One optimiser call at a time, like the backend's single-use Gurobi licence
+    solver_license = threading.Lock()
+    sales_forecasts = {}
+    campaigns = {}
+    users = {}
+    machines = {}
+    user_store = threading.Lock()
+    sap_rng = random.Random(0)
+    # (store, key) -> [(visible_at, value), ...] as seen by the fetch routes
+    published = {}
+
+    def publish(store, key, value):
+        history = published.setdefault((store, key), [])
+        history.append((time.monotonic() + read_lag_s, value))
+        del history[:-2]
+
+    def visible(store, key):
+        now = time.monotonic()
+        return next((value for visible_at, value in reversed(published.get((store, key), []))
+                     if visible_at <= now), None)
+
+    served = itertools.count()
+    warmed, warming = set(), threading.Lock()
+
+    @app.before_request
+    def leak():
+        if leak_s_per_request:
+            time.sleep(next(served) * leak_s_per_request)
+
+    @app.before_request
+    def cold_start():
+        if cold_start_s:
+            with warming:
+                cold = request.path not in warmed
+                warmed.add(request.path)
+            if cold:
+                time.sleep(cold_start_s)
+
+    @app.route("/", methods=["GET", "POST"])
+    def health_check():
+        return "200 OK"
+
+    @app.route("/update_details", methods=["POST"])
+    def update_details():
+        payload = request.get_json(silent=True) or {}
+        if not payload.get("userId"):
+            return jsonify({"error": "userId is required"}), 400
+        with user_store:
+            time.sleep(write_hold_s)
+            users[payload["userId"]] = dict(users.get(payload["userId"], {}), **payload)
+        return jsonify({"message": "User details updated"})
+
+    @app.route("/get_details", methods=["GET"])
+    def get_details():
+        user_id = request.args.get("userId")
+        if not user_id:
+            return jsonify({"error": "userId is required"}), 400
+        with user_store:
+            user = users.get(user_id)
+        if user is None:
+            return jsonify({"error": "User not found"}), 404
+        return jsonify(user)
+
+    @app.route("/add_machine", methods=["POST"])
+    def add_machine():
+        payload = request.get_json(silent=True) or {}
+        if not payload.get("userId") or not payload.get("machineType"):
+            return jsonify({"error": "userId and machineType are required"}), 400
+        with user_store:
+            time.sleep(write_hold_s)
+            user = users.get(payload["userId"])
+            if user is None:
+                return jsonify({"error": "User not found"}), 404
+            machines[(user.get("company"), payload["machineType"])] = payload
+        return jsonify({"success": True, "message": "Machine added"})
+
+    @app.route("/get_machine_details", methods=["GET"])
+    def get_machine_details():
+        key = (request.args.get("company"), request.args.get("machineType"))
+        if not all(key):
+            return jsonify({"error": "company and machineType are required"}), 400
+        with user_store:
+            machine = machines.get(key)
+        if machine is None:
+            return jsonify({"error": "Machine not found"}), 404
+        return jsonify(machine)
+
+    @app.route("/api/fetch_material_groups", methods=["GET"])
+    def fetch_material_groups():
+        company = request.args.get("company")
+        if not company:
+            return jsonify({"error": "company is required"}), 400
+        return jsonify({"company": company, "material_groups": material_groups(12)})
+
+    @app.route("/api/fetch_parameters", methods=["GET"])
+    def fetch_parameters():
+        return jsonify({"max_width": 8700, "minimum_trim": 250, "machine_categories": ["Primary", "Secondary"]})
+
+    @app.route("/api/preprocess_excel_data", methods=["POST"])
+    def preprocess_excel_data():
+        upload = request.files.get("file")
+        if upload is None:
+            return jsonify({"error": "No file provided"}), 400
+        workbook = load_workbook(upload.stream, read_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = list(next(rows, []))
+        row_count = sum(1 for _ in rows)
+        workbook.close()
+        return jsonify({"columns": columns, "rows": row_count})
+
+    @app.route("/api/download_deckle_orders", methods=["GET"])
+    def download_deckle_orders():
+        company = request.args.get("company")
+        if not company:
+            return jsonify({"error": "company is required"}), 400
+        level = "material_code" if request.args.get("material_code") else \
+            "material_group" if request.args.get("material_group") else "company"
+        n_rows = request.args.get("rows", DECKLE_EXPORT_ROWS[level], type=int)
+        body_format = request.args.get("format", "json")
+        rows = planner_rows(n_rows, seed=n_rows)
+
+        if body_format == "xlsx":
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("Deckle Orders")
+            sheet.append(PLANNER_COLUMNS)
+            for row in rows:
+                sheet.append([row[column] for column in PLANNER_COLUMNS])
+            buffer = io.BytesIO()
+            workbook.save(buffer)
+            return Response(buffer.getvalue(), mimetype=XLSX_CONTENT_TYPE)
+
+        if body_format == "csv":
+            def generate_csv():
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=PLANNER_COLUMNS)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)
+                    if buffer.tell() > 64 * 1024:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                yield buffer.getvalue()
+            return Response(generate_csv(), mimetype="text/csv")
+
+        def generate_json():
+            yield json.dumps({"company": company})[:-1] + ', "orders": ['
+            for index, row in enumerate(rows):
+                yield ("," if index else "") + json.dumps(row)
+            yield "]}"
+        return Response(generate_json(), mimetype="application/json")
+
+    @app.route("/api/<scheduler>_scheduler", methods=["POST"])
+    def schedule(scheduler):
+        if scheduler not in ("changover", "hybrid", "otif"):
+            return jsonify({"error": "Not found"}), 404
+        data = (request.get_json(silent=True) or {}).get("data")
+        if not isinstance(data, dict) or not data.get("summarized_orders"):
+            return jsonify({"error": "No orders provided"}), 400
+        if not solver_license.acquire(blocking=False):
+            return jsonify({"error": "Single-use license is already in use"}), 500
+        try:
+            scheduled_plan = _schedule_in_blocks(data)
+        finally:
+            solver_license.release()
+        return jsonify({"planId": uuid.uuid4().hex, "clientId": "CPFL", "scheduled_plan": scheduled_plan})
+
+    @app.route("/api/save_sales_forecast", methods=["POST"])
+    def save_sales_forecast():
+        payload = request.get_json(silent=True) or {}
+        if not all(payload.get(key) for key in ("client_name", "month", "plant")):
+            return jsonify({"error": "client_name, month and plant are required"}), 400
+        if not isinstance(payload.get("forecast"), list) or not payload["forecast"]:
+            return jsonify({"error": "forecast must be a non-empty list"}), 400
+        key = (payload["client_name"], payload["month"], payload["plant"])
+        sales_forecasts[key] = payload["forecast"]
+        publish("sales_forecast", key, payload["forecast"])
+        return jsonify({"message": "Sales forecast saved", "groups": len(payload["forecast"])})
+
+    @app.route("/api/changover_planner", methods=["POST"])
+    @app.route("/api/<planner>_planner", methods=["GET"])
+    def plan_campaigns(planner="changover"):
+        if planner not in ("changover", "otif", "hybrid"):
+            return jsonify({"error": "Not found"}), 404
+        payload = request.get_json(silent=True) or {}
+        if planner == "changover":
+            if not payload.get("monthYear") or not payload.get("plant"):
+                return jsonify({"error": "monthYear and plant are required"}), 400
+            if ("CPFL", payload["monthYear"], payload["plant"]) not in sales_forecasts:
+                return jsonify({"error": "Sales forecast not found"}), 404
+        if not payload.get("data"):
+            return jsonify({"error": "No data provided"}), 400
+        if not solver_license.acquire(blocking=False):
+            return jsonify({"error": "Single-use license is already in use"}), 500
+        try:
+            campaign_plan = _plan_campaigns(payload["data"], by_due_date=planner != "changover")
+        finally:
+            solver_license.release()
+        return jsonify({"planId": uuid.uuid4().hex, "clientId": "CPFL", "campaign_plan": campaign_plan})
+
+    @app.route("/api/validate_campaign_changes", methods=["POST"])
+    def validate_campaign_changes():
+        payload = request.get_json(silent=True) or {}
+        if not payload.get("current_plan") or not payload.get("changes"):
+            return jsonify({"error": "current_plan and changes are required"}), 400
+        results = _check_changes(payload["current_plan"], payload["changes"], int(payload.get("freeze_days") or 0))
+        return jsonify({"valid": all(result["valid"] for result in results), "results": results})
+
+    @app.route("/api/apply_campaign_changes", methods=["POST"])
+    def apply_campaign_changes():
+        payload = request.get_json(silent=True) or {}
+        if payload.get("action") != "apply_suggestion":
+            return jsonify({"error": "Invalid or missing action"}), 400
+        plan = (payload.get("new_plans") or {}).get(payload.get("suggestion_id"), {}).get("campaign_plan")
+        if plan is None:
+            return jsonify({"error": "Suggestion not found"}), 400
+        return jsonify({"success": True, "updated_plan": plan})
+
+    @app.route("/api/save_campaign_plan", methods=["POST"])
+    def save_campaign_plan():
+        payload = request.get_json(silent=True) or {}
+        if not payload.get("client_name") or not isinstance(payload.get("campaign_plan"), list):
+            return jsonify({"error": "client_name and campaign_plan are required"}), 400
+        campaign_id = uuid.uuid4().hex
+        campaigns[campaign_id] = {
+            "metadata": {key: payload.get(key) for key in ("client_name", "month_year", "plant", "primary_machine_name")},
+            "campaign_plan": payload["campaign_plan"],
+            "versions": [],
+        }
+        publish("campaign_plan", tuple(campaigns[campaign_id]["metadata"].values()), campaign_id)
+        return jsonify({"message": "Campaign plan saved", "campaign_id": campaign_id})
+
+    @app.route("/api/fetch_campaign_plan", methods=["GET"])
+    def fetch_campaign_plan():
+        key = tuple(request.args.get(name) for name in ("client_name", "month_year", "plant", "primary_machine_name"))
+        if not all(key):
+            return jsonify({"error": "client_name, month_year, plant and primary_machine_name are required"}), 400
+        campaign_id = visible("campaign_plan", key)
+        if campaign_id is None:
+            return jsonify({"error": "Campaign plan not found"}), 404
+        return jsonify({"campaign_id": campaign_id, "campaign_plan": campaigns[campaign_id]["campaign_plan"]})
+
+    @app.route("/api/fetch_sales_forecast", methods=["GET"])
+    def fetch_sales_forecast():
+        key = tuple(request.args.get(name) for name in ("client_name", "month", "plant"))
+        if not all(key):
+            return jsonify({"error": "client_name, month and plant are required"}), 400
+        forecast = visible("sales_forecast", key)
+        if forecast is None:
+            return jsonify({"error": "Sales forecast not found"}), 404
+        return jsonify({"client_name": key[0], "month": key[1], "plant": key[2], "forecast": forecast})
+
+    @app.route("/add_version", methods=["POST"])
+    def add_version():
+        payload = request.get_json(silent=True) or {}
+        if not payload.get("campaign_id") or not isinstance(payload.get("data"), dict):
+            return jsonify({"error": "campaign_id and data are required"}), 400
+        campaign = campaigns.setdefault(payload["campaign_id"], {
+            "metadata": {"client_name": payload.get("client_name"), "month_year": payload.get("month")},
+            "campaign_plan": [],
+            "versions": [],
+        })
+        campaign["versions"].append({key: payload.get(key) for key in ("version", "month", "client_name", "data")})
+        campaign["campaign_plan"] = payload["data"].get("campaign_plan", campaign["campaign_plan"])
+        return jsonify({"message": "Version added", "versions": len(campaign["versions"])})
+
+    @app.route("/get_campaign_details", methods=["GET"])
+    def get_campaign_details():
+        client_name, month = request.args.get("client_name"), request.args.get("month")
+        if not client_name or not month:
+            return jsonify({"error": "client_name and month are required"}), 400
+        # Returns the full version history of every campaign in the month
+        return jsonify({"client_name": client_name, "month": month, "campaigns": [
+            {"campaign_id": campaign_id, "versions": campaign["versions"]}
+            for campaign_id, campaign in campaigns.items()
+            if campaign["metadata"].get("client_name") == client_name and campaign["metadata"].get("month_year") == month
+        ]})
+
+    @app.route("/api/fetch_campaign_by_id", methods=["GET"])
+    def fetch_campaign_by_id():
+        campaign_id = request.args.get("campaign_id")
+        if not campaign_id:
+            return jsonify({"error": "campaign_id is required"}), 400
+        if campaign_id not in campaigns:
+            return jsonify({"error": "Campaign not found"}), 404
+        campaign = campaigns[campaign_id]
+        return jsonify({"metadata": dict(campaign["metadata"], versions=len(campaign["versions"])),
+                        "campaign_plan": campaign["campaign_plan"]})
+
+    @app.route("/api/sap_data", methods=["GET"])
+    def sap_data():
+        material_code = request.args.get("material_code")
+        try:
+            start = date.fromisoformat(request.args.get("start_date", ""))
+            end = date.fromisoformat(request.args.get("end_date", ""))
+        except ValueError:
+            return jsonify({"error": "start_date and end_date must be YYYY-MM-DD"}), 400
+        if not material_code or end < start:
+            return jsonify({"error": "material_code and a valid date range are required"}), 400
+        # Upstream cost grows with the range; a share of calls fails upstream
+        time.sleep(SAP_CALL_S + SAP_DAY_S * ((end - start).days + 1))
+        if sap_rng.random() < sap_error_rate:
+            return jsonify({"error": "Upstream SAP error"}), 502
+        return jsonify({"material_code": material_code, "data": _sap_orders(material_code, start, end)})
+
+    @app.route("/api/fetch_plan_data", methods=["GET"])
+    def fetch_plan_data():
+        params = {key: request.args.get(key) for key in ("algorithm", "company", "product_name", "product_config",
+                                                          "machine_type", "plant")}
+        if not all(params.values()):
+            return jsonify({"error": "algorithm, company, product_name, product_config, machine_type and plant "
+                                     "are required"}), 400
+        if params["algorithm"] not in ("setting", "wastage", "hybrid"):
+            return jsonify({"error": "algorithm must be setting, wastage or hybrid"}), 400
+        rng = random.Random("|".join(params.values()))
+        widths = [int(width) for width in params["product_config"].split("_") if width.isdigit()] or [1000]
+        return jsonify({"plan_data": [{"setting": index + 1, "widths": rng.sample(widths, len(widths)),
+                                       "sets": rng.randint(1, 20)} for index in range(10)]})
+
+    @app.route("/api/fetch_plans_by_material_code", methods=["GET"])
+    def fetch_plans_by_material_code():
+        params = {key: request.args.get(key) for key in ("material_code", "company", "machine_type", "plant")}
+        if not all(params.values()):
+            return jsonify({"error": "material_code, company, machine_type and plant are required"}), 400
+        time.sleep(PLAN_LOOKUP_S)
+        rng = random.Random("|".join(params.values()))
+        plans = [{"plan_id": f"{params['material_code']}-{index + 1}", "month_year": f"2024-{rng.randint(1, 12):02d}",
+                  "sets": rng.randint(1, 40)} for index in range(rng.randint(0, 3))]
+        return jsonify({"material_code": params["material_code"], "available_plans": plans})
+
+    @app.route("/api/optimise_<algorithm>", methods=["POST"])
+    def optimise(algorithm):
+        if algorithm not in OPTIMISER_ITERATIONS:
+            return jsonify({"error": "Not found"}), 404
+        payload = request.get_json(silent=True) or {}
+        missing = [key for key in OPTIMISER_REQUIRED if key not in payload]
+        if missing:
+            return jsonify({"error": f"Missing parameters: {missing}"}), 400
+        if not solver_license.acquire(blocking=False):
+            return jsonify({"error": "Single-use license is already in use"}), 500
+        try:
+            result = solve_reference(payload, max_iterations=OPTIMISER_ITERATIONS[algorithm])
+        except (ValueError, KeyError, TypeError) as e:
+            return jsonify({"error": str(e)}), 500
+        finally:
+            solver_license.release()
+        plan = result["plan"]
+        if shuffle_plans:
+            plan = [_shuffled_slots(row) for row in random.sample(plan, len(plan))]
+        return jsonify({"planData": plan, "trim_loss_pct": result["trim_loss_pct"]})
+
+    return app
+
+
+def _shuffled_slots(row):
+    """The plan row with its slot widths in random order"""
+    slots = [key for key in row if key.isdigit()]
+    widths = random.sample([row[key] for key in slots], len(slots))
+    return dict(row, **dict(zip(slots, widths)))
+
+
+def _check_changes(current_plan, changes, freeze_days):
+    """Pairwise freeze-window and overlap check of every change against the plan with all changes applied"""
+    freeze_end = date.today() + timedelta(days=freeze_days)
+    blocks = {(b["line"], b["material_group"], b["start_time"], b["end_time"]): dict(b) for b in current_plan}
+    targets = []
+    for change in changes:
+        original = change.get("original", {})
+        block = blocks.get((change.get("line"), change.get("material_group"),
+                            original.get("start_time"), original.get("end_time")))
+        targets.append(block)
+        if block is not None:
+            block["_original_start"] = block["start_time"]
+            block.update(change.get("modifications", {}))
+
+    results = []
+    for index, block in enumerate(targets):
+        if block is None:
+            results.append({"index": index, "valid": False, "reason": "block not found"})
+            continue
+        start, end = date.fromisoformat(block["start_time"]), date.fromisoformat(block["end_time"])
+        if date.fromisoformat(block["_original_start"]) < freeze_end or start < freeze_end:
+            results.append({"index": index, "valid": False, "reason": f"inside {freeze_days}-day freeze window"})
+            continue
+        clash = any(
+            other is not block and other["line"] == block["line"] and
+            date.fromisoformat(other["start_time"]) <= end and start <= date.fromisoformat(other["end_time"])
+            for other in blocks.values()
+        )
+        results.append({"index": index, "valid": not clash, "reason": "overlaps another block" if clash else None})
+    return results
+
+
+def _sap_orders(material_code, start, end):
+    """Orders of a material whose created..delivery span meets [start, end]; spans cross window edges"""
+    rng = random.Random(material_code)
+    orders, created = [], SAP_HISTORY_START
+    while created <= end:
+        delivery = created + timedelta(days=rng.randint(0, 20))
+        order, quantity = f"{rng.randrange(10**9):09d}", rng.randrange(100, 5000, 50)
+        if delivery >= start:
+            orders.append({
+                "Sales Orde": order,
+                "Item No.": 10,
+                "Material": material_code,
+                "Created On": created.isoformat(),
+                "Req.Del.Dt": delivery.isoformat(),
+                "SO.Qty": quantity,
+            })
+        created += timedelta(days=rng.randint(1, 4))
+    return orders
+
+
+def _plan_campaigns(rows, by_due_date):
+    """One campaign per material group and month week; ordered by group volume (changeover) or due date"""
+    orders = pd.DataFrame(rows)
+    orders["due"] = pd.to_datetime(orders["Req.Del.Dt"])
+    orders["week"] = (orders["due"].dt.day - 1) // 7 + 1
+    campaigns = orders.groupby(["New Mat.Grp.", "week"]).agg(
+        orders=("Sales Orde", "count"), quantity=("Pend. Prod", "sum"), rolls=("Rolls", "sum"),
+        first_due=("due", "min"), last_due=("due", "max"),
+    ).reset_index()
+    if by_due_date:
+        campaigns = campaigns.sort_values(["first_due", "New Mat.Grp."])
+    else:
+        volume = campaigns.groupby("New Mat.Grp.")["quantity"].transform("sum")
+        campaigns = campaigns.assign(volume=volume).sort_values(["volume", "New Mat.Grp.", "week"],
+                                                                 ascending=[False, True, True])
+    return [{
+        "material_group": campaign["New Mat.Grp."],
+        "week": int(campaign["week"]),
+        "orders": int(campaign["orders"]),
+        "quantity": round(float(campaign["quantity"]), 2),
+        "rolls": int(campaign["rolls"]),
+        "first_due": campaign["first_due"].date().isoformat(),
+        "last_due": campaign["last_due"].date().isoformat(),
+    } for campaign in campaigns.to_dict("records")]
+
+
+def _schedule_in_blocks(data):
+    """Lay each block's summarized orders back to back, in start order, sharing the block window by capacity"""
+    orders = pd.DataFrame([order for group in data["summarized_orders"].values() for order in group])
+    blocks = pd.DataFrame([dict(block, line=line) for line, line_blocks in data.get("campaign_blocks", {}).items()
+                           for block in line_blocks])
+    if orders.empty or blocks.empty:
+        return []
+    for frame in (orders, blocks):
+        frame["start_time"] = pd.to_datetime(frame["start_time"], utc=True, format="ISO8601")
+        frame["end_time"] = pd.to_datetime(frame["end_time"], utc=True, format="ISO8601")
+
+    scheduled = []
+    for block in blocks.itertuples():
+        in_block = orders[(orders["line"] == block.line) & (orders["material_group"] == block.material_group) &
+                          (orders["start_time"] >= block.start_time) & (orders["start_time"] <= block.end_time)]
+        in_block = in_block.sort_values("start_time")
+        window = block.end_time - block.start_time
+        share = in_block["capacity"] / max(float(in_block["capacity"].sum()), float(block.capacity))
+        ends = block.start_time + window * share.cumsum()
+        starts = ends - window * share
+        for order, start, end in zip(in_block.to_dict("records"), starts, ends):
+            scheduled.append({
+                "Sales Orde": order.get("Sales Orde"),
+                "line": block.line,
+                "material_group": block.material_group,
+                "start_time": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "end_time": end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "quantity": order["capacity"],
+            })
+    return scheduled
+
+
+@contextmanager
+def serve(app=None, host="127.0.0.1"):
+    """Serve the stand-in on an ephemeral port in a background thread; yields its base URL"""
+    server = make_server(host, 0, app or create_app(), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}"
+    finally:
+        server.shutdown()
+        thread.join()
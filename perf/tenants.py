@@ -0,0 +1,184 @@
+"""
+Multi-tenant interference on one trim-manager instance
+Every tenant is a distinct company / plant / user. Quiet tenants run light page-load reads in a
+closed loop; the noisy tenant floods /api/optimise_hybrid from several workers at once (outside
+the solver lane, as independent users would). Each quiet tenant's latency and throughput with
+the flood running are compared with a baseline run without it.
+"""
+import random
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from perf.orders import optimiser_payload
+from perf.solver_lane import license_busy
+
+TENANTS = (
+    {"company": "CPFL", "plant": "AMD", "user_id": "perf-cpfl-001"},
+    {"company": "ACME", "plant": "SLV", "user_id": "perf-acme-001"},
+    {"company": "POLY", "plant": "DHR", "user_id": "perf-poly-001"},
+    {"company": "FLEX", "plant": "PNQ", "user_id": "perf-flex-001"},
+)
+MACHINE_TYPE = "AB100"
+READERS_PER_TENANT = 2
+FLOOD_WORKERS = 4
+FLOOD_ORDERS = 50
+TENANT_DURATION_S = 30.0
+# A quiet tenant counts as degraded when its p99 under the flood exceeds this multiple of its baseline
+DEGRADATION_LIMIT = 2.0
+
+
+def tenant_operations(tenant):
+    """A tenant's light reads: (name, path, query params, weight)"""
+    company = tenant["company"]
+    return [
+        ("get_details", "/get_details", {"userId": tenant["user_id"]}, 4),
+        ("get_machine_details", "/get_machine_details", {"company": company, "machineType": MACHINE_TYPE}, 3),
+        ("fetch_material_groups", "/api/fetch_material_groups", {"company": company}, 2),
+        ("fetch_plans_by_material_code", "/api/fetch_plans_by_material_code",
+         {"material_code": "MAT001", "company": company, "machine_type": "Primary", "plant": tenant["plant"]}, 1),
+    ]
+
+
+def seed_tenant(session, base_url, tenant, timeout, headers=None):
+    """Create the tenant's user and machine; returns the two response statuses"""
+    user = session.post(f"{base_url}/update_details", json={
+        "userId": tenant["user_id"], "username": f"Perf {tenant['company']}", "email": "perf@example.com",
+        "phone": "+19999999999", "company": tenant["company"], "materialType": ["BOPET"],
+        "machine_type": ["PRIMARY01"], "expirationDate": "2025-12-31",
+    }, headers=headers, timeout=timeout)
+    machine = session.post(f"{base_url}/add_machine", json={
+        "userId": tenant["user_id"], "machineType": MACHINE_TYPE, "machineCategory": "Primary", "maxArms": 10,
+        "minArms": 2, "jumboWidth": 8700, "minTrim": 250, "plant": tenant["plant"],
+        "secondaryMachine": "SEC01", "metallizerMachine": "MET01",
+    }, headers=headers, timeout=timeout)
+    return user.status_code, machine.status_code
+
+
+def tenant_name(tenant):
+    return f"{tenant['company']}/{tenant['plant']}"
+
+
+def _reader(base_url, tenant, timeout, headers, deadline, rng, records, lock):
+    session = requests.Session()
+    operations = tenant_operations(tenant)
+    weights = [operation[-1] for operation in operations]
+    while time.perf_counter() < deadline:
+        name, path, params, _ = rng.choices(operations, weights)[0]
+        start = time.perf_counter()
+        try:
+            status = session.get(f"{base_url}{path}", params=params, headers=headers, timeout=timeout).status_code
+        except requests.exceptions.RequestException:
+            status = None
+        with lock:
+            records.append((tenant_name(tenant), name, start, time.perf_counter(), status))
+
+
+def _flooder(base_url, tenant, payload, timeout, headers, deadline, records, lock):
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{base_url}/api/optimise_hybrid", json=payload, headers=headers,
+                                    timeout=timeout)
+            status = "license busy" if license_busy(response) else response.status_code
+        except requests.exceptions.RequestException:
+            status = None
+        with lock:
+            records.append((tenant_name(tenant), "optimise_hybrid", start, time.perf_counter(), status))
+
+
+def run_tenants(base_url, timeout, quiet, noisy=None, readers_per_tenant=READERS_PER_TENANT,
+                flood_workers=FLOOD_WORKERS, flood_orders=FLOOD_ORDERS, duration_s=TENANT_DURATION_S,
+                headers=None, seed=0):
+    """Run the quiet tenants' readers (and the noisy tenant's flood, if given) for duration_s; one row per request"""
+    records, lock = [], threading.Lock()
+    deadline = time.perf_counter() + duration_s
+    threads = [
+        threading.Thread(target=_reader, args=(base_url, tenant, timeout, headers, deadline,
+                                               random.Random(seed + index * readers_per_tenant + reader),
+                                               records, lock))
+        for index, tenant in enumerate(quiet) for reader in range(readers_per_tenant)
+    ]
+    if noisy is not None:
+        payload = optimiser_payload(flood_orders, company=noisy["company"], plant=noisy["plant"], seed=seed)
+        threads += [threading.Thread(target=_flooder, args=(base_url, noisy, payload, timeout, headers, deadline,
+                                                            records, lock))
+                    for _ in range(flood_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    frame = pd.DataFrame(records, columns=["tenant", "operation", "start", "end", "status"])
+    frame["latency_s"] = frame["end"] - frame["start"]
+    return frame
+
+
+def _percentiles(latencies):
+    if not len(latencies):
+        return None, None
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return float(p50), float(p99)
+
+
+def _ratio(after, before):
+    return after / before if after is not None and before else None
+
+
+def tenant_interference(base_url, timeout, tenants=TENANTS, noisy_index=0, readers_per_tenant=READERS_PER_TENANT,
+                        flood_workers=FLOOD_WORKERS, flood_orders=FLOOD_ORDERS, duration_s=TENANT_DURATION_S,
+                        headers=None, seed=0):
+    """
+    Seed every tenant, run the quiet tenants alone, then again while the noisy tenant floods.
+    Returns (one degradation row per quiet tenant, the flood's own summary).
+    """
+    session = requests.Session()
+    for tenant in tenants:
+        seed_tenant(session, base_url, tenant, timeout, headers=headers)
+    noisy = tenants[noisy_index]
+    quiet = [tenant for index, tenant in enumerate(tenants) if index != noisy_index]
+    options = dict(readers_per_tenant=readers_per_tenant, duration_s=duration_s, headers=headers, seed=seed)
+
+    baseline = run_tenants(base_url, timeout, quiet, **options)
+    contended = run_tenants(base_url, timeout, quiet, noisy=noisy, flood_workers=flood_workers,
+                            flood_orders=flood_orders, **options)
+
+    rows = []
+    for tenant in quiet:
+        name = tenant_name(tenant)
+        before, after = baseline[baseline["tenant"] == name], contended[contended["tenant"] == name]
+        baseline_p50, baseline_p99 = _percentiles(before["latency_s"].to_numpy())
+        flood_p50, flood_p99 = _percentiles(after["latency_s"].to_numpy())
+        rows.append({
+            "tenant": name,
+            "noisy_tenant": tenant_name(noisy),
+            "baseline_rps": len(before) / duration_s,
+            "flood_rps": len(after) / duration_s,
+            "throughput_ratio": _ratio(len(after), len(before)),
+            "baseline_p50_s": baseline_p50,
+            "baseline_p99_s": baseline_p99,
+            "flood_p50_s": flood_p50,
+            "flood_p99_s": flood_p99,
+            "p50_ratio": _ratio(flood_p50, baseline_p50),
+            "p99_ratio": _ratio(flood_p99, baseline_p99),
+            "baseline_errors": int((before["status"] != 200).sum()),
+            "flood_errors": int((after["status"] != 200).sum()),
+        })
+        rows[-1]["degraded"] = (rows[-1]["p99_ratio"] or 0) > DEGRADATION_LIMIT
+
+    flood = contended[contended["tenant"] == tenant_name(noisy)]
+    flood_summary = {
+        "tenant": tenant_name(noisy),
+        "workers": flood_workers,
+        "orders": flood_orders,
+        "requests": len(flood),
+        "ok": int((flood["status"] == 200).sum()),
+        "license_busy": int((flood["status"] == "license busy").sum()),
+        "failed": int((~flood["status"].isin([200, "license busy"])).sum()),
+        "p50_s": _percentiles(flood["latency_s"].to_numpy())[0],
+    }
+    return rows, flood_summary
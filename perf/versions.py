@@ -0,0 +1,107 @@
+"""
+Campaign version history growth
+A campaign is built up version by version via /add_version; at sampled version counts the
+benchmark times /get_campaign_details and /api/fetch_campaign_by_id and records their response
+sizes, then fits how each metric grows with history.
+"""
+import time
+import uuid
+from datetime import date
+
+import numpy as np
+
+from perf.campaign_changes import campaign_plan
+
+HISTORY_VERSIONS = 50
+SAMPLE_EVERY = 5
+READ_REPEATS = 3
+# Log-log slope from which a metric is treated as growing linearly with version count,
+# and the minimum growth over the run before that is flagged (keeps flat, noisy metrics quiet)
+LINEAR_SLOPE = 0.7
+MIN_GROWTH = 2.0
+
+
+def version_payload(campaign_id, version, blocks=50, client_name="CPFL", month="2024-01", seed=0):
+    """add_version request carrying a generated campaign plan for the month"""
+    year, month_number = (int(part) for part in month.split("-"))
+    return {
+        "campaign_id": campaign_id,
+        "client_name": client_name,
+        "month": month,
+        "version": f"v{version}.0",
+        "data": {"campaign_plan": campaign_plan(blocks, date(year, month_number, 1), seed=seed + version)},
+    }
+
+
+def _timed_get(session, url, params, headers, timeout, repeats):
+    latencies, response = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+        latencies.append(time.perf_counter() - start)
+    return float(np.median(latencies)), response
+
+
+def create_campaign(session, base_url, timeout, blocks=50, client_name="CPFL", month="2024-01",
+                    plant="AMD", headers=None):
+    """Save a campaign plan and return its campaign_id (a fresh id if the server does not return one)"""
+    year, month_number = (int(part) for part in month.split("-"))
+    response = session.post(f"{base_url}/api/save_campaign_plan", json={
+        "client_name": client_name,
+        "campaign_plan": campaign_plan(blocks, date(year, month_number, 1)),
+        "primary_machine_name": "Machine1",
+        "month_year": month,
+        "plant": plant,
+    }, headers=headers, timeout=timeout)
+    campaign_id = response.json().get("campaign_id") if response.status_code == 200 else None
+    return campaign_id or f"perf-{uuid.uuid4().hex[:12]}"
+
+
+def benchmark_version_history(session, base_url, timeout, versions=HISTORY_VERSIONS, sample_every=SAMPLE_EVERY,
+                              blocks=50, client_name="CPFL", month="2024-01", read_repeats=READ_REPEATS,
+                              headers=None):
+    """Add `versions` versions to one campaign; every sample_every versions time both read paths"""
+    campaign_id = create_campaign(session, base_url, timeout, blocks=blocks, client_name=client_name,
+                                  month=month, headers=headers)
+    samples = []
+    for version in range(1, versions + 1):
+        start = time.perf_counter()
+        write = session.post(f"{base_url}/add_version", json=version_payload(campaign_id, version, blocks=blocks,
+                                                                             client_name=client_name, month=month),
+                             headers=headers, timeout=timeout)
+        write_s = time.perf_counter() - start
+        if version != 1 and version % sample_every:
+            continue
+
+        details_s, details = _timed_get(session, f"{base_url}/get_campaign_details",
+                                        {"client_name": client_name, "month": month}, headers, timeout, read_repeats)
+        by_id_s, by_id = _timed_get(session, f"{base_url}/api/fetch_campaign_by_id",
+                                    {"campaign_id": campaign_id}, headers, timeout, read_repeats)
+        samples.append({
+            "campaign_id": campaign_id,
+            "versions": version,
+            "write_status": write.status_code,
+            "write_s": write_s,
+            "details_status": details.status_code,
+            "details_s": details_s,
+            "details_bytes": len(details.content),
+            "by_id_status": by_id.status_code,
+            "by_id_s": by_id_s,
+            "by_id_bytes": len(by_id.content),
+        })
+    return samples
+
+
+def growth(samples, metric):
+    """Log-log slope of a metric against version count and its last/first ratio; flags linear growth"""
+    points = [(s["versions"], s[metric]) for s in samples if s[metric] and s[metric] > 0]
+    if len(points) < 3:
+        return {"metric": metric, "slope": None, "ratio": None, "linear": False}
+    versions, values = np.array(points, dtype=float).T
+    slope = float(np.polyfit(np.log(versions), np.log(values), 1)[0])
+    ratio = float(values[-1] / values[0])
+    return {"metric": metric, "slope": slope, "ratio": ratio, "linear": slope >= LINEAR_SLOPE and ratio >= MIN_GROWTH}
+
+
+def growth_report(samples, metrics=("write_s", "details_s", "details_bytes", "by_id_s", "by_id_bytes")):
+    return {metric: growth(samples, metric) for metric in metrics}
@@ -0,0 +1,183 @@
+"""
+Read-heavy mixed workload for the user and machine endpoints
+Closed-loop workers pick operations from a weighted mix of page-load reads (get_details,
+get_machine_details, fetch_material_groups, fetch_parameters) with occasional update_details /
+add_machine writes at a configurable share. Reads that overlap an in-flight write are compared
+with reads that do not, to tell whether writes stall concurrent reads.
+"""
+import random
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+USER_ID = "perf-user-001"
+COMPANY = "CPFL"
+MACHINE_TYPE = "AB100"
+
+USER_DETAILS = {
+    "userId": USER_ID,
+    "username": "Perf User",
+    "email": "perf@example.com",
+    "phone": "+19999999999",
+    "company": COMPANY,
+    "materialType": ["BOPET"],
+    "machine_type": ["PRIMARY01"],
+    "expirationDate": "2025-12-31",
+}
+MACHINE_DETAILS = {
+    "userId": USER_ID,
+    "machineType": MACHINE_TYPE,
+    "machineCategory": "Primary",
+    "maxArms": 10,
+    "minArms": 2,
+    "jumboWidth": 8700,
+    "minTrim": 250,
+    "plant": "AMD",
+    "secondaryMachine": "SEC01",
+    "metallizerMachine": "MET01",
+}
+
+# name: (method, path, query params, JSON body)
+OPERATIONS = {
+    "get_details": ("GET", "/get_details", {"userId": USER_ID}, None),
+    "get_machine_details": ("GET", "/get_machine_details", {"company": COMPANY, "machineType": MACHINE_TYPE}, None),
+    "fetch_material_groups": ("GET", "/api/fetch_material_groups", {"company": COMPANY}, None),
+    "fetch_parameters": ("GET", "/api/fetch_parameters", None, None),
+    "update_details": ("POST", "/update_details", None, USER_DETAILS),
+    "add_machine": ("POST", "/add_machine", None, MACHINE_DETAILS),
+}
+# Relative weights within reads and within writes (every page load reads details and machines)
+READ_MIX = {"get_details": 4, "get_machine_details": 3, "fetch_material_groups": 2, "fetch_parameters": 1}
+WRITE_MIX = {"update_details": 3, "add_machine": 1}
+WRITE_SHARE = 0.05
+WORKLOAD_WORKERS = 8
+WORKLOAD_DURATION_S = 30.0
+WORKLOAD_WRITE_SHARES = (0.0, 0.05, 0.2)
+# Reads overlapping writes count as stalled when their p99 exceeds this multiple of the other reads'
+STALL_RATIO = 2.0
+MIN_STALL_SAMPLES = 20
+
+
+def seed_workload(session, base_url, timeout, headers=None):
+    """Create the user and machine the read mix looks up; returns the two response statuses"""
+    user = session.post(f"{base_url}/update_details", json=USER_DETAILS, headers=headers, timeout=timeout)
+    machine = session.post(f"{base_url}/add_machine", json=MACHINE_DETAILS, headers=headers, timeout=timeout)
+    return user.status_code, machine.status_code
+
+
+def _worker(base_url, timeout, headers, write_share, deadline, rng, records, lock, guard):
+    session = requests.Session()
+    reads, read_weights = list(READ_MIX), list(READ_MIX.values())
+    writes, write_weights = list(WRITE_MIX), list(WRITE_MIX.values())
+    while time.perf_counter() < deadline:
+        write = rng.random() < write_share
+        name = rng.choices(writes, write_weights)[0] if write else rng.choices(reads, read_weights)[0]
+        method, path, params, body = OPERATIONS[name]
+        # Time from the guard's release, so client-side throttling does not read as server latency
+        ticket = guard.wait() if guard else None
+        start = time.perf_counter()
+        try:
+            status = session.request(method, f"{base_url}{path}", params=params, json=body, headers=headers,
+                                     timeout=timeout).status_code
+        except requests.exceptions.RequestException:
+            status = None
+        if guard:
+            guard.done(ticket, status)
+        with lock:
+            records.append((name, write, start, time.perf_counter(), status))
+
+
+def run_workload(base_url, timeout, write_share=WRITE_SHARE, workers=WORKLOAD_WORKERS,
+                 duration_s=WORKLOAD_DURATION_S, headers=None, seed=0, guard=None):
+    """Run the mix with `workers` closed-loop threads (throttled by an optional LoadGuard) for duration_s"""
+    records, lock = [], threading.Lock()
+    deadline = time.perf_counter() + duration_s
+    threads = [
+        threading.Thread(target=_worker, args=(base_url, timeout, headers, write_share, deadline,
+                                               random.Random(seed + index), records, lock, guard))
+        for index in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    frame = pd.DataFrame(records, columns=["operation", "write", "start", "end", "status"])
+    frame["latency_s"] = frame["end"] - frame["start"]
+    return frame
+
+
+def overlaps_writes(frame):
+    """Boolean mask of requests whose interval overlaps any write (other than themselves)"""
+    writes = frame[frame["write"]].sort_values("start")
+    overlap = np.zeros(len(frame), dtype=bool)
+    if writes.empty:
+        return overlap
+    # Merge write intervals, then each request overlaps the last merged interval starting before it ends
+    starts, ends = writes["start"].to_numpy(), np.maximum.accumulate(writes["end"].to_numpy())
+    new_block = np.r_[True, starts[1:] > ends[:-1]]
+    merged_starts, merged_ends = starts[new_block], ends[np.r_[new_block[1:], True]]
+    index = np.searchsorted(merged_starts, frame["end"].to_numpy(), side="left") - 1
+    overlap = (index >= 0) & (merged_ends[np.maximum(index, 0)] > frame["start"].to_numpy())
+    return overlap & ~frame["write"].to_numpy()
+
+
+def _latency_stats(latencies):
+    if not len(latencies):
+        return {"p50_s": None, "p95_s": None, "p99_s": None, "max_s": None}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {"p50_s": float(p50), "p95_s": float(p95), "p99_s": float(p99), "max_s": float(np.max(latencies))}
+
+
+def workload_summary(frame, duration_s):
+    """Per-operation throughput, tail latency and errors, plus an "all reads" / "all writes" row"""
+    groups = [(name, frame[frame["operation"] == name]) for name in OPERATIONS if (frame["operation"] == name).any()]
+    groups += [("all reads", frame[~frame["write"]]), ("all writes", frame[frame["write"]])]
+    return [{
+        "operation": name,
+        "requests": len(rows),
+        "throughput_rps": len(rows) / duration_s,
+        "errors": int((rows["status"] != 200).sum()),
+        **_latency_stats(rows["latency_s"].to_numpy()),
+    } for name, rows in groups]
+
+
+def write_stall(frame, ratio=STALL_RATIO, min_samples=MIN_STALL_SAMPLES):
+    """Compare reads overlapping writes with the rest; stalled when the overlapping p99 is `ratio` times worse"""
+    reads = ~frame["write"].to_numpy()
+    overlap = overlaps_writes(frame)
+    during, clear = frame["latency_s"].to_numpy()[overlap], frame["latency_s"].to_numpy()[reads & ~overlap]
+    result = {"reads_during_writes": len(during), "reads_clear": len(clear),
+              "p99_during_s": None, "p99_clear_s": None, "p99_ratio": None, "stalled": False}
+    if len(during) < min_samples or len(clear) < min_samples:
+        return result
+    result.update(p99_during_s=float(np.percentile(during, 99)), p99_clear_s=float(np.percentile(clear, 99)))
+    result["p99_ratio"] = result["p99_during_s"] / result["p99_clear_s"]
+    result["stalled"] = result["p99_ratio"] >= ratio
+    return result
+
+
+def profile_write_shares(base_url, timeout, write_shares=WORKLOAD_WRITE_SHARES, workers=WORKLOAD_WORKERS,
+                         duration_s=WORKLOAD_DURATION_S, headers=None, seed=0, guard=None):
+    """
+    Seed the user and machine, then run the mix once per write share; returns (summaries, stall checks).
+    Each stall check also carries the read throughput and p99 relative to the first (read-only) share.
+    """
+    seed_workload(requests.Session(), base_url, timeout, headers=headers)
+    summaries, stalls = [], []
+    for write_share in write_shares:
+        frame = run_workload(base_url, timeout, write_share=write_share, workers=workers, duration_s=duration_s,
+                             headers=headers, seed=seed, guard=guard)
+        rows = [dict(row, write_share=write_share) for row in workload_summary(frame, duration_s)]
+        reads = next(row for row in rows if row["operation"] == "all reads")
+        baseline = next((s for s in stalls if s["write_share"] == write_shares[0]), None)
+        stall = dict(write_stall(frame), write_share=write_share, read_rps=reads["throughput_rps"],
+                     read_p99_s=reads["p99_s"], read_p99_vs_baseline=None)
+        if baseline and baseline["read_p99_s"] and reads["p99_s"]:
+            stall["read_p99_vs_baseline"] = reads["p99_s"] / baseline["read_p99_s"]
+        summaries.extend(rows)
+        stalls.append(stall)
+    return summaries, stalls
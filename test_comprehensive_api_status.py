@@ -8,6 +8,11 @@ from requests.exceptions import RequestException, ReadTimeout
 import json
 from io import BytesIO
 
+from perf.download import stream_download
+from perf.bounds import trim_vs_bound
+from perf.plan_validator import validate_optimise_response
+from perf.schedule_verifier import verify_scheduler_response
+
 
 class TestHealthCheckEndpoints:
     """Test health check endpoints"""
@@ -518,7 +523,7 @@ class TestOptimizationEndpoints:
         # Should accept the request (may return 200, 400, or 500 depending on data availability)
         assert response.status_code in [200, 400, 500]
 
-    def test_optimise_metallizer_200_success(self, api_base_url, api_timeout, test_headers, valid_metallizer_optimization_data):
+    def test_optimise_metallizer_200_success(self, api_base_url, api_timeout, test_headers, valid_metallizer_optimization_data, run_report):
         """Test optimise_metallizer returns 200 with valid data and proper output"""
         response = requests.post(
             f"{api_base_url}/api/optimise_metallizer",
@@ -536,9 +541,15 @@ class TestOptimizationEndpoints:
         data = response.json()
         # Verify response contains expected structure
         assert isinstance(data, (dict, list)), f"Response should be dict or list, got {type(data)}"
+        run_report.add("optimise_bound", endpoint="/api/optimise_metallizer", latency_s=response.elapsed.total_seconds(),
+                       **trim_vs_bound(data, valid_metallizer_optimization_data))
+        # Any cutting plan in the response must respect max_width, minimum_trim and MustMake demand
+        validation = validate_optimise_response(data, valid_metallizer_optimization_data)
+        if validation is not None:
+            assert validation["valid"], f"Infeasible cutting plan: {validation['errors']}"
         print(f"✓ optimise_metallizer returned 200 with valid output structure")
 
-    def test_optimise_setting_200_success(self, api_base_url, api_timeout, test_headers, valid_primary_optimization_data):
+    def test_optimise_setting_200_success(self, api_base_url, api_timeout, test_headers, valid_primary_optimization_data, run_report):
         """
         Test optimise_setting returns 200 with valid data and proper output
         Note: If this fails with 'Invalid mapping' or 'str object has no attribute machine_category',
@@ -564,9 +575,15 @@ class TestOptimizationEndpoints:
         assert response.headers.get('Content-Type', '').startswith('application/json')
         data = response.json()
         assert isinstance(data, (dict, list)), f"Response should be dict or list, got {type(data)}"
+        run_report.add("optimise_bound", endpoint="/api/optimise_setting", latency_s=response.elapsed.total_seconds(),
+                       **trim_vs_bound(data, valid_primary_optimization_data))
+        # Any cutting plan in the response must respect max_width, minimum_trim and MustMake demand
+        validation = validate_optimise_response(data, valid_primary_optimization_data)
+        if validation is not None:
+            assert validation["valid"], f"Infeasible cutting plan: {validation['errors']}"
         print(f"✓ optimise_setting returned 200 with valid output structure")
 
-    def test_optimise_wastage_200_success(self, api_base_url, api_timeout, test_headers, valid_primary_optimization_data):
+    def test_optimise_wastage_200_success(self, api_base_url, api_timeout, test_headers, valid_primary_optimization_data, run_report):
         """
         Test optimise_wastage returns 200 with valid data and proper output
         Note: If this fails with 'Invalid mapping' or 'str object has no attribute machine_category',
@@ -587,9 +604,15 @@ class TestOptimizationEndpoints:
         assert response.headers.get('Content-Type', '').startswith('application/json')
         data = response.json()
         assert isinstance(data, (dict, list)), f"Response should be dict or list, got {type(data)}"
+        run_report.add("optimise_bound", endpoint="/api/optimise_wastage", latency_s=response.elapsed.total_seconds(),
+                       **trim_vs_bound(data, valid_primary_optimization_data))
+        # Any cutting plan in the response must respect max_width, minimum_trim and MustMake demand
+        validation = validate_optimise_response(data, valid_primary_optimization_data)
+        if validation is not None:
+            assert validation["valid"], f"Infeasible cutting plan: {validation['errors']}"
         print(f"✓ optimise_wastage returned 200 with valid output structure")
 
-    def test_optimise_hybrid_200_success(self, api_base_url, api_timeout, test_headers, valid_primary_optimization_data):
+    def test_optimise_hybrid_200_success(self, api_base_url, api_timeout, test_headers, valid_primary_optimization_data, run_report):
         """
         Test optimise_hybrid returns 200 with valid data and proper output
         Note: If this fails with 'Invalid mapping' or 'str object has no attribute machine_category',
@@ -610,6 +633,12 @@ class TestOptimizationEndpoints:
         assert response.headers.get('Content-Type', '').startswith('application/json')
         data = response.json()
         assert isinstance(data, (dict, list)), f"Response should be dict or list, got {type(data)}"
+        run_report.add("optimise_bound", endpoint="/api/optimise_hybrid", latency_s=response.elapsed.total_seconds(),
+                       **trim_vs_bound(data, valid_primary_optimization_data))
+        # Any cutting plan in the response must respect max_width, minimum_trim and MustMake demand
+        validation = validate_optimise_response(data, valid_primary_optimization_data)
+        if validation is not None:
+            assert validation["valid"], f"Infeasible cutting plan: {validation['errors']}"
         print(f"✓ optimise_hybrid returned 200 with valid output structure")
 
 
@@ -976,6 +1005,10 @@ class TestSchedulerEndpoints:
         data = response.json()
         assert isinstance(data, dict), f"Response should be dict, got {type(data)}"
         assert "planId" in data or "scheduled_plan" in data or "clientId" in data or "deckle_orders" in data, f"Response missing expected keys. Keys: {list(data.keys())}"
+        # Scheduled entries must not overlap, leave their campaign blocks or exceed block capacity
+        verification = verify_scheduler_response(data, valid_scheduler_data["data"])
+        if verification is not None:
+            assert verification["valid"], f"Invalid schedule: {verification['errors']}"
         print(f"✓ hybrid_scheduler returned 200 with valid output structure")
 
     def test_otif_scheduler_200_success(self, api_base_url, api_timeout, test_headers, valid_scheduler_data):
@@ -995,6 +1028,10 @@ class TestSchedulerEndpoints:
         data = response.json()
         assert isinstance(data, dict), f"Response should be dict, got {type(data)}"
         assert "planId" in data or "scheduled_plan" in data or "clientId" in data or "deckle_orders" in data, f"Response missing expected keys. Keys: {list(data.keys())}"
+        # Scheduled entries must not overlap, leave their campaign blocks or exceed block capacity
+        verification = verify_scheduler_response(data, valid_scheduler_data["data"])
+        if verification is not None:
+            assert verification["valid"], f"Invalid schedule: {verification['errors']}"
         print(f"✓ otif_scheduler returned 200 with valid output structure")
 
     def test_fetch_scheduler_data_400_missing_params(self, api_base_url, api_timeout, test_headers):
@@ -1089,6 +1126,10 @@ class TestSchedulerEndpoints:
         assert isinstance(data, dict), f"Response should be dict, got {type(data)}"
         # Verify response contains expected keys
         assert "planId" in data or "scheduled_plan" in data or "clientId" in data, f"Response missing expected keys. Keys: {list(data.keys())}"
+        # Scheduled entries must not overlap, leave their campaign blocks or exceed block capacity
+        verification = verify_scheduler_response(data, valid_scheduler_data["data"])
+        if verification is not None:
+            assert verification["valid"], f"Invalid schedule: {verification['errors']}"
         print(f"✓ changover_scheduler returned 200 with valid output structure")
 
 
@@ -2579,23 +2620,28 @@ class TestDownloadDeckleOrdersEndpoint:
         )
         assert response.status_code == 400
 
-    def test_download_deckle_orders_200_success(self, api_base_url, api_timeout, test_headers):
+    def test_download_deckle_orders_200_success(self, api_base_url, api_timeout, test_headers, run_report):
         """Test download_deckle_orders returns 200 with valid parameters and dummy values"""
         params = {
             "company": "CPFL",
             "material_group": "BOPP",  # Optional
             "material_code": "MAT001"  # Optional
         }
-        response = requests.get(
+        # Stream the export to a temp file and validate it incrementally instead of reading it into memory
+        result = stream_download(
+            requests.Session(),
             f"{api_base_url}/api/download_deckle_orders",
+            api_timeout,
             params=params,
-            headers=test_headers,
-            timeout=api_timeout
+            headers=test_headers
         )
+        run_report.add("deckle_download", endpoint="/api/download_deckle_orders", params=params, **result)
         # Must return 200 with valid dummy data - if not, there's an issue to debug
-        assert response.status_code == 200, f"Expected 200 but got {response.status_code}. Response: {response.text[:200]}"
+        assert result["status"] == 200, f"Expected 200 but got {result['status']}. Response: {result['error']}"
         # Download endpoint may return JSON or file data
-        print(f"✓ download_deckle_orders returned 200 with valid output structure")
+        assert result["validation"]["error"] is None, f"Malformed {result['format']} export: {result['validation']['error']}"
+        print(f"✓ download_deckle_orders returned 200 with valid {result['format']} output "
+              f"({result['bytes'] / 1e6:.2f} MB, {result['mb_per_s']:.2f} MB/s)")
 
     def test_download_deckle_orders_500_server_error(self, api_base_url, api_timeout, test_headers):
         """Test download_deckle_orders returns 500 on server error"""
@@ -0,0 +1,74 @@
+"""
+Fast lower bounds on jumbo sets and trim % vs bound for optimiser results
+"""
+import time
+
+from perf.bounds import lower_bounds, trim_vs_bound
+from perf.orders import optimiser_payload
+from perf.reference_solver import solve_reference
+
+
+def order(width, rolls, option="MustMake"):
+    return {"Width": width, "Rolls": rolls, "Pend. Prod": rolls * 300, "Option": option}
+
+
+class TestLowerBounds:
+    """Test the material and L2 bounds"""
+
+    def test_material_bound(self):
+        """Test the material bound is total demanded width over the usable jumbo width"""
+        payload = optimiser_payload(0, rows=[order(1000, 17)])
+        bounds = lower_bounds(payload)
+
+        assert bounds["demanded_width"] == 17_000
+        assert bounds["material_bound"] == 3
+        assert bounds["lower_bound"] == 3
+
+    def test_l2_bound_counts_wide_rolls(self):
+        """Test rolls wider than half the usable width need a jumbo each, beating the material bound"""
+        payload = optimiser_payload(0, rows=[order(4300, 10), order(500, 2)])
+        bounds = lower_bounds(payload)
+
+        assert bounds["material_bound"] == 6
+        assert bounds["tight_bound"] == 10
+        assert bounds["lower_bound"] == 10
+        assert bounds["bound_method"] == "material+martello_toth_l2"
+        assert lower_bounds(optimiser_payload(5, machine_category="Metallizer"))["bound_method"] == \
+            "material+slot_count"
+
+    def test_bounds_never_exceed_reference_lp(self):
+        """Test both bounds stay at or below the reference LP bound"""
+        for machine_category in ["Primary", "Secondary", "Metallizer"]:
+            payload = optimiser_payload(10, machine_category=machine_category, seed=5)
+            bounds = lower_bounds(payload)
+            assert bounds["lower_bound"] <= solve_reference(payload)["lower_bound"]
+
+    def test_bound_is_computed_in_milliseconds(self):
+        """Test a 20k-order book is bounded fast enough to attach to every benchmark result"""
+        payload = optimiser_payload(20_000, seed=1)
+        start = time.perf_counter()
+        lower_bounds(payload)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.1, f"Bound took {elapsed * 1000:.0f} ms"
+
+
+class TestTrimVsBound:
+    """Test trim % vs bound for optimise responses"""
+
+    def test_plan_at_bound_has_no_excess_trim(self):
+        """Test a plan using exactly the bound's jumbo sets matches the bound's trim %"""
+        payload = optimiser_payload(0, rows=[order(4200, 4)])
+        response = {"planData": [{"Total width": 8400, "Sets": 2, "Trim": 300, "1": 4200, "2": 4200}]}
+        result = trim_vs_bound(response, payload)
+
+        assert result["plan_sets"] == 2
+        assert abs(result["trim_pct_vs_bound"]) < 1e-9
+
+    def test_response_without_plan_reports_bounds_only(self):
+        """Test results without a plan still carry the request's bounds"""
+        payload = optimiser_payload(0, rows=[order(4200, 4)])
+        result = trim_vs_bound({"message": "queued"}, payload)
+
+        assert result["lower_bound"] == 2
+        assert result["trim_pct_vs_bound"] is None
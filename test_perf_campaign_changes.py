@@ -0,0 +1,112 @@
+"""
+Stress mode for validate_campaign_changes / apply_campaign_changes with a local reference check
+Reference and cross-check mechanics run against the local stand-in; the stress run targets the API
+"""
+import time
+from datetime import date, timedelta
+
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.campaign_changes import (campaign_changes_payload, cross_check, reference_verdicts, server_verdicts,
+                                   stress_campaign_changes)
+
+TODAY = date(2024, 1, 10)
+
+
+def day(offset):
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+def block(line, start, end, material_group="BOPP"):
+    return {"material_group": material_group, "line": line, "start_time": day(start), "end_time": day(end),
+            "capacity": 100}
+
+
+def change(target, modifications, change_type="reschedule"):
+    return {"material_group": target["material_group"], "line": target["line"], "change_type": change_type,
+            "original": {key: target[key] for key in ("start_time", "end_time", "capacity")},
+            "modifications": modifications}
+
+
+class TestReferenceVerdicts:
+    """Test the local freeze-window and overlap reference"""
+
+    def test_freeze_overlap_and_unknown_blocks(self):
+        """Test each verdict on a two-line plan with a 3-day freeze"""
+        plan = [block("Line1", 1, 4), block("Line1", 5, 9), block("Line1", 10, 14), block("Line2", 5, 9)]
+        changes = [
+            change(plan[0], {"capacity": 150}, "capacity_increase"),       # starts inside the freeze
+            change(plan[1], {"end_time": day(11)}, "extend"),              # runs into the next block
+            change(plan[3], {"start_time": day(6), "end_time": day(12)}),  # alone on Line2
+            change(block("Line1", 20, 24), {"capacity": 10}),              # not in the plan
+            change(plan[2], {"start_time": day(2)}),                       # moved into the freeze
+        ]
+        payload = {"current_plan": plan, "changes": changes, "freeze_days": 3}
+
+        assert reference_verdicts(payload, today=TODAY) == ["frozen", "overlap", "ok", "unknown_block", "frozen"]
+
+    def test_swapping_changes_are_checked_against_the_final_plan(self):
+        """Test blocks that trade places in one change set do not count as overlapping"""
+        plan = [block("Line1", 5, 9), block("Line1", 10, 14)]
+        changes = [change(plan[0], {"start_time": day(10), "end_time": day(14)}),
+                   change(plan[1], {"start_time": day(5), "end_time": day(9)})]
+        payload = {"current_plan": plan, "changes": changes, "freeze_days": 3}
+
+        assert reference_verdicts(payload, today=TODAY) == ["ok", "ok"]
+
+    def test_reference_runs_per_sample(self):
+        """Test a 5k-block plan with 1k changes is checked fast enough for every stress sample"""
+        payload = campaign_changes_payload(5000, 1000, seed=1)
+        start = time.perf_counter()
+        verdicts = reference_verdicts(payload)
+        elapsed = time.perf_counter() - start
+
+        assert len(verdicts) == 1000
+        assert elapsed < 0.25, f"Reference took {elapsed * 1000:.0f} ms"
+
+
+class TestServerCrossCheck:
+    """Test server verdict parsing and the stress run against the stand-in"""
+
+    def test_server_verdict_shapes(self):
+        """Test overall and per-change verdicts are read from common response shapes"""
+        data = {"is_valid": False, "details": {"checks": [{"valid": True}, {"valid": False}]}}
+        assert server_verdicts(data, 2) == (False, [True, False])
+        assert server_verdicts({"message": "ok"}, 2) == (None, None)
+        assert cross_check(data, ["ok", "overlap"])["per_change_disagreements"] == []
+        assert cross_check(data, ["ok", "ok"])["overall_agrees"] is False
+
+    def test_stress_run_agrees_with_standin(self, standin_base_url, api_timeout):
+        """Test every sample validates, applies and matches the reference change by change"""
+        results = stress_campaign_changes(requests.Session(), standin_base_url, api_timeout, sizes=(20, 200, 1000))
+
+        for result in results:
+            assert result["validate_status"] == 200 and result["apply_status"] == 200
+            assert result["cross_check"]["overall_agrees"]
+            assert result["cross_check"]["per_change_disagreements"] == []
+        assert results[-1]["changes"] == 200
+        assert results[-1]["rejected_by_reference"] > 0
+
+
+@pytest.mark.benchmark
+class TestCampaignChangesStress:
+    """Stress validate/apply_campaign_changes with large plans against the API"""
+
+    @pytest.mark.slow
+    def test_campaign_changes_latency_vs_plan_size(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test validate/apply latency for 10-5k block plans and agreement with the reference"""
+        try:
+            results = stress_campaign_changes(requests.Session(), api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("campaign_changes_stress", **result)
+            print(f"   {result['blocks']:>5} blocks / {result['changes']:>4} changes: validate "
+                  f"{result['validate_s']:.2f}s ({result['validate_status']}), apply {result['apply_s']:.2f}s "
+                  f"({result['apply_status']}), reference {result['reference_s'] * 1000:.0f} ms")
+
+        disagreements = [r for r in results if r["cross_check"] and r["cross_check"]["overall_agrees"] is False]
+        assert not disagreements, f"Server verdicts disagree with the reference: {[(r['blocks'], r['cross_check']) for r in disagreements]}"
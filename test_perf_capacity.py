@@ -0,0 +1,91 @@
+"""
+Capacity-knee finder: open-loop ramp until the p99 or error SLO breaks, then bisect
+Step statistics and the search run against the local stand-in; the knee per endpoint runs against the API
+"""
+import numpy as np
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.capacity import bootstrap_ci, find_capacity_knee, run_step, step_summary
+from perf.workload import READ_MIX
+
+KNEE_TARGETS = ("health", "get_details", "fetch_plan_data", READ_MIX)
+
+
+class TestStepStatistics:
+    """Test per-step SLO verdicts, confidence intervals and Little's law"""
+
+    def test_bootstrap_interval_brackets_the_estimate(self):
+        """Test the p99 interval of a known sample contains its point estimate"""
+        latencies = np.random.default_rng(1).exponential(0.1, 2000)
+        low, high = bootstrap_ci(latencies, lambda sample: np.percentile(sample, 99))
+
+        assert low <= np.percentile(latencies, 99) <= high
+        assert bootstrap_ci(latencies[:1], np.mean) == (None, None)
+
+    def test_littles_law_and_slo_verdict(self):
+        """Test concurrency is throughput x mean latency and errors or a slow p99 fail the step"""
+        latencies = np.full(100, 0.2)
+        summary = step_summary(50, latencies, np.ones(100, dtype=bool), 2.0, p99_budget_s=0.5)
+
+        assert summary["throughput_rps"] == 50 and summary["concurrency"] == pytest.approx(10)
+        assert summary["passed"]
+        assert not step_summary(50, latencies, np.ones(100, dtype=bool), 2.0, p99_budget_s=0.1)["passed"]
+        errors = np.arange(100) >= 5
+        assert not step_summary(50, latencies, errors, 2.0, p99_budget_s=0.5, max_error_rate=0.01)["passed"]
+
+
+class TestKneeFinderStandIn:
+    """Test the ramp and bisection against the stand-in"""
+
+    def test_open_loop_step_keeps_its_rate(self, standin_base_url, api_timeout):
+        """Test a step sends rate x duration requests, all answered"""
+        latencies, ok, elapsed = run_step(standin_base_url, {"health": 1, "fetch_parameters": 1}, 40, api_timeout,
+                                          duration_s=0.5)
+        assert len(latencies) == 20 and ok.all() and elapsed < 1.5
+
+    def test_knee_is_found_by_ramp_then_bisection(self, standin_base_url, api_timeout):
+        """Test two requests in flight to a ~150 ms endpoint saturate the ramp and bisection narrows the knee"""
+        knee, steps = find_capacity_knee(standin_base_url, "sap_data", api_timeout, start_rps=2, max_rps=64,
+                                         step_duration_s=0.5, bisect_steps=2, p99_budget_s=0.6, max_in_flight=2)
+
+        phases = [step["phase"] for step in steps]
+        assert phases[-2:] == ["bisect", "bisect"] and set(phases[:-2]) == {"ramp"}
+        first_failing = steps[len(phases) - 3]
+        assert not first_failing["passed"]
+        low, high = knee["knee_bracket_rps"]
+        assert knee["saturated"] and knee["sustainable_rps"] == low >= 8
+        assert high - low == first_failing["rate_rps"] / 8
+        assert knee["p99_s"] <= 0.6 and knee["p99_ci_s"][0] <= knee["p99_s"]
+        assert knee["concurrency_ci"][0] <= knee["concurrency"] <= knee["concurrency_ci"][1]
+
+
+@pytest.mark.benchmark
+class TestCapacityKneeBenchmark:
+    """Find the sustainable arrival rate of key endpoints and the page-load mix on the API"""
+
+    @pytest.mark.slow
+    def test_capacity_knee_per_endpoint(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report,
+                                        load_guard):
+        """Test each target sustains some load under the SLO and report its knee"""
+        try:
+            requests.get(f"{api_base_url}/", headers=test_headers, timeout=api_timeout)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        knees = []
+        for target in KNEE_TARGETS:
+            knee, steps = find_capacity_knee(api_base_url, target, api_timeout, headers=test_headers, guard=load_guard)
+            for step in steps:
+                run_report.add("capacity_step", target=knee["target"], **step)
+            run_report.add("capacity_knee", **knee)
+            knees.append(knee)
+            print(f"   {knee['target']}: sustainable {knee['sustainable_rps']} req/s (knee in "
+                  f"{knee['knee_bracket_rps']}), p99 {knee['p99_s']} s CI {knee['p99_ci_s']}, "
+                  f"~{knee['concurrency'] or 0:.1f} in flight")
+
+        if load_guard:
+            run_report.add("load_guard", **load_guard.summary())
+        unsustainable = [knee["target"] for knee in knees if knee["sustainable_rps"] is None]
+        assert not unsustainable, f"Targets break the SLO at the starting rate: {unsustainable}"
@@ -0,0 +1,80 @@
+"""
+Cold-start vs warm-path latency
+Tagging and summaries are checked offline and against a stand-in with cold routes; the split is measured on the API
+"""
+import pytest
+from requests.exceptions import RequestException
+
+from perf.coldstart import CallPhases, cold_warm_summary, measure_cold_start
+from perf.history import append_history
+from perf.standin import create_app, serve
+
+
+class TestCallPhases:
+    """Test the first N calls per endpoint are tagged cold"""
+
+    def test_first_calls_per_endpoint_are_cold(self):
+        """Test counting is per endpoint and switches to warm after cold_calls"""
+        phases = CallPhases(cold_calls=2)
+
+        assert [phases.phase("fetch_plan_data") for _ in range(4)] == ["cold", "cold", "warm", "warm"]
+        assert phases.phase("optimise_setting") == "cold"
+
+    def test_summary_separates_cold_and_warm(self):
+        """Test cold and warm distributions, the cold-start cost, and errors kept out of latencies"""
+        rows = [{"endpoint": "fetch_plan_data", "phase": "cold", "latency_s": 2.0, "status": 200},
+                {"endpoint": "fetch_plan_data", "phase": "cold", "latency_s": 9.0, "status": 504}]
+        rows += [{"endpoint": "fetch_plan_data", "phase": "warm", "latency_s": 0.1, "status": 200}] * 5
+        summary, = cold_warm_summary(rows)
+
+        assert summary["cold_n"] == 1 and summary["cold_p50_s"] == 2.0 and summary["warm_n"] == 5
+        assert summary["cold_cost_s"] == pytest.approx(1.9) and summary["cold_ratio"] == pytest.approx(20)
+        assert summary["cold_errors"] == 1 and summary["warm_errors"] == 0
+
+
+class TestColdStartStandIn:
+    """Test the split against a stand-in whose routes are slow on their first call"""
+
+    def test_cold_start_cost_is_isolated(self, api_timeout):
+        """Test the slow first call lands in the cold distribution and leaves the warm one fast"""
+        with serve(create_app(cold_start_s=0.3)) as base_url:
+            rows = measure_cold_start(base_url, api_timeout, calls=6, phases=CallPhases(cold_calls=1))
+        summaries = {summary["endpoint"]: summary for summary in cold_warm_summary(rows)}
+
+        for summary in summaries.values():
+            assert summary["cold_n"] == 1 and summary["warm_n"] == 5 and summary["warm_errors"] == 0
+            assert summary["cold_cost_s"] > 0.25 and summary["warm_p99_s"] < 0.25
+
+    def test_warmup_phase_takes_the_cold_calls(self, api_timeout):
+        """Test an explicit warm-up absorbs the cold calls so every measured call is warm"""
+        with serve(create_app(cold_start_s=0.3)) as base_url:
+            rows = measure_cold_start(base_url, api_timeout, endpoints=("fetch_plan_data",), calls=4,
+                                      warmup_calls=2, phases=CallPhases(cold_calls=2))
+
+        assert [(row["warmup"], row["phase"]) for row in rows] == [(True, "cold")] * 2 + [(False, "warm")] * 4
+        assert max(row["latency_s"] for row in rows if not row["warmup"]) < 0.25
+
+
+@pytest.mark.benchmark
+class TestColdStartBenchmark:
+    """Measure the cold-start cost of plan fetches and setting optimisation on the API"""
+
+    @pytest.mark.slow
+    def test_cold_and_warm_latency(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report,
+                                   call_phases):
+        """Test warm calls succeed, and record cold and warm distributions and the cold-start cost"""
+        try:
+            rows = measure_cold_start(api_base_url, api_timeout, phases=call_phases, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        summaries = cold_warm_summary(rows)
+        append_history(run_report.run_id, "cold_start", summaries)
+        for summary in summaries:
+            run_report.add("cold_start", **summary)
+            if summary["cold_cost_s"] is not None:
+                print(f"   {summary['endpoint']}: cold p50 {summary['cold_p50_s']:.2f} s vs warm p50 "
+                      f"{summary['warm_p50_s']:.2f} s (cold start costs {summary['cold_cost_s']:.2f} s)")
+
+        failing = [summary["endpoint"] for summary in summaries if summary["warm_errors"]]
+        assert not failing, f"Warm calls fail: {failing}"
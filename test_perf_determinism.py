@@ -0,0 +1,90 @@
+"""
+Determinism and run-to-run variance of the optimisers
+Canonical hashing and summaries are checked offline, repeats against the local stand-in; the benchmark runs against the API
+"""
+import pytest
+from requests.exceptions import RequestException
+
+from perf.determinism import benchmark_determinism, canonical_plan, determinism_summary, plan_hashes, run_repeats
+from perf.orders import optimiser_payload
+from perf.standin import create_app, serve
+
+PLAN = {"planData": [
+    {"Total width": 8400, "Sets": 3, "Trim": 300, "1": 4000, "2": 4400},
+    {"Total width": 8000, "Sets": 1, "Trim": 700, "1": 2000, "2": 3000, "3": 3000},
+]}
+
+
+class TestCanonicalPlans:
+    """Test plan canonicalisation and the determinism summary"""
+
+    def test_reordered_plan_hashes_the_same(self):
+        """Test row and slot order do not change the canonical hash but do change the raw one"""
+        reordered = {"planData": [
+            {"Total width": 8000, "Sets": 1, "Trim": 700, "1": 3000, "2": 2000, "3": 3000},
+            {"Total width": 8400, "Sets": 3, "Trim": 300, "1": 4400, "2": 4000},
+        ]}
+
+        assert canonical_plan(PLAN) == [[[2000.0, 3000.0, 3000.0], 1.0], [[4000.0, 4400.0], 3.0]]
+        assert plan_hashes(PLAN)[0] == plan_hashes(reordered)[0]
+        assert plan_hashes(PLAN)[1] != plan_hashes(reordered)[1]
+        assert plan_hashes({"error": "no plan"})[0] is None
+
+    def test_different_plans_and_latency_spread_are_reported(self):
+        """Test distinct plan hashes mark an algorithm nondeterministic and CV is std over mean"""
+        results = [{"algorithm": "hybrid", "mode": "sequential", "run": run, "status": 200, "latency_s": latency,
+                    "attempts": 1, "plan_hash": plan, "raw_hash": plan}
+                   for run, (latency, plan) in enumerate([(1.0, "a"), (2.0, "a"), (3.0, "b")])]
+        summary, = determinism_summary(results)
+
+        assert summary["distinct_plans"] == 2 and summary["deterministic"] is False
+        assert summary["latency_mean_s"] == 2.0 and summary["latency_cv"] == pytest.approx(0.5)
+
+
+class TestDeterminismStandIn:
+    """Test repeated optimisations against the stand-in"""
+
+    def test_reference_solver_is_deterministic_in_both_modes(self, standin_base_url, api_timeout):
+        """Test sequential and concurrent repeats each return one plan, with licence contention retried"""
+        results, summaries = benchmark_determinism(standin_base_url, api_timeout, algorithms=("setting", "hybrid"),
+                                                   repeats=3, n_orders=20)
+
+        assert len(results) == 12 and all(result["status"] == 200 for result in results)
+        assert [(s["algorithm"], s["mode"]) for s in summaries] == [
+            ("setting", "sequential"), ("setting", "concurrent"), ("hybrid", "sequential"), ("hybrid", "concurrent")]
+        assert all(s["deterministic"] and s["distinct_plans"] == 1 and s["latency_cv"] is not None for s in summaries)
+        assert len({result["plan_hash"] for result in results if result["algorithm"] == "hybrid"}) == 1
+
+    def test_shuffled_output_is_canonically_equal(self, api_timeout):
+        """Test plans returned in random order differ raw but hash to one canonical plan"""
+        with serve(create_app(shuffle_plans=True)) as base_url:
+            results = run_repeats(base_url, "hybrid", optimiser_payload(20), api_timeout, repeats=4)
+        summary, = determinism_summary(results)
+
+        assert summary["distinct_plans"] == 1 and summary["distinct_raw"] > 1
+
+
+@pytest.mark.benchmark
+class TestDeterminismBenchmark:
+    """Repeat one order book on every optimiser, in sequence and concurrently, on the API"""
+
+    @pytest.mark.slow
+    def test_optimiser_determinism_and_variance(self, benchmark_enabled, api_base_url, api_timeout, test_headers,
+                                                run_report):
+        """Test each optimiser returns one plan for one order book, and record the latency CV"""
+        try:
+            results, summaries = benchmark_determinism(api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("determinism_run", **result)
+        for summary in summaries:
+            run_report.add("determinism", **summary)
+            if summary["ok"]:
+                cv = f"{summary['latency_cv']:.2f}" if summary["latency_cv"] is not None else "n/a"
+                print(f"   {summary['algorithm']:<8} {summary['mode']:<10} {summary['distinct_plans']} plan(s) "
+                      f"in {summary['ok']} runs, mean {summary['latency_mean_s']:.2f} s, CV {cv}")
+
+        nondeterministic = [(s["algorithm"], s["mode"]) for s in summaries if s["deterministic"] is False]
+        assert not nondeterministic, f"Same order book, different plans: {nondeterministic}"
@@ -0,0 +1,110 @@
+"""
+Streaming download of /api/download_deckle_orders
+Format detection and incremental validators are checked offline and against the stand-in;
+the size-scaling benchmark runs against the API
+"""
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.download import JsonStreamValidator, benchmark_download_scaling, detect_format, stream_download
+
+
+class TestFormatDetection:
+    """Test export format detection"""
+
+    def test_detect_format(self):
+        """Test xlsx, json and csv bodies are told apart by their first bytes"""
+        assert detect_format(b"PK\x03\x04\x14\x00") == "xlsx"
+        assert detect_format(b'  {"orders": [') == "json"
+        assert detect_format(b"[{") == "json"
+        assert detect_format(b"Sales Orde,SO.Qty\n1,2\n", "text/csv") == "csv"
+        assert detect_format(b"Sales Orde,SO.Qty\n") == "csv"
+        assert detect_format(b"plain text") == "unknown"
+
+
+class TestJsonStreamValidator:
+    """Test the incremental JSON structure validator"""
+
+    def feed_in_chunks(self, body, size):
+        validator = JsonStreamValidator()
+        for start in range(0, len(body), size):
+            validator.feed(body[start:start + size])
+        return validator.finish()
+
+    def test_valid_body_counts_records(self):
+        """Test array elements are counted across arbitrary chunk boundaries"""
+        body = b'{"company": "CPFL", "orders": [{"a": "x\\"]}"}, {"b": [1, 2]}, {"c": {}}]}'
+        for size in (1, 3, 7, len(body)):
+            result = self.feed_in_chunks(body, size)
+            assert result == {"valid": True, "records": 3, "error": None}
+
+    def test_truncated_body_is_invalid(self):
+        """Test a body cut off mid-stream is reported as truncated"""
+        result = self.feed_in_chunks(b'{"orders": [{"a": 1}, {"b"', 4)
+        assert result["valid"] is False
+        assert "Truncated" in result["error"]
+
+    def test_unbalanced_body_is_invalid(self):
+        """Test a mismatched closing bracket is reported with its offset"""
+        result = self.feed_in_chunks(b'{"orders": [1, 2}]', 5)
+        assert result["valid"] is False
+        assert "byte 16" in result["error"]
+
+
+class TestStreamDownloadStandIn:
+    """Test streaming downloads from the stand-in"""
+
+    @pytest.mark.parametrize("body_format", ["json", "csv", "xlsx"])
+    def test_stream_download_formats(self, standin_base_url, api_timeout, body_format):
+        """Test every export format is detected and validated with the exported row count"""
+        result = stream_download(
+            requests.Session(),
+            f"{standin_base_url}/api/download_deckle_orders",
+            api_timeout,
+            params={"company": "CPFL", "format": body_format, "rows": 1500},
+            chunk_size=4096
+        )
+        assert result["status"] == 200
+        assert result["format"] == body_format
+        assert result["validation"] == {"valid": True, "records": 1500, "error": None}
+        assert result["ttfb_s"] <= result["total_s"]
+        assert result["peak_rss_mb"] > 0
+
+    def test_stream_download_error_status(self, standin_base_url, api_timeout):
+        """Test non-200 responses are reported without validation"""
+        result = stream_download(requests.Session(), f"{standin_base_url}/api/download_deckle_orders", api_timeout)
+        assert result["status"] == 400
+        assert result["validation"]["valid"] is None
+        assert "company" in result["error"]
+
+    def test_download_scaling_on_standin(self, standin_base_url, api_timeout):
+        """Test the scaling benchmark visits every filter level, ordered by export size"""
+        results = benchmark_download_scaling(
+            requests.Session(), standin_base_url, api_timeout, "CPFL", ["BOPP"], ["MAT001"]
+        )
+        assert [len(result["params"]) for result in results] == [3, 2, 1]
+        assert all(result["validation"]["valid"] for result in results)
+
+
+@pytest.mark.benchmark
+class TestDownloadDeckleOrdersBenchmark:
+    """Benchmark download_deckle_orders throughput as the export grows"""
+
+    @pytest.mark.slow
+    def test_download_deckle_orders_size_scaling(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test export throughput across company, material group and material code filters"""
+        try:
+            results = benchmark_download_scaling(
+                requests.Session(), api_base_url, api_timeout, "CPFL", ["BOPP", "BOPET"], ["MAT001", "MAT002"]
+            )
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("deckle_download", endpoint="/api/download_deckle_orders", **result)
+            print(f"   {result['params']}: {result['bytes'] / 1e6:.2f} MB {result['format']}, "
+                  f"TTFB {result['ttfb_s'] or 0:.2f}s, {result['mb_per_s']:.2f} MB/s, peak RSS {result['peak_rss_mb']:.0f} MB")
+
+        assert all(result["validation"]["error"] is None for result in results), \
+            f"Malformed exports: {[(r['params'], r['validation']['error']) for r in results if r['validation']['error']]}"
@@ -0,0 +1,86 @@
+"""
+Large Excel order books and streamed uploads for /api/preprocess_excel_data
+Generator and multipart body are checked against the local stand-in; the size benchmark runs against the API
+"""
+import tracemalloc
+
+import pytest
+import requests
+from openpyxl import load_workbook
+from requests.exceptions import RequestException
+
+from perf.excel import MultipartFileStream, benchmark_excel_upload, upload_order_book, write_order_book
+from perf.orders import PLANNER_COLUMNS
+
+
+class TestOrderBookGenerator:
+    """Test the streaming .xlsx order-book generator"""
+
+    def test_order_book_has_sap_layout(self, tmp_path):
+        """Test generated order book has the SAP header and requested row count"""
+        path = write_order_book(tmp_path / "orders.xlsx", 1000)
+
+        workbook = load_workbook(path, read_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        assert list(next(rows)) == PLANNER_COLUMNS
+        assert sum(1 for _ in rows) == 1000
+        workbook.close()
+
+    def test_order_book_memory_is_bounded(self, tmp_path):
+        """Test peak memory does not grow with the number of rows written"""
+        peaks = []
+        for n_rows in (300, 3_000):
+            tracemalloc.start()
+            write_order_book(tmp_path / f"orders_{n_rows}.xlsx", n_rows)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        assert peaks[1] < peaks[0] * 2, f"Peak memory grew with rows: {peaks}"
+
+
+class TestMultipartFileStream:
+    """Test the streamed multipart body"""
+
+    def test_stream_length_matches_body(self, tmp_path):
+        """Test declared Content-Length equals the bytes produced in small reads"""
+        path = write_order_book(tmp_path / "orders.xlsx", 500)
+
+        with MultipartFileStream(path, fields={"company": "CPFL"}) as body:
+            declared = len(body)
+            payload = b"".join(iter(lambda: body.read(1000), b""))
+
+        assert len(payload) == declared
+        assert payload.endswith(f"--{body.boundary}--\r\n".encode())
+        assert b'name="company"\r\n\r\nCPFL\r\n' in payload
+        assert path.read_bytes() in payload
+
+    def test_upload_order_book_to_standin(self, standin_base_url, api_timeout, tmp_path):
+        """Test the stand-in parses the streamed upload back into the generated rows"""
+        path = write_order_book(tmp_path / "orders.xlsx", 2000)
+
+        result = upload_order_book(requests.Session(), standin_base_url, path, 2000, api_timeout)
+
+        assert result["status"] == 200, result["error"]
+        assert result["parsed_rows"] == 2000
+        assert result["rows_per_s"] > 0
+
+
+@pytest.mark.benchmark
+class TestExcelUploadBenchmark:
+    """Benchmark upload + preprocessing time of large order books against the API"""
+
+    @pytest.mark.slow
+    def test_preprocess_excel_data_upload_benchmark(self, benchmark_enabled, api_base_url, api_timeout, run_report):
+        """Test preprocess_excel_data throughput for 1k-200k row order books"""
+        try:
+            results = benchmark_excel_upload(requests.Session(), api_base_url, api_timeout)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("excel_upload", endpoint="/api/preprocess_excel_data", **result)
+            print(f"   {result['rows']:>7} rows, {result['bytes'] / 1e6:.1f} MB: "
+                  f"{result['latency_s']:.2f}s, {result['rows_per_s']:.0f} rows/s ({result['status']})")
+
+        assert all(result["status"] == 200 for result in results), \
+            f"Upload failures: {[(r['rows'], r['status'], r['error']) for r in results if r['status'] != 200]}"
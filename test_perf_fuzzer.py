@@ -0,0 +1,169 @@
+"""
+Latency-guided fuzzing of the optimiser inputs
+Mutations and shrinking are checked offline, a short fuzz run against the local stand-in; the benchmark runs against the API
+"""
+import os
+import random
+
+import pytest
+from requests.exceptions import RequestException
+
+from config import PERF_REPORT_DIR
+from perf.fuzzer import (EXTREME_ROLLS, FUZZ_FIXTURE_DIR, MUTATIONS, fuzz, fuzz_optimiser, lane_latency,
+                         load_reproducers, promote_reproducers, save_reproducer, shrink)
+from perf.orders import optimiser_payload
+
+
+def rolls_latency(payload):
+    """Synthetic measure: latency grows with the largest Rolls count"""
+    return max(order["Rolls"] for order in payload["data"]) / 1000, 200
+
+
+class TestFuzzerMutations:
+    """Test each mutation keeps the order book valid and does what it says"""
+
+    def test_mutations_change_only_the_targeted_fields(self):
+        """Test widths stay within the usable width, quantities follow Rolls and options stay in the two values"""
+        usable = 8700 - 250
+        for seed in range(20):
+            rng = random.Random(seed)
+            for name, mutate in MUTATIONS.items():
+                payload = optimiser_payload(20, seed=seed)
+                mutate(payload, rng)
+                assert len(payload["data"]) == 20, name
+                for order in payload["data"]:
+                    assert 0 < order["Width"] <= usable, name
+                    assert order["Pend. Prod"] == order["    SO.Qty"] == order["Pend. Disp"], name
+                    assert order["Option"] in ("MustMake", "Optional"), name
+
+    def test_targeted_mutations(self):
+        """Test near-usable widths land within 50 mm of the limit and extreme rolls use the extreme counts"""
+        rng = random.Random(0)
+        payload = optimiser_payload(20)
+        MUTATIONS["near_usable_width"](payload, rng)
+        MUTATIONS["extreme_rolls"](payload, rng)
+
+        assert any(8400 <= order["Width"] <= 8450 for order in payload["data"])
+        assert any(order["Rolls"] in EXTREME_ROLLS and order["Pend. Prod"] == order["Rolls"] * 300
+                   for order in payload["data"])
+
+
+class TestFuzzerSearch:
+    """Test the hill climb, shrinking and reproducer files with a synthetic latency"""
+
+    def test_fuzz_keeps_only_slower_mutants(self):
+        """Test kept steps raise the best latency by the margin and the corpus is slowest first"""
+        corpus, steps = fuzz(rolls_latency, optimiser_payload(20), iterations=30, seed=1)
+
+        assert len(steps) == 30 and any(step["kept"] for step in steps)
+        assert all(step["latency_s"] > 0.035 * 1.2 for step in steps if step["kept"])
+        assert [case["latency_s"] for case in corpus] == sorted((case["latency_s"] for case in corpus), reverse=True)
+        assert corpus[0]["latency_s"] >= 2.0 and "extreme_rolls" in corpus[0]["mutations"]
+        assert corpus[-1]["mutations"] == []
+
+    def test_shrink_reduces_to_the_slow_order(self):
+        """Test shrinking leaves the single order that causes the slowdown"""
+        payload = optimiser_payload(25)
+        payload["data"][17]["Rolls"] = 5000
+        reduced = shrink(rolls_latency, {"payload": payload, "latency_s": 5.0, "mutations": ["extreme_rolls"]})
+
+        assert [order["Rolls"] for order in reduced["payload"]["data"]] == [5000]
+        assert reduced["original_orders"] == 25 and reduced["latency_s"] == 5.0
+        assert reduced["payload"]["max_width"] == payload["max_width"]
+
+    def test_reproducers_round_trip(self, tmp_path):
+        """Test a saved reproducer loads back with its slowdown and mutation history"""
+        case = {"payload": optimiser_payload(3), "latency_s": 2.0, "mutations": ["extreme_rolls"]}
+        path = save_reproducer(case, "hybrid", 0.5, directory=str(tmp_path))
+        reproducers = load_reproducers(str(tmp_path))
+
+        assert list(reproducers) == [os.path.basename(path)] and path.endswith(".json")
+        assert reproducers[os.path.basename(path)]["slowdown"] == 4.0
+        assert reproducers[os.path.basename(path)]["payload"] == case["payload"]
+        assert load_reproducers(str(tmp_path / "missing")) == {}
+
+    def test_only_clear_slowdowns_are_promoted_to_fixtures(self, tmp_path):
+        """Test reproducers at least PROMOTE_SLOWDOWN x the baseline are copied into the fixtures, once"""
+        saved = []
+        for rolls, latency_s in ((5000, 3.0), (40, 1.2)):
+            case = {"payload": optimiser_payload(3, seed=rolls), "latency_s": latency_s, "mutations": ["extreme_rolls"]}
+            path = save_reproducer(case, "hybrid", 1.0, directory=str(tmp_path / "run"))
+            saved.append({"path": path, "latency_s": latency_s, "baseline_latency_s": 1.0})
+        fixtures = str(tmp_path / "fixtures")
+
+        slow = os.path.basename(saved[0]["path"])
+        assert promote_reproducers(saved, directory=fixtures) == [os.path.join(fixtures, slow)]
+        assert promote_reproducers(saved, directory=fixtures) == []
+        assert list(load_reproducers(fixtures)) == [slow]
+
+    def test_committed_fixtures_are_replayable(self):
+        """Test every committed reproducer names a known optimiser and carries a request body"""
+        assert os.path.isdir(FUZZ_FIXTURE_DIR)
+        for name, reproducer in load_reproducers().items():
+            assert reproducer["algorithm"] in ("setting", "hybrid", "wastage"), name
+            assert reproducer["payload"]["data"] and reproducer["latency_s"] > 0, name
+
+
+class TestFuzzerStandIn:
+    """Test a short fuzz run against the stand-in"""
+
+    def test_fuzz_run_saves_shrunk_reproducers(self, standin_base_url, api_timeout, tmp_path):
+        """Test mutants go through the solver lane and the worst is saved no larger than the order book"""
+        # The reference solver's latency barely depends on the order book, so keep every mutant
+        steps, saved = fuzz_optimiser(standin_base_url, "hybrid", api_timeout, n_orders=20, iterations=6,
+                                      keep_margin=0.0, worst_cases=1, directory=str(tmp_path))
+
+        assert len(steps) == 6 and all(step["status"] == 200 and step["kept"] for step in steps)
+        assert len(saved) == 1 and saved[0]["orders"] <= saved[0]["original_orders"] == 20
+        assert saved[0]["mutations"] and saved[0]["baseline_latency_s"] > 0
+        assert load_reproducers(str(tmp_path))[os.path.basename(saved[0]["path"])]["algorithm"] == "hybrid"
+
+
+@pytest.mark.benchmark
+class TestFuzzerBenchmark:
+    """Fuzz the optimisers on the API and replay saved reproducers"""
+
+    @pytest.mark.slow
+    def test_fuzz_optimisers(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test fuzzing each optimiser, saving the shrunk worst cases and promoting clear slowdowns to the fixtures"""
+        directory = os.path.join(PERF_REPORT_DIR, f"fuzz-{run_report.run_id}")
+        cases = []
+        try:
+            for algorithm in ("setting", "hybrid", "wastage"):
+                steps, saved = fuzz_optimiser(api_base_url, algorithm, api_timeout, headers=test_headers,
+                                              directory=directory)
+                for step in steps:
+                    run_report.add("fuzz_step", algorithm=algorithm, **step)
+                cases += saved
+                for path in promote_reproducers(saved):
+                    print(f"   Promoted {os.path.basename(path)} to the fuzz fixtures")
+                for case in saved:
+                    run_report.add("fuzz_case", **case)
+                    print(f"   {algorithm:<8} {case['orders']:>3}/{case['original_orders']} orders, "
+                          f"{case['latency_s']:.2f} s vs {case['baseline_latency_s']:.2f} s baseline "
+                          f"({', '.join(case['mutations'])})")
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        assert sorted(load_reproducers(directory)) == sorted({os.path.basename(case["path"]) for case in cases})
+
+    @pytest.mark.slow
+    def test_replay_reproducers(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test the committed (and just promoted) reproducers still answer within the API timeout"""
+        reproducers = load_reproducers()
+        if not reproducers:
+            pytest.skip("No saved fuzz reproducers")
+        timed_out = []
+        try:
+            for name, reproducer in reproducers.items():
+                latency_s, status = lane_latency(api_base_url, reproducer["algorithm"], api_timeout,
+                                                 headers=test_headers)(reproducer["payload"])
+                run_report.add("fuzz_replay", reproducer=name, latency_s=latency_s, status=status,
+                               saved_latency_s=reproducer["latency_s"])
+                print(f"   {name:<40} {latency_s:.2f} s (saved {reproducer['latency_s']:.2f} s)")
+                if status is None:
+                    timed_out.append(name)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        assert not timed_out, f"Reproducers timing out: {timed_out}"
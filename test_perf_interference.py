@@ -0,0 +1,76 @@
+"""
+Cross-endpoint interference matrix
+Background load, probing and the heatmap run against the local stand-in; the full matrix runs against the API
+"""
+import os
+
+import pytest
+from requests.exceptions import RequestException
+
+from config import PERF_REPORT_DIR
+from perf.endpoints import ENDPOINTS, endpoint_request, heavy_endpoints, light_endpoints
+from perf.interference import interference_matrix, measure_interference, plot_interference
+
+
+class TestEndpointRegistry:
+    """Test the shared endpoint registry"""
+
+    def test_registry_splits_heavy_and_light(self):
+        """Test every endpoint is either heavy or light and solver bodies are built fresh"""
+        assert sorted(heavy_endpoints() + light_endpoints()) == sorted(ENDPOINTS)
+        assert {"optimise_hybrid", "download_deckle_orders"} <= set(heavy_endpoints())
+        assert {"health", "fetch_plan_data"} <= set(light_endpoints())
+
+        method, path, params, body = endpoint_request("optimise_hybrid")
+        assert (method, path, params) == ("POST", "/api/optimise_hybrid", None)
+        assert body["data"] and body is not endpoint_request("optimise_hybrid")[3]
+
+
+class TestInterferenceStandIn:
+    """Test the interference run and matrix against the stand-in"""
+
+    def test_matrix_of_background_foreground_shifts(self, standin_base_url, api_timeout, tmp_path):
+        """Test one row per pair, a matrix in registry order, and the heatmap file"""
+        rows = measure_interference(standin_base_url, api_timeout, backgrounds=["sap_data", "optimise_hybrid"],
+                                    foregrounds=["health", "fetch_plan_data"], workers=2, probes=5,
+                                    probe_interval_s=0.05, warmup_s=0.2)
+
+        assert [(r["background"], r["foreground"]) for r in rows] == [
+            (background, foreground) for background in ("sap_data", "optimise_hybrid")
+            for foreground in ("health", "fetch_plan_data")
+        ]
+        assert all(r["idle_errors"] == r["loaded_errors"] == 0 and r["background_rps"] > 0 for r in rows)
+        matrix = interference_matrix(rows)
+        assert list(matrix.index) == ["sap_data", "optimise_hybrid"]
+        assert list(matrix.columns) == ["health", "fetch_plan_data"]
+        assert matrix.loc["optimise_hybrid", "health"] == rows[2]["shift_ratio"]
+        assert os.path.getsize(plot_interference(rows, str(tmp_path / "interference.png"))) > 0
+
+    def test_background_rate_waits_for_a_completed_request(self, standin_base_url, api_timeout):
+        """Test a background slower than the whole probe window still reports a completed request"""
+        row, = measure_interference(standin_base_url, api_timeout, backgrounds=["sap_data"], foregrounds=["health"],
+                                    workers=1, probes=1, probe_interval_s=0.0, warmup_s=0.0)
+
+        assert row["background_rps"] > 0 and row["background_errors"] == 0
+
+
+@pytest.mark.benchmark
+class TestInterferenceBenchmark:
+    """Measure how each heavy endpoint shifts each light endpoint's latency on the API"""
+
+    @pytest.mark.slow
+    def test_cross_endpoint_interference(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test light endpoints keep answering under each heavy endpoint's load and plot the p50 shifts"""
+        try:
+            rows = measure_interference(api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for row in rows:
+            run_report.add("interference", **row)
+        print(interference_matrix(rows).round(2).to_string())
+        path = plot_interference(rows, os.path.join(PERF_REPORT_DIR, f"interference-{run_report.run_id}.png"))
+        print(f"   Interference heatmap written to {path}")
+
+        failing = [(row["background"], row["foreground"]) for row in rows if row["loaded_errors"] > row["idle_errors"]]
+        assert not failing, f"Light endpoints fail under heavy background load: {failing}"
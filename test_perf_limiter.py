@@ -0,0 +1,113 @@
+"""
+Load guard: AIMD concurrency limit and token-bucket rate cap
+The limiter and bucket are checked directly and around the load engines against the local stand-in
+"""
+import threading
+import time
+
+import requests
+
+from perf.capacity import run_step
+from perf.limiter import AIMDLimiter, LoadGuard, TokenBucket
+from perf.workload import run_workload, seed_workload
+
+
+class TestAIMDLimiter:
+    """Test additive increase and multiplicative decrease of the concurrency limit"""
+
+    def test_limit_grows_by_about_one_per_round(self):
+        """Test a round of fast successes raises the limit by one"""
+        limiter = AIMDLimiter(target_latency_s=1.0, initial=4, max_limit=16)
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(time.perf_counter(), 200)
+
+        assert 4.9 < limiter.limit < 5.0 and limiter.in_flight == 0
+
+    def test_limit_halves_once_per_congestion_signal(self):
+        """Test timeouts, 5xx and spikes from one round halve the limit once, not once each"""
+        limiter = AIMDLimiter(target_latency_s=0.5, initial=8)
+        started = time.perf_counter()
+        for _ in range(3):
+            limiter.acquire()
+        limiter.release(started, None)
+        limiter.release(started, 503)
+        limiter.release(started - 1.0, 200)
+
+        assert limiter.limit == 4 and limiter.decreases == 1
+        limiter.acquire()
+        limiter.release(time.perf_counter(), 429)
+        assert limiter.limit == 2 and limiter.decreases == 2
+
+    def test_limit_stays_within_bounds(self):
+        """Test the limit never drops below min_limit nor grows past max_limit"""
+        limiter = AIMDLimiter(target_latency_s=1.0, initial=2, min_limit=1, max_limit=3)
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(time.perf_counter(), 500)
+            time.sleep(0.001)
+        assert limiter.limit == 1
+        for _ in range(50):
+            limiter.acquire()
+            limiter.release(time.perf_counter(), 200)
+        assert limiter.limit == 3
+
+    def test_acquire_blocks_at_the_limit(self):
+        """Test a caller waits while the limit's slots are all in flight"""
+        limiter = AIMDLimiter(initial=1)
+        limiter.acquire()
+        entered = threading.Event()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), entered.set()))
+        thread.start()
+
+        assert not entered.wait(0.1)
+        limiter.release(time.perf_counter(), 200)
+        assert entered.wait(1.0)
+        thread.join()
+
+
+class TestTokenBucket:
+    """Test the hard client-side rate cap"""
+
+    def test_starts_are_spaced_at_the_cap(self):
+        """Test 11 starts at 100/s with a burst of one take at least 0.1 s, from several threads"""
+        bucket = TokenBucket(100)
+        started = time.perf_counter()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.perf_counter() - started >= 0.095
+
+
+class TestLoadGuardStandIn:
+    """Test the guard throttling the load engines against the stand-in"""
+
+    def test_rate_cap_bounds_closed_loop_workers(self, standin_base_url, api_timeout):
+        """Test eight closed-loop workers capped at 20 req/s send about 20 requests in a second"""
+        seed_workload(requests.Session(), standin_base_url, api_timeout)
+        guard = LoadGuard(bucket=TokenBucket(20))
+        frame = run_workload(standin_base_url, api_timeout, write_share=0.0, workers=8, duration_s=1.0, guard=guard)
+
+        # One second at the cap, plus the burst token and the reservations workers held at the deadline
+        assert 15 <= len(frame) <= 20 + 1 + 8 and (frame["status"] == 200).all()
+
+    def test_slow_endpoint_shrinks_the_limit(self, standin_base_url, api_timeout):
+        """Test answers slower than the target cut the limit to its floor"""
+        guard = LoadGuard(limiter=AIMDLimiter(target_latency_s=0.05, initial=8))
+        latencies, ok, _ = run_step(standin_base_url, "sap_data", 20, api_timeout, duration_s=0.5, guard=guard)
+
+        assert ok.all()
+        summary = guard.summary()
+        assert summary["final_limit"] == 1 and summary["decreases"] >= 3 and summary["rate_cap_rps"] is None
+
+    def test_fast_endpoint_grows_the_limit(self, standin_base_url, api_timeout):
+        """Test answers under the target raise the limit"""
+        guard = LoadGuard(limiter=AIMDLimiter(target_latency_s=1.0, initial=2))
+        session = requests.Session()
+        statuses = [guard.request(session, "GET", f"{standin_base_url}/", timeout=api_timeout) for _ in range(20)]
+
+        assert statuses == [200] * 20
+        assert guard.summary()["final_limit"] > 4 and guard.summary()["decreases"] == 0
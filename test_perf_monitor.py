@@ -0,0 +1,120 @@
+"""
+Synthetic monitor: scheduled checks with OpenMetrics output and rolling histograms
+Histograms and the exposition format are checked offline, rounds against the local stand-in; a short run checks the API
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from config import PERF_REPORT_DIR
+from perf.monitor import HISTOGRAMS_FILE, METRICS_FILE, MONITOR_CHECKS, Monitor
+
+
+class TestMonitorMetrics:
+    """Test histogram bookkeeping and the OpenMetrics exposition"""
+
+    def test_openmetrics_histogram_is_cumulative(self, tmp_path):
+        """Test bucket counts accumulate up to +Inf, failures count non-200s and the text ends with EOF"""
+        monitor = Monitor("http://127.0.0.1:9", 1, checks=("health",), directory=str(tmp_path))
+        for latency_s, status in ((0.03, 200), (0.3, 200), (45.0, None)):
+            monitor.record("health", latency_s, status)
+        text = monitor.openmetrics()
+
+        assert 'deckle_check_latency_seconds_bucket{check="health",le="0.05"} 1' in text
+        assert 'deckle_check_latency_seconds_bucket{check="health",le="0.5"} 2' in text
+        assert 'deckle_check_latency_seconds_bucket{check="health",le="+Inf"} 3' in text
+        assert 'deckle_check_latency_seconds_count{check="health"} 3' in text
+        assert 'deckle_check_failures_total{check="health"} 1' in text
+        assert 'deckle_check_up{check="health"} 0' in text
+        assert text.startswith("# TYPE deckle_check_latency_seconds histogram") and text.endswith("# EOF\n")
+
+    def test_rolling_histogram_forgets_old_samples(self, tmp_path):
+        """Test samples older than the rolling window leave the rolling histogram but not the cumulative one"""
+        monitor = Monitor("http://127.0.0.1:9", 1, checks=("health",), rolling_window_s=60, directory=str(tmp_path))
+        monitor.record("health", 2.0, 500, now=1000.0)
+        monitor.record("health", 0.02, 200, now=1100.0)
+        rolling = monitor.rolling_histograms()["health"]
+
+        assert rolling["samples"] == 1 and rolling["errors"] == 0 and rolling["buckets"]["0.05"] == 1
+        assert 'deckle_check_latency_seconds_count{check="health"} 2' in monitor.openmetrics()
+
+    def test_schedule_is_jittered(self):
+        """Test round delays spread across interval +/- jitter"""
+        monitor = Monitor("http://127.0.0.1:9", 1, interval_s=60, jitter=0.2, seed=0)
+        delays = [monitor.next_delay() for _ in range(200)]
+
+        assert 48 <= min(delays) < 52 and 68 < max(delays) <= 72
+
+
+class TestMonitorStandIn:
+    """Test monitor rounds against the stand-in"""
+
+    def test_rounds_write_metrics_for_every_check(self, standin_base_url, api_timeout, tmp_path):
+        """Test two rounds sample every check (the optimisation included) and write both files"""
+        monitor = Monitor(standin_base_url, api_timeout, interval_s=0.1, keepalive_s=0.02, directory=str(tmp_path))
+        monitor.run(rounds=2)
+
+        text = (tmp_path / METRICS_FILE).read_text()
+        for check in MONITOR_CHECKS:
+            assert f'deckle_check_latency_seconds_count{{check="{check}"}} 2' in text
+            assert f'deckle_check_up{{check="{check}"}} 1' in text
+        histograms = json.loads((tmp_path / HISTOGRAMS_FILE).read_text())
+        assert histograms["rounds"] == 2 and histograms["checks"]["optimise_small"]["samples"] == 2
+
+    def test_outage_is_recorded_and_seeding_retried(self, standin_base_url, api_timeout, tmp_path):
+        """Test rounds against a down API write failures instead of exiting, and seeding succeeds once it is back"""
+        monitor = Monitor("http://127.0.0.1:9", api_timeout, interval_s=0.05, keepalive_s=0.02,
+                          directory=str(tmp_path))
+        monitor.run(rounds=2)
+
+        text = (tmp_path / METRICS_FILE).read_text()
+        assert monitor.rounds == 2 and not monitor.seeded
+        for check in MONITOR_CHECKS:
+            assert f'deckle_check_failures_total{{check="{check}"}} 2' in text
+            assert f'deckle_check_up{{check="{check}"}} 0' in text
+
+        monitor.base_url = standin_base_url
+        monitor.run_once()
+        assert monitor.seeded and all(monitor.last[check]["status"] == 200 for check in MONITOR_CHECKS)
+
+    def test_stop_event_ends_the_daemon_between_rounds(self, standin_base_url, api_timeout, tmp_path):
+        """Test a monitor sleeping out a long interval stops promptly when asked"""
+        monitor = Monitor(standin_base_url, api_timeout, checks=("health",), interval_s=60, keepalive_s=0.05,
+                          directory=str(tmp_path))
+        stop = threading.Event()
+        thread = threading.Thread(target=monitor.run, kwargs={"stop": stop})
+        thread.start()
+        time.sleep(0.3)
+        stop.set()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive() and monitor.rounds == 1
+
+
+@pytest.mark.benchmark
+class TestMonitorBenchmark:
+    """Run a few monitor rounds against the API"""
+
+    @pytest.mark.slow
+    def test_monitor_rounds(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test every check answers 200 over three jittered rounds"""
+        monitor = Monitor(api_base_url, api_timeout, interval_s=5, headers=test_headers,
+                          directory=os.path.join(PERF_REPORT_DIR, f"monitor-{run_report.run_id}"))
+        try:
+            requests.get(f"{api_base_url}/", headers=test_headers, timeout=api_timeout)
+            monitor.run(rounds=3)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        histograms = monitor.rolling_histograms()
+        for check, histogram in histograms.items():
+            run_report.add("monitor_check", check=check, **histogram)
+            if histogram["samples"]:
+                print(f"   {check:<30} p50 {histogram['p50_s'] * 1000:.0f} ms, {histogram['errors']} errors")
+        down = [check for check in MONITOR_CHECKS if histograms[check]["errors"]]
+        assert not down, f"Checks failing in the monitor: {down}"
@@ -0,0 +1,93 @@
+"""
+On-time-in-full engine for scheduler responses
+"""
+import requests
+
+from perf.otif import otif_for_response
+from perf.scheduler import run_scheduler, scheduler_payload
+
+
+def order(number, due, start, quantity, line="Line1", material_group="BOPP"):
+    return {"Sales Orde": number, "Req.Del.Dt": due, "material_group": material_group, "line": line,
+            "start_time": f"2024-01-{start}Z", "end_time": f"2024-01-{start}Z", "capacity": quantity}
+
+
+def scheduled(start, end, quantity, number=None, line="Line1", material_group="BOPP"):
+    entry = {"line": line, "material_group": material_group, "start_time": f"2024-01-{start}Z",
+             "end_time": f"2024-01-{end}Z", "quantity": quantity}
+    if number is not None:
+        entry["Sales Orde"] = number
+    return entry
+
+
+REQUEST_DATA = {"summarized_orders": {"BOPP": [
+    order(1, "2024-01-05", "01T00:00:00", 100),
+    order(2, "2024-01-05", "02T00:00:00", 200),
+    order(3, "2024-01-10", "03T00:00:00", 300),
+    order(4, "2024-01-31", "04T00:00:00", 400),
+]}}
+
+
+class TestOtifEngine:
+    """Test OTIF, lateness and fill rate"""
+
+    def test_join_on_order_key(self):
+        """Test on-time, late, short and unscheduled orders are told apart"""
+        schedule = [
+            scheduled("01T00:00:00", "05T23:00:00", 100, number=1),   # on time, in full
+            scheduled("06T00:00:00", "08T00:00:00", 200, number=2),   # ~2 days late
+            scheduled("08T00:00:00", "09T00:00:00", 150, number=3),   # on time, half filled
+        ]
+        result = otif_for_response({"scheduled_plan": schedule}, REQUEST_DATA)
+
+        assert result["orders"] == 4
+        assert result["unscheduled_orders"] == 1
+        assert result["otif_pct"] == 25.0
+        assert result["on_time_pct"] == 50.0
+        assert result["fill_rate_pct"] == 45.0
+        assert result["late_orders"] == 1
+        assert 2.0 < result["lateness_days_max"] < 2.1
+        assert result["lateness_histogram"]["1-3d"] == 1
+
+    def test_rank_join_without_order_key(self):
+        """Test entries without an order key serve orders of their line and group in start order"""
+        schedule = [scheduled("01T00:00:00", "02T00:00:00", 100), scheduled("02T00:00:00", "03T00:00:00", 200),
+                    scheduled("03T00:00:00", "04T00:00:00", 300), scheduled("04T00:00:00", "05T00:00:00", 400)]
+        result = otif_for_response({"scheduled_plan": schedule}, REQUEST_DATA)
+
+        assert result["otif_pct"] == 100.0
+        assert result["fill_rate_pct"] == 100.0
+
+    def test_malformed_rows_are_skipped_and_counted(self):
+        """Test bad timestamps, quantities and missing columns drop their rows instead of raising"""
+        request_data = {"summarized_orders": {"BOPP": REQUEST_DATA["summarized_orders"]["BOPP"] + [
+            order(5, "not a date", "05T00:00:00", 50), order(6, "2024-01-31", "06T00:00:00", "n/a"),
+        ]}}
+        schedule = [
+            scheduled("01T00:00:00", "05T23:00:00", 100, number=1),
+            scheduled("02T00:00:00", "99T00:00:00", 200, number=2),
+            {"Sales Orde": 3, "start_time": "2024-01-08T00:00:00Z", "quantity": 300},
+            {"Sales Orde": 4, "material_group": None, "start_time": "2024-01-20T00:00:00Z",
+             "end_time": "2024-01-21T00:00:00Z", "quantity": 400},
+        ]
+        result = otif_for_response({"scheduled_plan": schedule}, request_data)
+
+        assert result["dropped_scheduled_rows"] == 2 and result["dropped_orders"] == 2
+        assert result["orders"] == 4 and result["unscheduled_orders"] == 2
+        assert result["otif_pct"] == 50.0
+
+    def test_orders_without_due_dates(self):
+        """Test requests without Req.Del.Dt (like valid_scheduler_data) report no OTIF"""
+        request_data = {"summarized_orders": {"BOPP": [{"line": "Line1", "material_group": "BOPP",
+                                                         "start_time": "2024-01-01T00:00:00Z", "capacity": 10}]}}
+        assert otif_for_response({"scheduled_plan": [scheduled("01T00:00:00", "02T00:00:00", 10)]}, request_data) is None
+
+    def test_scheduler_results_carry_service_level(self, standin_base_url, api_timeout):
+        """Test scheduler runs report OTIF next to latency"""
+        payload = scheduler_payload(lines=2, blocks_per_line=2, material_groups=2, orders_per_group=15)
+        result = run_scheduler(requests.Session(), standin_base_url, "otif", payload, api_timeout)
+
+        assert result["latency_s"] > 0
+        assert result["service"]["orders"] == 30
+        assert result["service"]["unscheduled_orders"] == 0
+        assert 0 <= result["service"]["otif_pct"] <= 100
@@ -0,0 +1,110 @@
+"""
+Setting vs wastage vs hybrid on identical order books, with a runtime vs trim-loss Pareto frontier
+Comparison mechanics run against the local stand-in; the algorithm comparison runs against the API
+"""
+import os
+import threading
+
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from config import PERF_REPORT_DIR
+from perf.orders import optimiser_payload
+from perf.pareto import compare_algorithms, default_algorithm, distinct_patterns, pareto_frontier, plot_pareto
+from perf.plan_validator import plan_to_arrays
+from perf.solver_lane import post_in_lane
+
+
+def point(algorithm, latency_s, trim_loss_pct, orders=10):
+    return {"algorithm": algorithm, "orders": orders, "latency_s": latency_s,
+            "trim_loss_pct": trim_loss_pct, "settings": 3}
+
+
+class TestParetoFrontier:
+    """Test frontier and default-algorithm selection"""
+
+    def test_dominated_results_are_dropped(self):
+        """Test a slower result with more trim loss is not on the frontier"""
+        results = [point("setting", 1.0, 5.0), point("hybrid", 2.0, 6.0), point("wastage", 3.0, 3.0),
+                   point("failed", None, None)]
+        frontier = pareto_frontier(results)
+
+        assert [r["algorithm"] for r in frontier] == ["setting", "wastage"]
+
+    def test_default_algorithm_respects_time_budget(self):
+        """Test the lowest-trim algorithm within the budget is chosen per size"""
+        results = [point("setting", 1.0, 5.0), point("wastage", 30.0, 3.0),
+                   point("setting", 2.0, 4.0, orders=50), point("hybrid", 5.0, 3.5, orders=50)]
+
+        assert default_algorithm(results, budget_s=10) == {10: "setting", 50: "hybrid"}
+        assert default_algorithm(results, budget_s=60) == {10: "wastage", 50: "hybrid"}
+
+    def test_settings_count_distinct_patterns(self):
+        """Test rows repeating a pattern in another slot order, or cut zero times, are not extra settings"""
+        plan = [{"Sets": 4, "1": 4000, "2": 4450}, {"Sets": 2, "1": 4450, "2": 4000},
+                {"Sets": 1, "1": 4000, "2": 4000, "3": ""}, {"Sets": 0, "1": 3000}]
+
+        assert distinct_patterns(plan_to_arrays(plan)) == 2
+        assert distinct_patterns(plan_to_arrays([{"Sets": 0, "1": 3000}])) == 0
+
+
+class TestAlgorithmComparisonStandIn:
+    """Test the comparison mode against the stand-in optimisers"""
+
+    def test_identical_order_book_per_size(self, standin_base_url, api_timeout, tmp_path):
+        """Test every algorithm answers each size, is scored against the LP bound and the frontier is plotted"""
+        results = compare_algorithms(requests.Session(), standin_base_url, api_timeout, sizes=(5, 15))
+
+        assert [(r["orders"], r["algorithm"]) for r in results] == [
+            (5, "setting"), (5, "wastage"), (5, "hybrid"), (15, "setting"), (15, "wastage"), (15, "hybrid")
+        ]
+        assert all(r["status"] == 200 and r["feasible"] for r in results), results
+        assert all(r["optimality_gap"] >= 0 and r["jumbo_sets"] >= r["lower_bound"] > 0 for r in results), results
+        for n_orders in (5, 15):
+            assert any(r["pareto"] for r in results if r["orders"] == n_orders)
+        assert os.path.getsize(plot_pareto(results, str(tmp_path / "pareto.png"))) > 0
+
+    def test_solver_lane_serialises_concurrent_calls(self, standin_base_url, api_timeout):
+        """Test concurrent optimiser calls queue in the lane instead of hitting the licence limit"""
+        payload = optimiser_payload(20, seed=2)
+        results = []
+
+        def call():
+            results.append(post_in_lane(requests.Session(), f"{standin_base_url}/api/optimise_wastage",
+                                        payload, api_timeout, backoff_s=0))
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [r["response"].status_code for r in results] == [200] * 4
+        assert all(r["attempts"] == 1 for r in results)
+        assert max(r["queue_s"] for r in results) > 0
+
+
+@pytest.mark.benchmark
+class TestAlgorithmComparisonBenchmark:
+    """Compare the three optimisers on identical order books against the API"""
+
+    @pytest.mark.slow
+    def test_setting_wastage_hybrid_pareto(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test runtime vs trim loss of optimise_setting/wastage/hybrid per order-book size"""
+        try:
+            results = compare_algorithms(requests.Session(), api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("algorithm_comparison", **result)
+            print(f"   {result['orders']:>4} orders {result['algorithm']:<8} {result['status']}: "
+                  f"{result['latency_s'] or 0:.2f}s, {result['settings']} settings, "
+                  f"trim {result['trim_loss_pct']} %, gap {result['optimality_gap']}"
+                  f"{' (pareto)' if result['pareto'] else ''}")
+        path = plot_pareto(results, os.path.join(PERF_REPORT_DIR, f"pareto-{run_report.run_id}.png"))
+        print(f"   Pareto plot written to {path}")
+
+        assert any(result["status"] == 200 for result in results), \
+            f"No optimiser succeeded: {[(r['algorithm'], r['status'], r['error']) for r in results]}"
@@ -0,0 +1,80 @@
+"""
+Batched material-code lookup for fetch_plans_by_material_code
+Batching and caching run against the local stand-in; the sequential vs batched benchmark runs against the API
+"""
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.plan_lookup import PlanLookup, benchmark_lookup, order_book_codes
+
+
+class TestPlanLookup:
+    """Test the batched lookup and its in-run cache against the stand-in"""
+
+    def test_order_book_codes_repeat(self):
+        """Test an order book repeats codes from a smaller distinct pool"""
+        codes = order_book_codes(1000)
+        assert len(codes) == 1000 and len(set(codes)) == 700
+
+    def test_lookup_fetches_each_distinct_code_once(self, standin_base_url, api_timeout):
+        """Test duplicates and a repeated batch are served from the cache"""
+        lookup = PlanLookup(standin_base_url, api_timeout, workers=4)
+        plans = lookup.lookup(["MAT1", "MAT2", "MAT1", "MAT3"])
+
+        assert list(plans) == ["MAT1", "MAT2", "MAT3"]
+        assert all(result["status"] == 200 and isinstance(result["available_plans"], list) for result in plans.values())
+        assert lookup.calls == 3 and lookup.hits == 1
+
+        assert lookup.lookup(["MAT3", "MAT4"])["MAT3"] is plans["MAT3"]
+        assert lookup.calls == 4 and lookup.hits == 2
+
+    def test_failed_lookups_are_not_cached(self, standin_base_url, api_timeout):
+        """Test a rejected lookup is returned and retried on the next batch"""
+        lookup = PlanLookup(standin_base_url, api_timeout, plant="")
+
+        assert lookup.lookup(["MAT1"])["MAT1"]["status"] == 400
+        lookup.lookup(["MAT1"])
+        assert lookup.calls == 2 and not lookup.cache
+
+    def test_unreachable_api_counts_as_failed_lookups(self, api_timeout):
+        """Test refused connections come back as status None failures instead of aborting the batch"""
+        lookup = PlanLookup("http://127.0.0.1:9", api_timeout, workers=2)
+        plans = lookup.lookup(["MAT1", "MAT2"])
+
+        assert [result["status"] for result in plans.values()] == [None, None]
+        assert all(result["available_plans"] is None for result in plans.values()) and not lookup.cache
+        results = benchmark_lookup("http://127.0.0.1:9", api_timeout, sizes=(10,))
+        assert results[0]["failed_codes"] == results[0]["distinct_codes"] == 7
+
+    def test_batched_lookup_matches_sequential(self, standin_base_url, api_timeout):
+        """Test the batched mapping equals per-code calls and is faster"""
+        results = benchmark_lookup(standin_base_url, api_timeout, sizes=(10, 100))
+
+        assert [r["codes"] for r in results] == [10, 100]
+        assert all(r["mismatched_codes"] == 0 and r["failed_codes"] == 0 for r in results)
+        assert results[-1]["calls_saved"] == 30 and results[-1]["speedup"] > 2
+
+
+@pytest.mark.benchmark
+class TestPlanLookupBenchmark:
+    """Benchmark per-code sequential lookups against the batched path on the API"""
+
+    @pytest.mark.slow
+    def test_batched_vs_sequential_lookup(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test batched lookup latency against per-code calls for 10, 100 and 1,000 codes"""
+        try:
+            requests.get(f"{api_base_url}/", headers=test_headers, timeout=api_timeout)
+            results = benchmark_lookup(api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("plan_lookup", endpoint="/api/fetch_plans_by_material_code", **result)
+            print(f"   {result['codes']:>5} codes ({result['distinct_codes']} distinct): sequential "
+                  f"{result['sequential_s']:.2f}s (p50 {result['per_code_p50_s'] * 1000:.0f} ms/code), batched "
+                  f"{result['batched_s']:.2f}s, warm {result['warm_s'] * 1000:.1f} ms, "
+                  f"speed-up {result['speedup']:.1f}x, {result['failed_codes']} failed")
+
+        mismatched = [r for r in results if r["mismatched_codes"]]
+        assert not mismatched, f"Batched lookups disagree with per-code calls: {mismatched}"
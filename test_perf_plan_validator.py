@@ -0,0 +1,115 @@
+"""
+Vectorised feasibility validator for optimiser cutting plans
+"""
+import time
+
+import numpy as np
+
+from perf.orders import optimiser_payload
+from perf.plan_validator import find_plan_rows, plan_to_arrays, validate_optimise_response, validate_plan
+
+
+def order(width, rolls, option="MustMake"):
+    return {"Width": width, "Rolls": rolls, "Pend. Prod": rolls * 300, "Option": option}
+
+
+class TestPlanValidator:
+    """Test cutting-plan feasibility checks"""
+
+    def test_feasible_plan_is_valid(self):
+        """Test a plan within width and trim limits that covers MustMake demand passes"""
+        plan = [
+            {"Total width": 8450, "Sets": 4, "Trim": 250, "1": 4000, "2": 4450},
+            {"Total width": 8000, "Sets": 2, "Trim": 700, "1": 4000, "2": 4000},
+        ]
+        result = validate_plan(plan_to_arrays(plan), 8700, 250, orders=[order(4000, 8), order(4450, 4, "Optional")])
+
+        assert result["valid"], result["errors"]
+        assert result["jumbo_sets"] == 6
+        assert result["produced_rolls"] == 12
+        assert result["pend_prod_fill_pct"] == 100.0
+
+    def test_width_and_trim_violations(self):
+        """Test patterns wider than max_width or short of minimum_trim are reported"""
+        plan = [
+            {"Sets": 1, "1": 4500, "2": 4500},
+            {"Sets": 1, "1": 4300, "2": 4300},
+            {"Sets": 1, "1": 4000, "2": 4000},
+        ]
+        result = validate_plan(plan_to_arrays(plan), 8700, 250)
+
+        assert not result["valid"]
+        assert result["width_violations"] == 1
+        assert result["trim_violations"] == 2
+
+    def test_reported_trim_and_total_width_are_checked(self):
+        """Test a reported Trim under minimum_trim and a Total width over max_width or unlike the slots fail"""
+        plan = [
+            {"Total width": 8000, "Sets": 1, "Trim": 700, "1": 4000, "2": 4000},
+            {"Total width": 8000, "Sets": 1, "Trim": 100, "1": 4000, "2": 4000},
+            {"Total width": 8800, "Sets": 1, "Trim": 700, "1": 4000, "2": 4000},
+            {"Total width": 7000, "Sets": 1, "Trim": 700, "1": 4000, "2": 4000},
+            {"Sets": 1, "1": 4000, "2": 4000},
+        ]
+        result = validate_plan(plan_to_arrays(plan), 8700, 250)
+
+        assert not result["valid"]
+        assert result["width_violations"] == 0 and result["trim_violations"] == 0
+        assert result["reported_trim_violations"] == 1
+        assert result["total_width_violations"] == 2
+        assert validate_plan(plan_to_arrays([plan[0], plan[4]]), 8700, 250)["valid"]
+
+    def test_mustmake_shortfall_and_unknown_widths(self):
+        """Test under-produced MustMake widths fail while Optional shortfalls and unknown slots are only reported"""
+        plan = [{"Sets": 3, "1": 1000, "2": 1200, "3": 999}]
+        orders = [order(1000, 5), order(1200, 10, "Optional"), order(1500, 2, "Optional")]
+        result = validate_plan(plan_to_arrays(plan), 8700, 250, orders=orders)
+
+        assert result["shortfall_widths"] == [1000.0]
+        assert result["unknown_widths"] == [999.0]
+        assert len(result["errors"]) == 1
+
+    def test_plan_cells_that_are_missing_or_not_numbers_read_as_zero(self):
+        """Test ragged rows, None, blank and text cells convert like empty slots; unreported Trim/Total width are NaN"""
+        plan = [{"Sets": "2", "1": 4000, "2": "4000", "Trim": None},
+                {"Sets": 1, "1": 3000, "3": "", "4": "n/a", "Total width": 3000}]
+        arrays = plan_to_arrays(plan)
+
+        assert arrays["widths"].tolist() == [[4000, 4000, 0, 0], [3000, 0, 0, 0]]
+        assert arrays["sets"].tolist() == [2, 1]
+        assert np.isnan(arrays["trim"]).all()
+        assert np.isnan(arrays["total_width"][0]) and arrays["total_width"][1] == 3000
+
+    def test_find_plan_rows_in_nested_response(self):
+        """Test the plan is found wherever the optimiser nests it"""
+        plan = [{"Total width": 8700, "Sets": 10, "Trim": 250, "1": 4000}]
+        assert find_plan_rows({"result": {"metric": [1, 2], "planData": plan}}) is plan
+        assert find_plan_rows({"message": "no plan"}) is None
+
+    def test_validate_optimise_response_uses_request_limits(self):
+        """Test responses are validated against the request's max_width and order book"""
+        payload = optimiser_payload(0, rows=[order(4000, 2)])
+        response = {"planData": [{"Sets": 1, "1": 4000, "2": 4000}]}
+        assert validate_optimise_response(response, payload)["valid"]
+        assert validate_optimise_response({"planData": []}, payload) is None
+
+    def test_validates_100k_patterns_in_milliseconds(self):
+        """Test validating a 100k-pattern response, row conversion included, stays fast enough for every benchmark"""
+        rng = np.random.default_rng(0)
+        demand_widths = np.arange(600, 1300, 10)
+        widths = rng.choice(demand_widths, size=(100_000, 6)).tolist()
+        sets = rng.integers(1, 20, size=100_000).tolist()
+        response = {"planData": [
+            {"Total width": sum(slots), "Sets": count, "Trim": 8700 - sum(slots),
+             **{str(slot + 1): width for slot, width in enumerate(slots)}}
+            for slots, count in zip(widths, sets)
+        ]}
+        payload = optimiser_payload(0, rows=[order(width, 10) for width in demand_widths])
+
+        start = time.perf_counter()
+        result = validate_optimise_response(response, payload)
+        elapsed = time.perf_counter() - start
+
+        assert result["patterns"] == 100_000
+        assert result["width_violations"] == 0 and result["total_width_violations"] == 0
+        assert elapsed < 0.25, f"Validation took {elapsed * 1000:.0f} ms"
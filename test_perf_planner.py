@@ -0,0 +1,77 @@
+"""
+Monthly planner inputs and the planner size benchmark
+Generators and benchmark mechanics run against the local stand-in; the size benchmark runs against the API
+"""
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.orders import PLANNER_COLUMNS, material_groups
+from perf.planner import PLANNERS, benchmark_planners, planner_payload, sales_forecast_payload
+
+
+class TestPlannerInputs:
+    """Test SAP row and sales forecast generators"""
+
+    def test_planner_payload_has_sap_rows_over_many_groups(self):
+        """Test thousands of rows carry every SAP column and spread over the requested groups"""
+        payload = planner_payload(3000, month_year="2024-03", groups=15)
+
+        assert payload["monthYear"] == "2024-03"
+        assert len(payload["data"]) == 3000
+        assert all(list(row) == PLANNER_COLUMNS for row in payload["data"][:50])
+        assert {row["New Mat.Grp."] for row in payload["data"]} == set(material_groups(15))
+        assert all(row["Req.Del.Dt"].startswith("2024-03-") for row in payload["data"])
+
+    def test_sales_forecast_matches_rows(self):
+        """Test the forecast has one entry per group and adds up to the rows' pending production"""
+        rows = planner_payload(2000, groups=20)["data"]
+        forecast = sales_forecast_payload(rows, "2024-01")
+
+        assert len(forecast["forecast"]) == 20
+        total = sum(group["exportQty"] + group["domesticQty"] for group in forecast["forecast"])
+        assert total == pytest.approx(sum(row["Pend. Prod"] for row in rows), rel=1e-6)
+        exported = sum(row["Pend. Prod"] for row in rows if row["SO.Type"] == "ZEXP")
+        assert sum(group["exportQty"] for group in forecast["forecast"]) == pytest.approx(exported, rel=1e-6)
+
+    def test_material_group_names_extend_past_known_groups(self):
+        """Test group names stay unique beyond the named film grades"""
+        names = material_groups(30)
+        assert names[:5] == ["MET", "NTT-HS", "NTT-W", "BOPP", "BOPET"]
+        assert len(set(names)) == 30
+
+
+class TestPlannerBenchmarkStandIn:
+    """Test the planner benchmark against the stand-in planners"""
+
+    def test_every_planner_runs_per_size(self, standin_base_url, api_timeout):
+        """Test the forecast is saved and all planners return a campaign plan per size"""
+        results = benchmark_planners(requests.Session(), standin_base_url, api_timeout, sizes=(50, 500), groups=8)
+
+        assert [(r["rows"], r["planner"]) for r in results] == [
+            (size, planner) for size in (50, 500) for planner in PLANNERS
+        ]
+        assert all(r["forecast_status"] == 200 and r["status"] == 200 for r in results), results
+        assert all(r["campaign_plan_size"] > 0 for r in results)
+
+
+@pytest.mark.benchmark
+class TestPlannerBenchmark:
+    """Benchmark changover, OTIF and hybrid planners across input sizes against the API"""
+
+    @pytest.mark.slow
+    def test_planner_latency_and_plan_size(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test planner latency and campaign-plan size for 100-5k SAP rows over 12 material groups"""
+        try:
+            results = benchmark_planners(requests.Session(), api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("planner_benchmark", endpoint=PLANNERS[result["planner"]][1], **result)
+            print(f"   {result['planner']:<9} {result['rows']:>5} rows: {result['status']} in "
+                  f"{result['latency_s'] or 0:.2f}s, campaign plan {result['campaign_plan_size']} entries, "
+                  f"{result['response_bytes'] / 1e3:.1f} kB")
+
+        assert any(result["status"] == 200 for result in results), \
+            f"No planner succeeded: {[(r['planner'], r['rows'], r['status'], r['error']) for r in results]}"
@@ -0,0 +1,86 @@
+"""
+Reference cutting-stock solver and optimality-gap scoring of optimiser plans
+"""
+import pytest
+
+from perf.orders import optimiser_payload
+from perf.plan_validator import plan_to_arrays, validate_plan
+from perf.reference_solver import score_plan, solve_reference
+
+
+def order(width, rolls, option="MustMake"):
+    return {"Width": width, "Rolls": rolls, "Pend. Prod": rolls * 300, "Option": option}
+
+
+class TestReferenceSolver:
+    """Test the column-generation reference solver"""
+
+    def test_lp_bound_of_known_instance(self):
+        """Test two 4200 rolls fit a 8450 usable width, so 5 rolls need 2.5 -> 3 sets"""
+        payload = optimiser_payload(0, rows=[order(4200, 5)])
+        result = solve_reference(payload)
+
+        assert result["lp_bound"] == pytest.approx(2.5)
+        assert result["lower_bound"] == 3
+        assert result["jumbo_sets"] == 3
+
+    def test_bound_never_exceeds_plan(self):
+        """Test the LP bound is below the integer plan, which is itself feasible"""
+        for seed in range(3):
+            payload = optimiser_payload(15, seed=seed)
+            result = solve_reference(payload)
+
+            assert result["lower_bound"] <= result["jumbo_sets"]
+            validation = validate_plan(plan_to_arrays(result["plan"]), payload["max_width"],
+                                       payload["minimum_trim"], orders=payload["data"])
+            assert validation["valid"], validation["errors"]
+            assert validation["produced_rolls"] >= validation["demanded_rolls"]
+
+    @pytest.mark.parametrize("machine_category", ["Secondary", "Metallizer"])
+    def test_slots_respect_width_range(self, machine_category):
+        """Test merged slots of ranged machines lie within min/max_width_range"""
+        payload = optimiser_payload(6, machine_category=machine_category, seed=3)
+        result = solve_reference(payload)
+
+        slots = [width for row in result["plan"] for key, width in row.items() if key.isdigit()]
+        assert slots
+        assert all(payload["min_width_range"] <= width <= payload["max_width_range"] for width in slots)
+        assert all(row["Trim"] >= payload["minimum_trim"] for row in result["plan"])
+        assert result["lower_bound"] <= result["jumbo_sets"]
+
+    def test_uncuttable_width_is_rejected(self):
+        """Test an order wider than the usable jumbo width is reported"""
+        payload = optimiser_payload(0, rows=[order(8600, 1), order(1000, 1)])
+        with pytest.raises(ValueError, match="8600"):
+            solve_reference(payload)
+
+
+class TestPlanScoring:
+    """Test optimality-gap scoring of backend plans"""
+
+    def test_reference_plan_scores_zero_gap(self):
+        """Test the reference's own plan on a tight instance has no gap"""
+        payload = optimiser_payload(0, rows=[order(4200, 4)])
+        plan = solve_reference(payload)["plan"]
+
+        score = score_plan({"planData": plan}, payload, latency_s=2.0)
+        assert score["optimality_gap"] == 0
+        assert score["quality_per_second"] == pytest.approx(0.5)
+
+    def test_wasteful_plan_has_positive_gap(self):
+        """Test a plan cutting one roll per set is scored against the bound"""
+        payload = optimiser_payload(0, rows=[order(4200, 4)])
+        plan = [{"Total width": 4200, "Sets": 4, "Trim": 4500, "1": 4200}]
+
+        score = score_plan({"planData": plan}, payload, latency_s=1.0)
+        assert score["lower_bound"] == 2
+        assert score["optimality_gap"] == pytest.approx(1.0)
+
+    def test_optional_rolls_count_only_when_made(self):
+        """Test unmade Optional orders do not inflate the bound the plan is held to"""
+        payload = optimiser_payload(0, rows=[order(4200, 2), order(1000, 50, "Optional")])
+        plan = [{"Total width": 8400, "Sets": 1, "Trim": 300, "1": 4200, "2": 4200}]
+
+        score = score_plan({"planData": plan}, payload, latency_s=1.0)
+        assert score["lower_bound"] == 1
+        assert score["optimality_gap"] == 0
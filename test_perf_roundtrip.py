@@ -0,0 +1,98 @@
+"""
+Save/fetch round trips for campaign plans and sales forecasts
+Round-trip and staleness mechanics run against the local stand-in; the size sweep runs against the API
+"""
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.report import RunReport
+from perf.roundtrip import ROUNDTRIPS, is_fresh, round_trip, sales_forecast_request, sweep_round_trips
+from perf.standin import create_app, serve
+
+
+class TestRoundTripPayloads:
+    """Test round-trip payloads and the freshness check"""
+
+    def test_forecast_request_has_one_row_per_group(self):
+        """Test thousands of forecast groups stay unique"""
+        body = sales_forecast_request(5000, "2024-02", "SLV")
+
+        assert (body["month"], body["plant"]) == ("2024-02", "SLV")
+        assert len({row["group"] for row in body["forecast"]}) == 5000
+
+    def test_freshness_compares_count_and_edge_rows(self):
+        """Test a read is fresh only when it returns the written rows"""
+        written = sales_forecast_request(50, "2024-01", "AMD", seed=1)["forecast"]
+        older = sales_forecast_request(50, "2024-01", "AMD", seed=2)["forecast"]
+
+        assert is_fresh({"data": {"forecast": written}}, written)
+        assert not is_fresh({"forecast": older}, written)
+        assert not is_fresh({"forecast": written[:-1]}, written)
+        assert not is_fresh({"error": "Sales forecast not found"}, written)
+
+
+class TestRoundTripStandIn:
+    """Test round trips against the stand-in, with and without a lagging read path"""
+
+    def test_concurrent_sweep_reads_back_every_write(self, standin_base_url, api_timeout):
+        """Test every month/plant round trip is fresh on the first read"""
+        results, summaries = sweep_round_trips(standin_base_url, api_timeout, sizes=(10, 1000),
+                                               months=("2024-05", "2024-06"))
+
+        assert len(results) == len(ROUNDTRIPS) * 2 * 4
+        assert all(r["write_status"] == r["read_status"] == 200 and r["fresh"] for r in results), results
+        assert [(s["payload_kind"], s["rows"], s["targets"]) for s in summaries] == [
+            (kind, size, 4) for kind in ROUNDTRIPS for size in (10, 1000)
+        ]
+        assert all(s["read_mb_per_s"] > 0 and s["stale"] == 0 for s in summaries)
+
+    def test_results_and_summaries_are_recorded_in_the_run_report(self, standin_base_url, api_timeout):
+        """Test round-trip rows pass through RunReport.add without clashing with its record kind"""
+        results, summaries = sweep_round_trips(standin_base_url, api_timeout, sizes=(10,), months=("2024-07",),
+                                               plants=("AMD",))
+        report = RunReport(standin_base_url)
+        for result in results:
+            report.add("roundtrip", endpoint=ROUNDTRIPS[result["payload_kind"]][0], **result)
+        for summary in summaries:
+            report.add("roundtrip_throughput", **summary)
+
+        assert [r["payload_kind"] for r in report.by_kind("roundtrip")] == list(ROUNDTRIPS)
+        assert len(report.by_kind("roundtrip_throughput")) == len(ROUNDTRIPS)
+
+    def test_lagging_reads_are_measured_as_staleness(self, api_timeout):
+        """Test a write that only becomes visible later is polled until fresh"""
+        with serve(create_app(read_lag_s=0.3)) as base_url:
+            for kind in ROUNDTRIPS:
+                result = round_trip(requests.Session(), base_url, kind, 20, "2024-01", "AMD", api_timeout,
+                                    poll_interval_s=0.05)
+
+                assert result["write_status"] == 200 and result["read_status"] == 404
+                assert not result["fresh"] and result["stale_reads"] > 0
+                assert 0.3 <= result["staleness_s"] < 1.0
+
+
+@pytest.mark.benchmark
+class TestRoundTripBenchmark:
+    """Sweep save/fetch payload sizes concurrently across months and plants against the API"""
+
+    @pytest.mark.slow
+    def test_round_trip_throughput_and_staleness(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test write/read latency, bytes on the wire and staleness for 10-50k rows"""
+        try:
+            results, summaries = sweep_round_trips(api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("roundtrip", endpoint=ROUNDTRIPS[result["payload_kind"]][0], **result)
+        for summary in summaries:
+            run_report.add("roundtrip_throughput", **summary)
+            print(f"   {summary['payload_kind']:<14} {summary['rows']:>6} rows x {summary['targets']}: "
+                  f"{summary['round_trips_per_s']:.1f} trips/s, write {summary['write_mb_per_s']:.1f} MB/s "
+                  f"(p50 {summary['write_p50_s']:.2f}s), read {summary['read_mb_per_s']:.1f} MB/s, "
+                  f"stale {summary['stale']}, max staleness {summary['max_staleness_s'] or 0:.2f}s")
+
+        never_fresh = [r for r in results if r["write_status"] == 200 and r["staleness_s"] is None]
+        assert not never_fresh, "Writes never became readable: " \
+            f"{[(r['payload_kind'], r['rows'], r['month'], r['plant']) for r in never_fresh]}"
@@ -0,0 +1,111 @@
+"""
+Client-side fan-out for /api/sap_data
+Windowing, retries and merging run against the local stand-in; the speed-up benchmark runs against the API
+"""
+import time
+
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.sap_fanout import (SAP_BENCHMARK_CODES, SAP_BENCHMARK_RANGE, RateLimiter, benchmark_fan_out, date_windows,
+                             fan_out, fetch_window, merge_records, sequential)
+from perf.standin import create_app, serve
+
+CODES = [f"MAT{index:03d}" for index in range(1, 7)]
+
+
+class TestWindowsAndMerge:
+    """Test date windows, the rate limiter and the merge/dedupe step"""
+
+    def test_windows_cover_the_range_without_overlap(self):
+        """Test inclusive windows tile a quarter and the last one is cut at the end date"""
+        windows = date_windows("2024-01-01", "2024-03-31", window_days=14)
+
+        assert windows[0] == ("2024-01-01", "2024-01-14")
+        assert windows[1][0] == "2024-01-15"
+        assert windows[-1] == ("2024-03-25", "2024-03-31")
+        assert len(windows) == 7
+        assert date_windows("2024-01-05", "2024-01-05") == [("2024-01-05", "2024-01-05")]
+
+    def test_merge_drops_records_returned_by_two_windows(self):
+        """Test duplicates are dropped on all columns or on the given keys"""
+        order = {"Sales Orde": "1", "Item No.": 10, "SO.Qty": 100}
+        results = [{"records": [order, {"Sales Orde": "2", "Item No.": 10, "SO.Qty": 50}]},
+                   {"records": [dict(order)]}, {"records": [dict(order, **{"SO.Qty": 120})]}]
+
+        assert len(merge_records(results)) == 3
+        assert len(merge_records(results, keys=["Sales Orde", "Item No."])) == 2
+        assert merge_records([{"records": []}]).empty
+
+    def test_rate_limiter_spaces_starts(self):
+        """Test ten waits at 100/s take about 90 ms"""
+        limiter = RateLimiter(100)
+        start = time.perf_counter()
+        for _ in range(10):
+            limiter.wait()
+        assert 0.08 <= time.perf_counter() - start < 0.3
+
+
+class TestFanOutStandIn:
+    """Test the fan-out against the stand-in's sap_data, with and without upstream errors"""
+
+    def test_fan_out_matches_the_sequential_fetch(self, api_timeout):
+        """Test retried, windowed, deduped results equal the whole-range fetch and arrive faster"""
+        with serve(create_app(sap_error_rate=0.1)) as base_url:
+            result = benchmark_fan_out(base_url, api_timeout, CODES, "2024-01-01", "2024-03-31", backoff_s=0.02)
+            merged, stats = fan_out(base_url, api_timeout, CODES, "2024-01-01", "2024-03-31", backoff_s=0.02)
+        with serve() as base_url:
+            baseline, _ = sequential(requests.Session(), base_url, api_timeout, CODES, "2024-01-01", "2024-03-31")
+
+        columns = list(baseline.columns)
+        assert merged.sort_values(columns).reset_index(drop=True).equals(
+            baseline.sort_values(columns).reset_index(drop=True))
+        assert all(s["status"] == 200 for s in stats)
+        assert result["fan_out_failures"] == 0 and result["duplicates_dropped"] > 0
+        assert result["speedup"] > 1.5, result
+
+    def test_502s_are_retried_then_reported(self, api_timeout):
+        """Test an upstream that always fails is retried and its last status kept"""
+        with serve(create_app(sap_error_rate=1.0)) as base_url:
+            result = fetch_window(requests.Session(), base_url,
+                                  {"start_date": "2024-01-01", "end_date": "2024-01-07", "material_code": "MAT001"},
+                                  api_timeout, retries=2, backoff_s=0.01)
+
+        assert result["status"] == 502 and result["attempts"] == 3 and result["records"] == []
+
+    def test_timeouts_and_refused_connections_are_retried_not_raised(self):
+        """Test a window that times out or cannot connect is retried and reported, and the fan-out keeps the rest"""
+        params = {"start_date": "2024-01-01", "end_date": "2024-01-07", "material_code": "MAT001"}
+        with serve() as base_url:
+            timed_out = fetch_window(requests.Session(), base_url, params, 0.01, retries=1, backoff_s=0.01)
+            merged, stats = fan_out(base_url, 0.01, CODES[:2], "2024-01-01", "2024-01-28", retries=1, backoff_s=0.01)
+        refused = fetch_window(requests.Session(), "http://127.0.0.1:9", params, 1, retries=2, backoff_s=0.01)
+
+        assert timed_out["status"] is None and timed_out["attempts"] == 2
+        assert refused["status"] is None and refused["attempts"] == 3 and refused["records"] == []
+        assert len(stats) == 4 and all(s["status"] is None for s in stats) and merged.empty
+
+
+@pytest.mark.benchmark
+class TestSapFanOutBenchmark:
+    """Benchmark the sap_data fan-out against sequential calls on the API"""
+
+    @pytest.mark.slow
+    def test_fan_out_speedup_over_sequential(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test a quarter over a hundred material codes is faster fanned out than fetched code by code"""
+        try:
+            requests.get(f"{api_base_url}/", headers=test_headers, timeout=api_timeout)
+            result = benchmark_fan_out(api_base_url, api_timeout, SAP_BENCHMARK_CODES, *SAP_BENCHMARK_RANGE,
+                                       headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        run_report.add("sap_fan_out", endpoint="/api/sap_data", **result)
+        print(f"   {result['material_codes']} codes, {result['windows']} windows: sequential "
+              f"{result['sequential_s']:.1f}s ({result['sequential_failures']} failed), fan-out "
+              f"{result['fan_out_s']:.1f}s ({result['fan_out_failures']} failed, {result['retries']} retries), "
+              f"speed-up {result['speedup']:.1f}x, {result['fan_out_rows']} rows")
+
+        assert result["fan_out_failures"] <= result["sequential_failures"], \
+            "Fan-out lost more windows to upstream errors than the sequential fetch"
@@ -0,0 +1,123 @@
+"""
+Interval-sweep verifier for scheduler output
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from perf.schedule_verifier import find_scheduled_rows, verify_scheduler_response
+
+CAMPAIGN_BLOCKS = {
+    "Line1": [{"material_group": "BOPP", "start_time": "2024-01-01T00:00:00Z",
+               "end_time": "2024-01-15T23:59:59Z", "capacity": 1000}],
+    "Line2": [{"material_group": "BOPET", "start_time": "2024-01-16T00:00:00Z",
+               "end_time": "2024-01-31T23:59:59Z", "capacity": 800}],
+}
+
+
+def entry(line, material_group, start, end, quantity):
+    return {"line": line, "material_group": material_group, "start_time": f"2024-01-{start}Z",
+            "end_time": f"2024-01-{end}Z", "quantity": quantity}
+
+
+class TestScheduleVerifier:
+    """Test overlap, gap, campaign-window and capacity checks"""
+
+    def test_valid_schedule(self):
+        """Test back-to-back entries inside their blocks and within capacity pass"""
+        schedule = [
+            entry("Line1", "BOPP", "01T00:00:00", "05T00:00:00", 400),
+            entry("Line1", "BOPP", "05T00:00:00", "09T00:00:00", 600),
+            entry("Line2", "BOPET", "16T00:00:00", "20T00:00:00", 800),
+        ]
+        result = verify_scheduler_response({"scheduled_plan": schedule}, {"campaign_blocks": CAMPAIGN_BLOCKS})
+
+        assert result["valid"], result["errors"]
+        assert result["lines"] == 2
+        assert result["gaps"] == 0
+
+    def test_overlap_gap_window_and_capacity_violations(self):
+        """Test each violation kind is detected on the right line"""
+        schedule = [
+            entry("Line1", "BOPP", "01T00:00:00", "05T00:00:00", 500),
+            entry("Line1", "BOPP", "04T00:00:00", "08T00:00:00", 600),    # overlap, block over capacity
+            entry("Line2", "BOPET", "17T00:00:00", "20T00:00:00", 100),
+            entry("Line2", "BOPET", "25T00:00:00", "31T23:59:59", 100),   # 5-day gap
+            entry("Line2", "BOPP", "31T23:59:59", "31T23:59:59", 10),     # wrong material group
+            entry("Line3", "BOPET", "20T00:00:00", "21T00:00:00", 10),    # line without blocks
+        ]
+        result = verify_scheduler_response({"result": {"schedule": schedule}}, {"campaign_blocks": CAMPAIGN_BLOCKS})
+
+        assert result["overlaps"] == 1
+        assert result["gaps"] == 1
+        assert result["gap_hours"] == 120
+        assert result["outside_blocks"] == 2
+        assert result["capacity_overruns"] == 1
+        assert not result["valid"]
+
+    def test_entries_without_material_group_match_any_block(self):
+        """Test entries and blocks with no (or a null) material group are placed by line and time alone"""
+        schedule = [
+            {"line": "Line1", "start_time": "2024-01-01T00:00:00Z", "end_time": "2024-01-02T00:00:00Z",
+             "quantity": 10},
+            entry("Line2", "", "16T00:00:00", "17T00:00:00", 10),
+            entry("Line2", None, "17T00:00:00", "18T00:00:00", 10),
+        ]
+        blocks = dict(CAMPAIGN_BLOCKS, Line3=[{"start_time": "2024-01-01T00:00:00Z",
+                                               "end_time": "2024-01-02T00:00:00Z"}])
+        result = verify_scheduler_response({"schedule": schedule + [entry("Line3", "BOPP", "01T00:00:00",
+                                                                          "01T12:00:00", 5)]},
+                                           {"campaign_blocks": blocks})
+
+        assert result["valid"], result["errors"]
+        assert result["outside_blocks"] == 0
+
+    def test_missing_and_non_iso_times_are_reported(self):
+        """Test epoch, free-text, missing and reversed times are reported as invalid rows, not swept"""
+        schedule = [
+            entry("Line1", "BOPP", "01T00:00:00", "05T00:00:00", 400),
+            {"line": "Line1", "material_group": "BOPP", "start_time": 1704067200, "end_time": 1704153600,
+             "quantity": 10},
+            {"line": "Line1", "material_group": "BOPP", "start_time": "yesterday", "end_time": "today",
+             "quantity": 10},
+            {"line": "Line1", "material_group": "BOPP", "start_time": "2024-01-05T00:00:00Z", "quantity": 10},
+            entry("Line1", "BOPP", "09T00:00:00", "06T00:00:00", 10),
+        ]
+        result = verify_scheduler_response({"schedule": schedule}, {"campaign_blocks": CAMPAIGN_BLOCKS})
+
+        assert result["entries"] == 5 and result["invalid_times"] == 4
+        assert result["overlaps"] == result["outside_blocks"] == result["invalid_blocks"] == 0
+        assert not result["valid"] and "rows [1, 2, 3, 4]" in result["errors"][0]
+
+        unusable_blocks = {"Line1": [{"material_group": "BOPP", "start_time": "soon", "end_time": None}]}
+        result = verify_scheduler_response({"schedule": schedule[:1]}, {"campaign_blocks": unusable_blocks})
+        assert result["invalid_blocks"] == 1 and result["outside_blocks"] == 1
+
+    def test_response_without_schedule(self):
+        """Test responses carrying only a planId are not verified"""
+        assert find_scheduled_rows({"planId": "abc", "clientId": "CPFL"}) is None
+        assert verify_scheduler_response({"planId": "abc"}, {"campaign_blocks": CAMPAIGN_BLOCKS}) is None
+
+    def test_verifies_100k_entries_fast(self):
+        """Test verifying 100k scheduled orders on 12 lines, row conversion included, is fast enough for load tests"""
+        n, n_lines = 100_000, 12
+        start = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(np.arange(n) // n_lines * 600, unit="s")
+        starts = start.strftime("%Y-%m-%dT%H:%M:%SZ")
+        ends = (start + pd.Timedelta(minutes=10)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        schedule = [{"line": f"Line{index % n_lines}", "material_group": "BOPP", "start_time": start_time,
+                     "end_time": end_time, "quantity": 1}
+                    for index, (start_time, end_time) in enumerate(zip(starts, ends))]
+        blocks = {
+            f"Line{i}": [{"material_group": "BOPP", "start_time": "2024-01-01T00:00:00Z",
+                          "end_time": "2024-03-01T00:00:00Z", "capacity": n}]
+            for i in range(n_lines)
+        }
+
+        start_time = time.perf_counter()
+        result = verify_scheduler_response({"scheduled_plan": schedule}, {"campaign_blocks": blocks})
+        elapsed = time.perf_counter() - start_time
+
+        assert result["entries"] == n
+        assert result["valid"], result["errors"]
+        assert elapsed < 0.25, f"Verification took {elapsed * 1000:.0f} ms"
@@ -0,0 +1,96 @@
+"""
+Generated scheduler payloads and the scheduler sweep benchmark
+Generator and sweep mechanics run against the local stand-in; the sweep itself runs against the API
+"""
+import os
+
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from config import PERF_REPORT_DIR
+from perf.schedule_verifier import blocks_to_arrays, schedule_to_arrays, verify_schedule
+from perf.scheduler import SCHEDULERS, plot_latency_surfaces, scheduler_payload, sweep_schedulers, timeout_points
+
+
+class TestSchedulerPayload:
+    """Test the summarized_orders / campaign_blocks generator"""
+
+    def test_payload_dimensions(self):
+        """Test lines, blocks per line, material groups and orders per group are honoured"""
+        payload = scheduler_payload(lines=12, blocks_per_line=3, material_groups=5, orders_per_group=40)
+        data = payload["data"]
+
+        assert len(data["campaign_blocks"]) == 12
+        assert all(len(blocks) == 3 for blocks in data["campaign_blocks"].values())
+        assert sorted(data["summarized_orders"]) == sorted(["MET", "NTT-HS", "NTT-W", "BOPP", "BOPET"])
+        assert all(len(orders) == 40 for orders in data["summarized_orders"].values())
+        assert payload["client_name"] == "CPFL"
+
+    def test_orders_sit_in_blocks_within_capacity(self):
+        """Test every summarized order lies inside a block of its group that can hold it"""
+        data = scheduler_payload(lines=4, blocks_per_line=2, material_groups=3, orders_per_group=50, seed=7)["data"]
+        orders = [order for group in data["summarized_orders"].values() for order in group]
+        result = verify_schedule(schedule_to_arrays(orders), blocks_to_arrays(data["campaign_blocks"]))
+
+        assert result["outside_blocks"] == 0
+        assert result["capacity_overruns"] == 0
+
+
+class TestSchedulerSweepStandIn:
+    """Test the sweep against the stand-in schedulers"""
+
+    def test_sweep_records_every_scheduler_and_config(self, standin_base_url, api_timeout, tmp_path):
+        """Test each grid point runs on all three schedulers and their schedules verify"""
+        grid = {"lines": (2, 4), "blocks_per_line": (1, 2), "material_groups": (2,), "orders_per_group": (5,)}
+        results = sweep_schedulers(requests.Session(), standin_base_url, api_timeout, grid=grid)
+
+        assert len(results) == 4 * len(SCHEDULERS)
+        assert all(result["status"] == 200 for result in results), results
+        assert all(result["verification"]["valid"] for result in results)
+        assert timeout_points(results) == {"changover": None, "hybrid": None, "otif": None}
+        assert os.path.getsize(plot_latency_surfaces(results, str(tmp_path / "report" / "surface.png"))) > 0
+
+    def test_timeout_point_is_smallest_timed_out_config(self):
+        """Test the timeout point is the smallest order count that timed out"""
+        config = {"lines": 6, "blocks_per_line": 1, "material_groups": 2}
+        results = [
+            dict(config, scheduler="otif", orders_per_group=100, total_orders=200, timed_out=False),
+            dict(config, scheduler="otif", orders_per_group=500, total_orders=1000, timed_out=True),
+            dict(config, scheduler="otif", orders_per_group=900, total_orders=1800, timed_out=True),
+            dict(config, scheduler="hybrid", orders_per_group=900, total_orders=1800, timed_out=None),
+        ]
+        points = timeout_points(results)
+
+        assert points["otif"]["total_orders"] == 1000
+        assert points["otif"]["orders_per_group"] == 500
+        assert points["hybrid"] is None
+
+
+@pytest.mark.benchmark
+class TestSchedulerSweepBenchmark:
+    """Sweep the changover, hybrid and OTIF schedulers over payload dimensions against the API"""
+
+    @pytest.mark.slow
+    def test_scheduler_latency_surfaces(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test scheduler latency over lines x blocks x material groups x orders and where each times out"""
+        try:
+            results = sweep_schedulers(requests.Session(), api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for result in results:
+            run_report.add("scheduler_sweep", endpoint=SCHEDULERS[result["scheduler"]], **result)
+            if result.get("service"):
+                print(f"   {result['scheduler']:<9} {result['total_orders']:>5} orders on {result['lines']} lines: "
+                      f"{result['latency_s']:.2f}s, OTIF {result['service']['otif_pct']:.1f}%, "
+                      f"fill rate {result['service']['fill_rate_pct']:.1f}%")
+        points = timeout_points(results)
+        run_report.add("scheduler_timeout_points", timeout_s=api_timeout, points=points)
+        for scheduler, point in points.items():
+            print(f"   {scheduler}: {'no timeout' if point is None else f'exceeds {api_timeout}s at {point}'}")
+        path = plot_latency_surfaces(results, os.path.join(PERF_REPORT_DIR, f"scheduler-surface-{run_report.run_id}.png"))
+        print(f"   Latency surfaces written to {path}")
+
+        invalid = [r for r in results if r.get("verification") and not r["verification"]["valid"]]
+        assert not invalid, f"Invalid schedules: {[(r['scheduler'], r['total_orders'], r['verification']['errors']) for r in invalid]}"
@@ -0,0 +1,98 @@
+"""
+Soak mode: windowed latency and errors with leak and drift detection
+Trend fitting and the run history are checked offline, windowing against a leaking stand-in; the soak runs against the API
+"""
+import numpy as np
+import pytest
+from requests.exceptions import RequestException
+
+from config import SOAK_WINDOW_S
+from perf.history import append_history, load_history
+from perf.soak import drift, drift_report, run_soak, soak_windows
+from perf.standin import create_app, serve
+
+
+def _windows(values, metric="p50_s"):
+    return [{"start_s": index * 60.0, metric: value} for index, value in enumerate(values)]
+
+
+class TestDriftDetection:
+    """Test trend fits flag steady rises and ignore noise"""
+
+    def test_steady_rise_drifts(self):
+        """Test a p99 climbing window after window is flagged with its slope per hour"""
+        p99 = np.linspace(0.2, 0.5, 10) + np.tile([0.0, 0.01], 5)
+        result = drift(_windows(p99, "p99_s"), "p99_s")
+
+        assert result["drifting"] and result["rho"] > 0.9 and result["growth"] > 2
+        assert result["slope_per_hour"] == pytest.approx(0.3 / 540 * 3600, rel=0.1)
+
+    def test_noise_and_small_rises_do_not_drift(self):
+        """Test a noisy flat series, and a monotonic rise below the growth threshold, are not flagged"""
+        noisy = 0.2 + np.random.default_rng(3).normal(0, 0.02, 20)
+        assert not drift(_windows(noisy), "p50_s")["drifting"]
+        assert not drift(_windows(np.linspace(0.2, 0.22, 10)), "p50_s")["drifting"]
+        assert drift(_windows([0.2] * 3), "p50_s")["slope_per_hour"] is None
+
+    def test_error_rate_drifts_on_absolute_rise(self):
+        """Test an error rate rising from zero is judged by its absolute rise"""
+        assert drift(_windows(np.linspace(0.0, 0.05, 8), "error_rate"), "error_rate")["drifting"]
+        assert not drift(_windows([0.0] * 8, "error_rate"), "error_rate")["drifting"]
+
+
+class TestRunHistory:
+    """Test the run-history store keeps rows across runs"""
+
+    def test_rows_accumulate_per_run_and_kind(self, tmp_path):
+        """Test two runs append to one file and load back filtered by kind"""
+        append_history("run-1", "soak_window", [{"window": 0, "p50_s": 0.1}, {"window": 1, "p50_s": 0.2}], tmp_path)
+        append_history("run-2", "soak_window", [{"window": 0, "p50_s": 0.3}], tmp_path)
+        append_history("run-2", "soak_drift", [{"metric": "p50_s", "drifting": False}], tmp_path)
+
+        windows = load_history("soak_window", tmp_path)
+        assert list(windows["run_id"]) == ["run-1", "run-1", "run-2"] and list(windows["p50_s"]) == [0.1, 0.2, 0.3]
+        assert len(load_history(directory=tmp_path)) == 4
+        assert load_history("soak_window", tmp_path / "missing").empty
+
+
+class TestSoakStandIn:
+    """Test the soak run and its windows against the stand-in"""
+
+    def test_leaking_server_drifts_in_load_and_canary(self, api_timeout):
+        """Test a server slowing with every request shows rising p50 for the mix and the `/` canary"""
+        with serve(create_app(leak_s_per_request=0.0001)) as base_url:
+            frame = run_soak(base_url, api_timeout, duration_s=2.0, mix={"fetch_parameters": 1}, workers=2,
+                             canary_interval_s=0.05)
+        windows = soak_windows(frame, window_s=0.25)
+
+        assert [window["window"] for window in windows] == list(range(8))
+        assert all(window["canary_probes"] >= 3 and window["error_rate"] == 0 for window in windows)
+        report = {row["metric"]: row for row in drift_report(windows)}
+        assert report["p50_s"]["drifting"] and report["canary_p50_s"]["drifting"]
+        assert not report["error_rate"]["drifting"]
+
+
+@pytest.mark.benchmark
+class TestSoakBenchmark:
+    """Soak the API with the mixed workload for SOAK_DURATION_S and look for drift"""
+
+    @pytest.mark.slow
+    def test_soak_without_drift(self, soak_enabled, api_base_url, api_timeout, test_headers, run_report, load_guard):
+        """Test no latency, error or canary metric drifts upward over the soak"""
+        try:
+            frame = run_soak(api_base_url, api_timeout, headers=test_headers, guard=load_guard)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        windows = soak_windows(frame)
+        report = drift_report(windows)
+        append_history(run_report.run_id, "soak_window", [dict(window, window_s=SOAK_WINDOW_S) for window in windows])
+        append_history(run_report.run_id, "soak_drift", report)
+        for row in report:
+            run_report.add("soak_drift", **row)
+            if row["slope_per_hour"] is not None:
+                print(f"   {row['metric']:<13} {row['fitted_start']:.4g} -> {row['fitted_end']:.4g} over the soak, "
+                      f"rho {row['rho']:.2f}{' DRIFT' if row['drifting'] else ''}")
+
+        drifting = [row["metric"] for row in report if row["drifting"]]
+        assert not drifting, f"Metrics drift upward over the soak: {drifting}"
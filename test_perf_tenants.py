@@ -0,0 +1,57 @@
+"""
+Multi-tenant fairness: one tenant floods optimise_hybrid while the others read
+The interference run is exercised against the local stand-in; the benchmark runs against the API
+"""
+import pytest
+from requests.exceptions import RequestException
+
+from perf.tenants import TENANTS, tenant_interference, tenant_operations
+
+
+class TestTenantInterference:
+    """Test tenant workloads and the interference report against the stand-in"""
+
+    def test_operations_are_scoped_to_the_tenant(self):
+        """Test every read carries the tenant's own company, plant or user"""
+        tenant = TENANTS[1]
+        for _, _, params, _ in tenant_operations(tenant):
+            assert set(params.values()) & {tenant["company"], tenant["user_id"]}
+        assert tenant_operations(tenant)[-1][2]["plant"] == tenant["plant"]
+
+    def test_flood_is_reported_per_quiet_tenant(self, standin_base_url, api_timeout):
+        """Test each quiet tenant gets baseline and flood figures and the flood hits the busy licence"""
+        rows, flood = tenant_interference(standin_base_url, api_timeout, noisy_index=2, readers_per_tenant=1,
+                                          flood_workers=3, flood_orders=20, duration_s=1.0)
+
+        assert [row["tenant"] for row in rows] == ["CPFL/AMD", "ACME/SLV", "FLEX/PNQ"]
+        assert all(row["noisy_tenant"] == "POLY/DHR" for row in rows)
+        assert all(row["baseline_errors"] == row["flood_errors"] == 0 for row in rows)
+        assert all(row["p99_ratio"] > 0 and row["throughput_ratio"] > 0 for row in rows)
+        assert flood["requests"] == flood["ok"] + flood["license_busy"] + flood["failed"]
+        assert flood["ok"] > 0 and flood["license_busy"] > 0
+
+
+@pytest.mark.benchmark
+class TestTenantInterferenceBenchmark:
+    """Quantify cross-tenant interference from an optimise_hybrid flood on the API"""
+
+    @pytest.mark.slow
+    def test_noisy_neighbour_degradation(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test quiet tenants' p99 stays within the degradation limit while one tenant floods the optimiser"""
+        try:
+            rows, flood = tenant_interference(api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        run_report.add("tenant_flood", endpoint="/api/optimise_hybrid", **flood)
+        print(f"   {flood['tenant']} flood: {flood['requests']} requests, {flood['ok']} solved, "
+              f"{flood['license_busy']} licence busy, {flood['failed']} failed")
+        for row in rows:
+            run_report.add("tenant_interference", **row)
+            print(f"   {row['tenant']:<9} p50 {row['baseline_p50_s'] * 1000:.0f} -> {row['flood_p50_s'] * 1000:.0f} ms, "
+                  f"p99 {row['baseline_p99_s'] * 1000:.0f} -> {row['flood_p99_s'] * 1000:.0f} ms "
+                  f"(x{row['p99_ratio']:.2f}), throughput x{row['throughput_ratio']:.2f}, "
+                  f"errors {row['baseline_errors']} -> {row['flood_errors']}")
+
+        degraded = [row["tenant"] for row in rows if row["degraded"]]
+        assert not degraded, f"Tenants degraded by the {flood['tenant']} flood: {degraded}"
@@ -0,0 +1,78 @@
+"""
+Campaign read latency and response size as version history grows
+Growth fitting and the history run are exercised against the local stand-in; the benchmark runs against the API
+"""
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.versions import benchmark_version_history, growth, growth_report, version_payload
+
+
+def samples(metric, values):
+    return [{"versions": versions, metric: value} for versions, value in zip((1, 10, 20, 30, 40), values)]
+
+
+class TestGrowthFit:
+    """Test the log-log growth flag"""
+
+    def test_linear_growth_is_flagged(self):
+        """Test a metric proportional to version count is flagged, a flat noisy one is not"""
+        linear = growth(samples("details_bytes", (1e3, 1e4, 2e4, 3e4, 4e4)), "details_bytes")
+        flat = growth(samples("by_id_s", (0.10, 0.12, 0.09, 0.11, 0.10)), "by_id_s")
+
+        assert linear["slope"] == pytest.approx(1.0, abs=0.01) and linear["linear"]
+        assert abs(flat["slope"]) < 0.1 and not flat["linear"]
+
+    def test_too_few_samples_are_not_fitted(self):
+        """Test fewer than three usable samples give no slope"""
+        result = growth(samples("details_s", (0.1, 0, None)), "details_s")
+        assert result == {"metric": "details_s", "slope": None, "ratio": None, "linear": False}
+
+    def test_version_payload_labels_versions(self):
+        """Test each version carries its label and a campaign plan for the month"""
+        payload = version_payload("abc", 7, blocks=12, month="2024-03")
+
+        assert payload["campaign_id"] == "abc" and payload["version"] == "v7.0"
+        assert len(payload["data"]["campaign_plan"]) == 12
+        assert payload["data"]["campaign_plan"][0]["start_time"] == "2024-03-01"
+
+
+class TestVersionHistoryStandIn:
+    """Test the history run against the stand-in, whose details endpoint returns every version"""
+
+    def test_details_size_grows_and_by_id_stays_flat(self, standin_base_url, api_timeout):
+        """Test details response size is flagged as linear while fetch-by-id size is not"""
+        history = benchmark_version_history(requests.Session(), standin_base_url, api_timeout, versions=20,
+                                            sample_every=5, blocks=10, month="2024-02", read_repeats=1)
+        report = growth_report(history)
+
+        assert [sample["versions"] for sample in history] == [1, 5, 10, 15, 20]
+        assert all(s["write_status"] == s["details_status"] == s["by_id_status"] == 200 for s in history)
+        assert report["details_bytes"]["linear"]
+        assert not report["by_id_bytes"]["linear"]
+
+
+@pytest.mark.benchmark
+class TestVersionHistoryBenchmark:
+    """Benchmark campaign reads against version count on the API"""
+
+    @pytest.mark.slow
+    def test_campaign_reads_vs_version_count(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report):
+        """Test read latency and size stay sub-linear in the number of stored versions"""
+        try:
+            history = benchmark_version_history(requests.Session(), api_base_url, api_timeout, headers=test_headers)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for sample in history:
+            run_report.add("version_history", **sample)
+            print(f"   {sample['versions']:>3} versions: write {sample['write_s'] * 1000:.0f} ms, details "
+                  f"{sample['details_s'] * 1000:.0f} ms / {sample['details_bytes'] / 1e3:.1f} kB, by id "
+                  f"{sample['by_id_s'] * 1000:.0f} ms / {sample['by_id_bytes'] / 1e3:.1f} kB")
+
+        report = growth_report(history)
+        for metric in report.values():
+            run_report.add("version_growth", **metric)
+        linear = [name for name, metric in report.items() if metric["linear"] and name != "write_s"]
+        assert not linear, f"Reads grow linearly with version history: {[report[name] for name in linear]}"
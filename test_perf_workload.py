@@ -0,0 +1,103 @@
+"""
+Read-heavy mixed workload for the user and machine endpoints
+Overlap and stall analysis run on synthetic timelines and the stand-in; the profile runs against the API
+"""
+import pandas as pd
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from perf.standin import create_app, serve
+from perf.workload import (READ_MIX, overlaps_writes, profile_write_shares, run_workload, seed_workload,
+                           workload_summary, write_stall)
+
+
+def timeline(rows):
+    frame = pd.DataFrame(rows, columns=["operation", "write", "start", "end", "status"])
+    frame["latency_s"] = frame["end"] - frame["start"]
+    return frame
+
+
+class TestWriteOverlap:
+    """Test the read/write overlap mask and stall flag on synthetic timelines"""
+
+    def test_reads_overlapping_merged_writes(self):
+        """Test only reads intersecting a write interval are marked, writes never are"""
+        frame = timeline([
+            ("update_details", True, 1.0, 2.0, 200),
+            ("add_machine", True, 1.5, 3.0, 200),
+            ("get_details", False, 0.0, 0.9, 200),    # before any write
+            ("get_details", False, 2.5, 2.6, 200),    # inside the merged 1.0-3.0 write
+            ("fetch_parameters", False, 0.5, 1.1, 200),
+            ("get_details", False, 3.0, 4.0, 200),    # starts as the write ends
+        ])
+        assert overlaps_writes(frame).tolist() == [False, False, False, True, True, False]
+
+    def test_slow_reads_during_writes_are_flagged(self):
+        """Test a stall is flagged when reads overlapping writes have a much worse p99"""
+        rows = [("update_details", True, float(t), t + 0.5, 200) for t in range(0, 100, 4)]
+        rows += [("get_details", False, t + 0.1, t + 0.4, 200) for t in range(0, 100, 4)]
+        rows += [("get_details", False, t + 2.0, t + 2.05, 200) for t in range(0, 100, 4)]
+        stall = write_stall(timeline(rows))
+
+        assert stall["reads_during_writes"] == stall["reads_clear"] == 25
+        assert stall["p99_ratio"] == pytest.approx(6.0) and stall["stalled"]
+
+    def test_few_overlapping_reads_are_not_judged(self):
+        """Test the stall flag needs enough reads on both sides"""
+        frame = timeline([("update_details", True, 0.0, 1.0, 200), ("get_details", False, 0.5, 2.0, 200)])
+        assert write_stall(frame)["p99_ratio"] is None and not write_stall(frame)["stalled"]
+
+
+class TestWorkloadStandIn:
+    """Test the mixed workload against stand-ins with and without write locking"""
+
+    def test_read_only_mix_covers_every_read(self, standin_base_url, api_timeout):
+        """Test a read-only run issues only the weighted reads and succeeds"""
+        assert seed_workload(requests.Session(), standin_base_url, api_timeout) == (200, 200)
+        frame = run_workload(standin_base_url, api_timeout, write_share=0.0, workers=4, duration_s=0.5)
+        summary = {row["operation"]: row for row in workload_summary(frame, 0.5)}
+
+        assert set(frame["operation"]) == set(READ_MIX)
+        assert summary["all reads"]["errors"] == 0 and summary["all writes"]["requests"] == 0
+        assert summary["get_details"]["requests"] > summary["fetch_parameters"]["requests"]
+
+    def test_writes_holding_the_store_stall_reads(self, api_timeout):
+        """Test reads waiting on a write lock are detected, and not without one"""
+        stalls = {}
+        for write_hold_s in (0.0, 0.25):
+            with serve(create_app(write_hold_s=write_hold_s)) as base_url:
+                summaries, checks = profile_write_shares(base_url, api_timeout, write_shares=(0.0, 0.02),
+                                                         duration_s=2.0)
+            assert all(row["errors"] == 0 for row in summaries)
+            stalls[write_hold_s] = checks[-1]
+
+        assert not stalls[0.0]["stalled"]
+        assert stalls[0.25]["stalled"] and stalls[0.25]["read_p99_vs_baseline"] > 2
+
+
+@pytest.mark.benchmark
+class TestWorkloadBenchmark:
+    """Profile the read-heavy page-load mix at several write shares against the API"""
+
+    @pytest.mark.slow
+    def test_read_heavy_mix_throughput_and_write_stalls(self, benchmark_enabled, api_base_url, api_timeout, test_headers, run_report,
+                                                       load_guard):
+        """Test throughput, tail latency and write stalls of the page-load read mix"""
+        try:
+            summaries, stalls = profile_write_shares(api_base_url, api_timeout, headers=test_headers, guard=load_guard)
+        except RequestException as e:
+            pytest.skip(f"API not available: {e}")
+
+        for row in summaries:
+            run_report.add("workload", **row)
+            if row["requests"]:
+                print(f"   writes {row['write_share']:.0%} {row['operation']:<22} {row['throughput_rps']:>7.1f} req/s, "
+                      f"p50 {row['p50_s'] * 1000:.0f} ms, p99 {row['p99_s'] * 1000:.0f} ms, {row['errors']} errors")
+        for stall in stalls:
+            run_report.add("workload_write_stall", **stall)
+        if load_guard:
+            run_report.add("load_guard", **load_guard.summary())
+
+        stalled = [stall for stall in stalls if stall["stalled"]]
+        assert not stalled, f"Writes stall concurrent reads: {stalled}"